@@ -1,13 +1,42 @@
 from gestion_cobranzas.models import EnvioDeudaART, ContratoEnviado
 from django.contrib import admin
-from .models import ConsolidadoLote, ConsolidadoItem, EnvioEmailLog, ConsolidadoArt
+from .models import ConsolidadoLote, ConsolidadoItem, ConsolidacionJob, EnvioEmailLog, ConsolidadoArt
 
 @admin.register(ConsolidadoLote)
 class ConsolidadoLoteAdmin(admin.ModelAdmin):
-    list_display = ("id", "creado_en", "usuario", "filas_consolidado", "filas_no_cruzan")
+    list_display = ("id", "creado_en", "periodo", "usuario", "filas_consolidado", "filas_no_cruzan",
+                    "duracion", "pico_memoria", "etapa_mas_lenta")
     search_fields = ("id", "usuario__username", "nombre_archivo_maestro")
     date_hierarchy = "creado_en"
     ordering = ("-creado_en",)
+    readonly_fields = ("perfil",)
+
+    # Perfil de la corrida (ConsolidadoLote.perfil, art/services/perfilado.py).
+    # Tendencia entre lotes: manage.py perfil_consolidado_art
+    @admin.display(description="Duración (s)")
+    def duracion(self, obj):
+        return (obj.perfil or {}).get("total_s", "—")
+
+    @admin.display(description="Pico RSS (MB)")
+    def pico_memoria(self, obj):
+        return (obj.perfil or {}).get("pico_rss_mb") or "—"
+
+    @admin.display(description="Etapa más lenta")
+    def etapa_mas_lenta(self, obj):
+        etapas = (obj.perfil or {}).get("etapas") or {}
+        if not etapas:
+            return "—"
+        nombre = max(etapas, key=lambda k: etapas[k].get("segundos") or 0)
+        return f"{nombre} ({etapas[nombre].get('segundos')} s)"
+
+@admin.register(ConsolidacionJob)
+class ConsolidacionJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "creado_en", "periodo", "usuario", "estado", "etapa", "terminado_en", "lote")
+    list_filter = ("estado", "periodo")
+    search_fields = ("id", "usuario__username", "periodo", "task_id")
+    date_hierarchy = "creado_en"
+    ordering = ("-creado_en",)
+    readonly_fields = ("etapas", "avisos", "advertencias", "error", "archivo", "task_id")
 
 @admin.register(ConsolidadoItem)
 class ConsolidadoItemAdmin(admin.ModelAdmin):
@@ -0,0 +1,34 @@
+"""
+art.benchmarks
+~~~~~~~~~~~~~~
+Micro-benchmarks del pipeline ART. Cada módulo expone `run(**opciones) -> dict`
+y, antes de medir, verifica que la versión nueva dé EXACTAMENTE lo mismo que la de referencia
+(salvo `columnas`, cuya equivalencia se fija en art/tests.py).
+`pipeline` mide el consolidado completo por etapas sobre insumos sintéticos (sintetico.py);
+`historico` compara leer consolidados del XLSX contra el histórico Parquet;
+`persistir` mide el mapeo/carga de ConsolidadoItem (filas/s antes y después);
+`volcado` compara los motores python y sql de volcar_dashboard_art; `importar`, el upsert
+fila a fila de importar_dashboard_art contra el vectorizado con bulk_create;
+`analisis` compara el contexto de la pantalla de Análisis y fija su presupuesto de consultas;
+`roll_rate`, la matriz de migración entre bandas de Q contra cruzar los períodos en pandas.
+
+Se ejecutan con:  python manage.py benchmark_art <nombre> [--filas N] [--json salida.json]
+"""
+
+from . import analisis, columnas, exportar, historico, importar, lectura, numeros, persistir, pipeline, roll_rate, volcado
+
+BENCHMARKS = {
+    "analisis": analisis.run,
+    "columnas": columnas.run,
+    "exportar": exportar.run,
+    "historico": historico.run,
+    "importar": importar.run,
+    "lectura": lectura.run,
+    "numeros": numeros.run,
+    "persistir": persistir.run,
+    "pipeline": pipeline.run,
+    "roll_rate": roll_rate.run,
+    "volcado": volcado.run,
+}
+
+__all__ = ["BENCHMARKS"]
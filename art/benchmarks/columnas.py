@@ -0,0 +1,97 @@
+# art/benchmarks/columnas.py
+"""
+Q períodos / Estado contrato / Premier: versión por filas (`.apply`, la original de
+`df_consolidado`) vs. versión columnar de art/services/consolidar.py. Solo mide tiempos:
+la equivalencia fila a fila (golden) está en art/tests.py (ColumnasConsolidadoGoldenTests).
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from art.services.consolidar import _estado_contrato, _premier, _q_periodos
+
+
+def generar_frame(filas: int, seed: int = 42) -> pd.DataFrame:
+    """Frame sintético con la forma del cruce: importes con NaN/0, estados y referidos sucios."""
+    rng = np.random.default_rng(seed)
+    deuda = np.round(rng.uniform(-50_000, 2_000_000, filas), 2)
+    costo = np.round(rng.uniform(500, 250_000, filas), 2)
+    costo[rng.random(filas) < 0.08] = 0.0
+    costo[rng.random(filas) < 0.08] = np.nan
+    # Empates binarios (x.xx5) para ejercitar el redondeo
+    empates = rng.random(filas) < 0.02
+    deuda[empates] = costo[empates] * 2.675
+    estados = np.array(["", "Vigente", " vigente ", "VIGENTE", "Anulada", "Baja por falta de pago", None], dtype=object)
+    referidos = np.array(["PREMIER", " premier", "Premier ", "Otro", "", None, "PREMIER SA"], dtype=object)
+    return pd.DataFrame({
+        "Deuda total": deuda,
+        "Costo mensual": costo,
+        "Cuenta Perdida": rng.choice(estados, filas),
+        "Referido por": rng.choice(referidos, filas),
+    })
+
+
+# --------------------------
+# Referencia (código previo, por filas)
+# --------------------------
+def _q_por_filas(df: pd.DataFrame) -> pd.Series:
+    return df.apply(
+        lambda r: round(r["Deuda total"] / r["Costo mensual"], 2)
+        if pd.notna(r["Costo mensual"]) and r["Costo mensual"] else None,
+        axis=1,
+    )
+
+def _estado_por_filas(df: pd.DataFrame) -> pd.Series:
+    return df["Cuenta Perdida"].apply(
+        lambda x: "Vigente" if (pd.isna(x) or str(x).strip().casefold() in {"", "vigente"}) else x
+    )
+
+def _premier_por_filas(df: pd.DataFrame) -> pd.Series:
+    return df["Referido por"].apply(
+        lambda x: "Premier" if str(x).strip().upper() == "PREMIER" else "No es Premier"
+    )
+
+
+def _medir(fn: Callable[[], pd.Series], repeticiones: int) -> tuple[float, pd.Series]:
+    mejor, res = float("inf"), None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        res = fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, res
+
+
+def run(filas: int = 200_000, repeticiones: int = 3, seed: int = 42, **_opciones) -> Dict:
+    df = generar_frame(filas, seed)
+
+    casos = {
+        "q_periodos": (
+            lambda: _q_por_filas(df),
+            lambda: _q_periodos(df["Deuda total"], df["Costo mensual"]),
+        ),
+        "estado_contrato": (
+            lambda: _estado_por_filas(df),
+            lambda: _estado_contrato(df["Cuenta Perdida"]),
+        ),
+        "premier": (
+            lambda: _premier_por_filas(df),
+            lambda: _premier(df["Referido por"]),
+        ),
+    }
+
+    resultados = {}
+    for nombre, (ref, nuevo) in casos.items():
+        t_ref, _ = _medir(ref, 1)
+        t_new, _ = _medir(nuevo, repeticiones)
+        resultados[nombre] = {
+            "filas": filas,
+            "por_filas_s": round(t_ref, 4),
+            "columnar_s": round(t_new, 4),
+            "speedup": round(t_ref / t_new, 1) if t_new else None,
+            "filas_por_s": int(filas / t_new) if t_new else None,
+        }
+    return resultados
@@ -0,0 +1,153 @@
+# art/benchmarks/exportar.py
+"""
+Exportación del libro Consolidado: versión previa (xlsxwriter + recarga con openpyxl para
+formatear CUIT/importes celda por celda) vs. `_exportar_excel` de una sola pasada.
+Verifica que ambos libros tengan los mismos valores y formatos de número en cada celda.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+from io import BytesIO
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from art.services import consolidar
+from art.services.consolidar import COLUMNS_ORDER, _exportar_excel
+
+
+def generar_hojas(filas: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """Hoja grande con la forma de «No cruzan» (NA en varias columnas) + una chica tipo «Consolidado»."""
+    rng = np.random.default_rng(seed)
+    cuits = np.char.add("30", rng.integers(100_000_000, 999_999_999, filas).astype(str)).astype(object)
+    cuits[rng.random(filas) < 0.01] = "s/d"
+    costo = np.round(rng.uniform(500, 250_000, filas), 2)
+    costo[rng.random(filas) < 0.1] = np.nan
+    grande = pd.DataFrame({
+        "Periodo": "06-2025",
+        "Razón social": rng.choice(np.array(["ACME SA", "Foo SRL", None], dtype=object), filas),
+        "CUIT": cuits,
+        "Contrato": rng.integers(1, 9_999_999, filas).astype(object),
+        "Aseguradora": rng.choice(np.array(["Galeno", "Provincia", "Experta"], dtype=object), filas),
+        "Deuda total": np.round(rng.uniform(0, 2_000_000, filas), 2),
+        "Costo mensual": costo,
+        "Q periodos deudores": pd.Series([pd.NA] * filas, dtype=object),
+        "Estado contrato": "Vigente",
+        "Email del trato": rng.choice(np.array(["a@b.com", np.nan], dtype=object), filas),
+        "No contactar": False,
+        "Productor": rng.choice(np.array(["P1", "P2", np.nan], dtype=object), filas),
+        "Premier": "No es Premier",
+        "Cliente importante": False,
+    })[COLUMNS_ORDER]
+    chica = grande.head(max(filas // 10, 1)).copy()
+    chica["Contrato"] = chica["Contrato"].astype("int64")
+    chica["Q periodos deudores"] = np.round(chica["Deuda total"] / chica["Costo mensual"], 2)
+    return {"Consolidado": chica, "No cruzan": grande}
+
+
+# --------------------------
+# Referencia (código previo; sin anchos/zoom, que no cambian las celdas)
+# --------------------------
+def _exportar_previo(hojas: Dict[str, pd.DataFrame], destino: BytesIO) -> None:
+    from openpyxl import load_workbook
+
+    tmp = BytesIO()
+    with pd.ExcelWriter(tmp, engine="xlsxwriter") as writer:
+        for nombre, df in hojas.items():
+            safe = df.copy()
+            for c in ["Deuda total", "Costo mensual", "Q periodos deudores", "Contrato", "Capitas"]:
+                if c in safe.columns:
+                    safe[c] = pd.to_numeric(safe[c], errors="coerce")
+            safe.to_excel(writer, sheet_name=nombre, index=False)
+            r, c = safe.shape
+            writer.sheets[nombre].add_table(0, 0, max(r, 1), max(c - 1, 0), {
+                "style": "Table Style Medium 2", "columns": [{"header": col} for col in safe.columns],
+            })
+
+    tmp.seek(0)
+    wb2 = load_workbook(tmp)
+
+    def _set_col_format(ws, header_name, fmt, transform=None):
+        headers = [cell.value for cell in ws[1]]
+        if header_name in headers:
+            col_letter = ws.cell(row=1, column=headers.index(header_name) + 1).column_letter
+            for cell in ws[col_letter][1:]:
+                if transform:
+                    try:
+                        cell.value = transform(cell.value)
+                    except Exception:
+                        pass
+                cell.number_format = fmt
+
+    for nombre in hojas:
+        ws2 = wb2[nombre]
+        _set_col_format(ws2, "CUIT", consolidar.CUIT_FMT,
+                        transform=lambda v: int(str(v).strip()) if str(v).strip() not in ("", "None", "nan") else None)
+        _set_col_format(ws2, "Deuda total", consolidar.MONEY_FMT)
+        _set_col_format(ws2, "Costo mensual", consolidar.MONEY_FMT)
+        _set_col_format(ws2, "Q periodos deudores", consolidar.Q_FMT)
+        _set_col_format(ws2, "Contrato", consolidar.INT_FMT)
+        _set_col_format(ws2, "Capitas", consolidar.INT_FMT)
+    wb2.save(destino)
+
+
+def _celdas(buf: BytesIO):
+    from openpyxl import load_workbook
+
+    buf.seek(0)
+    wb = load_workbook(buf, read_only=True)
+    return {ws.title: [[(c.value, c.number_format) for c in fila] for fila in ws.iter_rows(min_row=2)] for ws in wb}
+
+
+def _medir(fn: Callable[[], BytesIO], repeticiones: int) -> tuple[float, int, BytesIO]:
+    """Mejor tiempo de `repeticiones` corridas + pico de memoria (tracemalloc) en una corrida aparte."""
+    mejor, res = float("inf"), None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        res = fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return mejor, pico, res
+
+
+def run(filas: int = 200_000, repeticiones: int = 3, seed: int = 42, **_opciones) -> Dict:
+    hojas = generar_hojas(filas, seed)
+
+    def _previo():
+        buf = BytesIO()
+        _exportar_previo(hojas, buf)
+        return buf
+
+    def _nuevo():
+        buf = BytesIO()
+        _exportar_excel(hojas, buf)
+        return buf
+
+    t_ref, mem_ref, buf_ref = _medir(_previo, 1)
+    t_new, mem_new, buf_new = _medir(_nuevo, repeticiones)
+
+    # Golden: mismos valores y formatos de número, celda por celda
+    ref, new = _celdas(buf_ref), _celdas(buf_new)
+    for hoja in ref:
+        if ref[hoja] != new[hoja]:
+            fila = next(i for i, (a, b) in enumerate(zip(ref[hoja], new[hoja])) if a != b)
+            raise AssertionError(f"{hoja}, fila {fila + 2}: {ref[hoja][fila]} != {new[hoja][fila]}")
+
+    return {
+        "exportar": {
+            "filas": sum(len(df) for df in hojas.values()),
+            "constant_memory": max(len(df) for df in hojas.values()) >= consolidar.EXPORT_CONSTANT_MEMORY_FILAS,
+            "previo_s": round(t_ref, 3),
+            "una_pasada_s": round(t_new, 3),
+            "speedup": round(t_ref / t_new, 1) if t_new else None,
+            "previo_pico_mb": round(mem_ref / 1024 / 1024, 1),
+            "una_pasada_pico_mb": round(mem_new / 1024 / 1024, 1),
+        }
+    }
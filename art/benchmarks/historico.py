@@ -0,0 +1,90 @@
+# art/benchmarks/historico.py
+"""
+Lectura de consolidados históricos: XLSX (lo que hacían tasks._productor_from_excel y
+services/excel.cargar_consolidado) vs. el histórico Parquet (art/services/historico.py).
+
+Arma un consolidado con insumos sintéticos (sintetico.py), lo exporta a XLSX y lo guarda en
+un histórico temporal. Casos: hoja «Productor» como texto con 3 columnas (tasks), hoja
+completa con tipos (services/excel.py) y una consulta con filtro (pushdown de filas).
+Verifica que ambas fuentes devuelvan DataFrames idénticos.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+
+from art.benchmarks.pipeline import PERIODO, _insumos_de
+from art.benchmarks.sintetico import generar_insumos
+from art.services import historico
+from art.services.consolidar import ConsolidacionContext, _exportar_excel
+from core.lectura_excel import read_excel_fast
+
+
+def _medir(fn: Callable[[], object], repeticiones: int) -> Tuple[float, object]:
+    mejor, res = float("inf"), None
+    for _ in range(max(1, repeticiones)):
+        t0 = time.perf_counter()
+        res = fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, res
+
+
+def run(filas: int = 200_000, repeticiones: int = 3, seed: int = 42, aseguradoras: int = 6, **_opciones) -> Dict:
+    if not historico.disponible():
+        raise AssertionError("Falta pyarrow: no hay histórico Parquet para comparar.")
+
+    previo = historico.HISTORICO_DIR
+    with tempfile.TemporaryDirectory(prefix="bench_hist_") as tmp:
+        tmp = Path(tmp)
+        insumos = generar_insumos(tmp / "insumos", filas, aseguradoras=aseguradoras, seed=seed, periodo=PERIODO)
+        with _insumos_de(insumos):
+            hojas = ConsolidacionContext.cargar(PERIODO).hojas()
+        xlsx = tmp / f"Consolidado_ART_{PERIODO}.xlsx"
+        _exportar_excel(hojas, xlsx)
+
+        historico.HISTORICO_DIR = tmp / "historico"
+        try:
+            t_guardar, _ = _medir(lambda: historico.guardar_periodo(PERIODO, hojas), 1)
+            resultado = {"guardar": {"hojas": len(hojas), "filas": sum(len(df) for df in hojas.values()),
+                                     "parquet_s": round(t_guardar, 3)}}
+
+            aseg = str(hojas["Consolidado"]["Aseguradora"].mode().iat[0])
+            cols_prod = ["Contrato", "Email del trato", "Productor"]
+            casos = {
+                "productor_texto": (
+                    lambda: read_excel_fast(xlsx, sheet_name="Productor", dtype=str)[cols_prod],
+                    lambda: historico.leer_hoja(PERIODO, "Productor", columnas=cols_prod, como_texto=True),
+                ),
+                "consolidado": (
+                    lambda: read_excel_fast(xlsx, sheet_name="Consolidado"),
+                    lambda: historico.leer_hoja(PERIODO, "Consolidado"),
+                ),
+                "filtro_aseguradora": (
+                    lambda: _filtrar(read_excel_fast(xlsx, sheet_name="Consolidado"), aseg),
+                    lambda: historico.leer_hoja(PERIODO, "Consolidado", filtros=[("Aseguradora", "==", aseg)]),
+                ),
+            }
+            for caso, (ref_fn, new_fn) in casos.items():
+                t_ref, ref = _medir(ref_fn, 1)
+                t_new, new = _medir(new_fn, repeticiones)
+                try:
+                    pd.testing.assert_frame_equal(new, ref)
+                except AssertionError as e:
+                    raise AssertionError(f"{caso}: {e}") from None
+                resultado[caso] = {
+                    "filas": len(ref),
+                    "xlsx_s": round(t_ref, 3),
+                    "parquet_ms": round(t_new * 1000, 1),
+                    "speedup": round(t_ref / t_new) if t_new else None,
+                }
+        finally:
+            historico.HISTORICO_DIR = previo
+    return resultado
+
+
+def _filtrar(df: pd.DataFrame, aseguradora: str) -> pd.DataFrame:
+    return df[df["Aseguradora"] == aseguradora].reset_index(drop=True)
@@ -0,0 +1,112 @@
+# art/benchmarks/importar.py
+"""
+importar_dashboard_art: parseo fila a fila (`iterrows` + update_or_create, el código previo)
+vs. parseo vectorizado (`filas_dashboard`) + bulk_create(update_conflicts=True) en tandas.
+
+Exporta la hoja Consolidado de un consolidado sintético (sintetico.py) a un XLSX junto con
+otras hojas, la elige por encabezados, y verifica que ambos caminos dejen la misma tabla
+ArtDashboardContratoPeriodo. Todo se deshace al terminar.
+"""
+from __future__ import annotations
+
+import io
+import tempfile
+import time
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+from typing import Dict, List
+
+from django.core.management import call_command
+
+from art.benchmarks.pipeline import PERIODO, _insumos_de, _sin_rastros
+from art.benchmarks.sintetico import generar_insumos
+from art.management.commands import importar_dashboard_art as imp
+from art.models import ArtDashboardContratoPeriodo
+from art.services.consolidar import ConsolidacionContext, _exportar_excel
+
+_CAMPOS = [f.name for f in ArtDashboardContratoPeriodo._meta.concrete_fields if f.name != "id"]
+
+
+def _tablero() -> List[tuple]:
+    return sorted(ArtDashboardContratoPeriodo.objects.values_list(*_CAMPOS))
+
+
+# --------------------------
+# Referencia (código previo, por filas)
+# --------------------------
+def _importar_por_filas(df, lote_ref: str) -> None:
+    for _i, row in df.iterrows():
+        periodo = imp.parse_periodo_str(row.get("Periodo", ""))
+        deuda_total = imp.parse_ars(row.get("Deuda total"))
+        costo_mensual = imp.parse_ars(row.get("Costo mensual"))
+        qpd = imp.parse_decimal(row.get("Q periodos deudores"), quant=imp.DEC4)
+        deuda_vs_costo = None
+        if deuda_total is not None and costo_mensual and costo_mensual > 0:
+            deuda_vs_costo = (deuda_total / costo_mensual).quantize(imp.DEC4, rounding=ROUND_HALF_UP)
+        ArtDashboardContratoPeriodo.objects.update_or_create(
+            periodo=periodo,
+            cuit=imp.only_digits(row.get("CUIT", ""))[:20],
+            contrato=row.get("Contrato", ""),
+            aseguradora=row.get("Aseguradora", ""),
+            defaults=dict(
+                razon_social=row.get("Razón social", ""),
+                deuda_total=deuda_total or Decimal("0.00"),
+                costo_mensual=costo_mensual,
+                q_periodos_deudores=qpd,
+                estado_contrato=row.get("Estado contrato", ""),
+                email_trato=row.get("Email del trato", ""),
+                no_contactar=imp.parse_bool_generic(row.get("No contactar")),
+                productor=row.get("Productor", ""),
+                premier=imp.parse_bool_generic(row.get("Premier")),
+                cliente_importante=imp.parse_bool_generic(row.get("Cliente importante")),
+                riesgo_flag=qpd is not None and qpd >= Decimal("2"),
+                bucket_q=imp.bucket_q(qpd),
+                deuda_vs_costo=deuda_vs_costo,
+                lote_ref=lote_ref,
+            ),
+        )
+
+
+def run(filas: int = 100_000, repeticiones: int = 1, seed: int = 42, aseguradoras: int = 6, **_opciones) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="bench_importar_") as tmp:
+        tmp = Path(tmp)
+        insumos = generar_insumos(tmp / "insumos", filas, aseguradoras=aseguradoras, seed=seed, periodo=PERIODO)
+        with _insumos_de(insumos):
+            hojas = ConsolidacionContext.cargar(PERIODO).hojas()
+        xlsx = tmp / "consolidado.xlsx"
+        _exportar_excel(hojas, xlsx)   # la hoja Consolidado no es la primera con datos: "No cruzan" va después
+        n = len(hojas["Consolidado"])
+
+        resultado: Dict = {}
+        t0 = time.perf_counter()
+        nombre, _cols = imp.elegir_hoja(str(xlsx), "auto")
+        resultado["elegir_hoja"] = {"hoja": nombre, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+        with _sin_rastros():
+            mm, yyyy = PERIODO.split("-")
+            del_periodo = ArtDashboardContratoPeriodo.objects.filter(periodo__year=int(yyyy), periodo__month=int(mm))
+            del_periodo.delete()   # ambos caminos arrancan sin filas del período
+            t0 = time.perf_counter()
+            df, _ = imp.read_consolidado_sheet(str(xlsx), nombre)
+            _importar_por_filas(df, "bench")
+            t_ref = time.perf_counter() - t0
+            ref = _tablero()
+            del_periodo.delete()
+
+            t_new = float("inf")
+            for _ in range(max(1, repeticiones)):
+                t0 = time.perf_counter()
+                call_command("importar_dashboard_art", archivo=str(xlsx), hoja="auto", lote="bench",
+                             stdout=io.StringIO())
+                t_new = min(t_new, time.perf_counter() - t0)
+            nuevo = _tablero()
+            if nuevo != ref:
+                raise AssertionError(f"importar: la tabla difiere ({len(set(nuevo) ^ set(ref))} filas)")
+
+        resultado["importar"] = {
+            "filas": n,
+            "por_filas_s": round(t_ref, 3),
+            "bulk_s": round(t_new, 3),
+            "speedup": round(t_ref / t_new, 1) if t_new else None,
+        }
+    return resultado
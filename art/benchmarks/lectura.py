@@ -0,0 +1,155 @@
+# art/benchmarks/lectura.py
+"""
+Lectura de planillas: openpyxl (motor previo) vs. calamine vía `read_excel_fast`
+(core/lectura_excel.py), sobre libros con la forma de los nuestros:
+maestro (dtype=str, celdas mixtas), mapeo, archivo de aseguradora (sin dtype) y el
+Consolidado exportado por `_exportar_excel` (dtype=str como importar_dashboard_art, y sin dtype
+como art/services/excel.py). Si existen el maestro/mapeo reales de settings, también se miden.
+Verifica que ambos motores devuelvan DataFrames idénticos.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from art.benchmarks.exportar import generar_hojas
+from art.services import consolidar
+from art.services.consolidar import _exportar_excel
+from core.lectura_excel import HAY_CALAMINE, read_excel_fast
+
+
+def _escribir(destino: Path, encabezados: List[str], columnas: List[np.ndarray]) -> None:
+    """Escribe celda por celda respetando el tipo Python (número, texto, fecha, bool, vacío)."""
+    wb = xlsxwriter.Workbook(str(destino), {"constant_memory": True})
+    ws = wb.add_worksheet("Hoja1")
+    fecha = wb.add_format({"num_format": "dd/mm/yyyy"})
+    ws.write_row(0, 0, encabezados)
+    for fila, valores in enumerate(zip(*columnas), start=1):
+        for col, v in enumerate(valores):
+            if v is None:
+                continue
+            if isinstance(v, datetime):
+                ws.write_datetime(fila, col, v, fecha)
+            else:
+                ws.write(fila, col, v)
+    wb.close()
+
+
+def generar_libros(carpeta: Path, filas: int, seed: int = 42) -> Dict[str, Path]:
+    rng = np.random.default_rng(seed)
+
+    def _mezcla(*opciones) -> np.ndarray:
+        return rng.choice(np.array(opciones, dtype=object), filas)
+
+    cuits = rng.integers(20_000_000_000, 34_999_999_999, filas).astype(object)
+    como_texto = rng.random(filas) < 0.2
+    cuits[como_texto] = [f"{c // 10**9}-{c % 10**9 // 10:08d}-{c % 10}" for c in cuits[como_texto]]
+    costo = np.round(rng.uniform(500, 250_000, filas), 2).astype(object)
+    texto = rng.random(filas) < 0.3
+    costo[texto] = [f"$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in costo[texto]]
+    costo[rng.random(filas) < 0.05] = None
+    altas = np.array([datetime(2015, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 3650, filas)], dtype=object)
+
+    maestro = {
+        consolidar.M_CUIT: cuits,
+        consolidar.M_RAZON: _mezcla("ACME SA", "Foo SRL", "Ñandú & Cía", None),
+        consolidar.M_CONTRATO: rng.integers(1, 9_999_999, filas).astype(object),
+        consolidar.M_ASEGURADORA: _mezcla("Galeno", "Provincia", "Experta", "OMINT", "Andina ART"),
+        consolidar.M_COSTO: costo,
+        consolidar.M_CUENTA_PERDIDA: _mezcla(None, "Vigente", "Anulada"),
+        consolidar.M_EMAIL: _mezcla("a@b.com", "x@y.com.ar", None),
+        consolidar.M_NO_CONTACTAR: _mezcla(True, False),
+        consolidar.M_PRODUCTOR1: _mezcla("P1", "P2", None),
+        consolidar.M_PRODUCTOR2: _mezcla("P1", None),
+        consolidar.M_REFERIDO_POR: _mezcla("PREMIER", "Otro", None),
+        consolidar.M_CLIENTE_IMP: _mezcla(True, False, None),
+        consolidar.M_CAPITAS: rng.integers(1, 500, filas).astype(object),
+        consolidar.M_RAMO: _mezcla("ART", "Domestica"),
+        "Fecha de alta": altas,
+    }
+    deuda = np.round(rng.uniform(-50_000, 2_000_000, filas), 2).astype(object)
+    texto = rng.random(filas) < 0.2
+    deuda[texto] = [f"{v:.2f}".replace(".", ",") for v in deuda[texto]]
+    aseguradora = {
+        "CUIT": rng.integers(20_000_000_000, 34_999_999_999, filas).astype(object),
+        "Razon Social": maestro[consolidar.M_RAZON],
+        "Deuda Total": deuda,
+        "Periodo": altas,
+    }
+
+    libros = {
+        "maestro": carpeta / "maestro.xlsx",
+        "mapeo": carpeta / "mapeo.xlsx",
+        "aseguradora": carpeta / "aseguradora.xlsx",
+        "consolidado": carpeta / "consolidado.xlsx",
+    }
+    _escribir(libros["maestro"], list(maestro), list(maestro.values()))
+    _escribir(libros["aseguradora"], list(aseguradora), list(aseguradora.values()))
+    nombres = ["Galeno", "Provincia", "Experta", "OMINT", "Andina ART", "Federación Patronal"]
+    _escribir(libros["mapeo"], ["Aseguradora", "deuda_col", "cuit_col"], [
+        np.array(nombres, dtype=object),
+        np.array(["Deuda Total"] * len(nombres), dtype=object),
+        np.array(["CUIT"] * len(nombres), dtype=object),
+    ])
+    _exportar_excel(generar_hojas(filas, seed), libros["consolidado"])
+    return libros
+
+
+def _medir(fn: Callable[[], object], repeticiones: int) -> Tuple[float, object]:
+    mejor, res = float("inf"), None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        res = fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, res
+
+
+def _iguales(a, b, caso: str) -> None:
+    if isinstance(a, dict):
+        assert list(a) == list(b), f"{caso}: hojas distintas {list(a)} != {list(b)}"
+        for hoja in a:
+            _iguales(a[hoja], b[hoja], f"{caso}[{hoja}]")
+        return
+    try:
+        pd.testing.assert_frame_equal(a, b)
+    except AssertionError as e:
+        raise AssertionError(f"{caso}: {e}") from None
+
+
+def run(filas: int = 200_000, repeticiones: int = 3, seed: int = 42, **_opciones) -> Dict:
+    if not HAY_CALAMINE:
+        raise AssertionError("python-calamine no está instalado; no hay motor rápido para comparar.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        libros = generar_libros(Path(tmp), filas, seed)
+        casos = {
+            "maestro": (libros["maestro"], {"sheet_name": 0, "dtype": str}),
+            "mapeo": (libros["mapeo"], {"sheet_name": 0, "dtype": str}),
+            "aseguradora": (libros["aseguradora"], {"sheet_name": 0}),
+            "consolidado_str": (libros["consolidado"], {"sheet_name": None, "dtype": str}),
+            "consolidado": (libros["consolidado"], {"sheet_name": "No cruzan"}),
+        }
+        for nombre, ruta in (("maestro_real", consolidar.MAESTRO_PATH), ("mapeo_real", consolidar.MAPEO_ASEG_PATH)):
+            if Path(ruta).exists():
+                casos[nombre] = (Path(ruta), {"sheet_name": 0, "dtype": str})
+
+        resultado = {}
+        for caso, (ruta, kwargs) in casos.items():
+            t_ref, ref = _medir(lambda: read_excel_fast(ruta, engine="openpyxl", **kwargs), 1)
+            t_new, new = _medir(lambda: read_excel_fast(ruta, engine="calamine", **kwargs), repeticiones)
+            _iguales(ref, new, caso)
+            n = sum(len(df) for df in ref.values()) if isinstance(ref, dict) else len(ref)
+            resultado[caso] = {
+                "filas": n,
+                "openpyxl_s": round(t_ref, 3),
+                "calamine_s": round(t_new, 3),
+                "speedup": round(t_ref / t_new, 1) if t_new else None,
+            }
+    return resultado
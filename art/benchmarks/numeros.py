@@ -0,0 +1,312 @@
+# art/benchmarks/numeros.py
+"""
+Motor común de importes (core/numeros_ar.py) vs. las implementaciones que reemplaza.
+
+1) Equivalencia: cada función previa se compara contra el motor nuevo sobre TODOS los
+   formatos que esa función ya soportaba bien (su dominio). Fuera de ese dominio las
+   previas daban resultados incorrectos ("1,234.56" → 1.23456, "$ (1.234,10)" → 0.0,
+   "1.50" → 150 en Consulta); esas diferencias se cuentan aparte y no fallan el benchmark.
+2) Escalar vs. vectorizado: deben coincidir en todo el corpus, incluida la basura.
+3) Throughput (filas/s) de cada camino.
+Las comprobaciones 1) y 2) también corren como tests en core/tests.py (ParseArTests).
+"""
+from __future__ import annotations
+
+import re
+import time
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.numeros_ar import parse_ar, parse_ar_decimal, parse_ar_series
+
+DEC2 = Decimal("0.01")
+
+
+# --------------------------
+# Implementaciones previas (copiadas tal cual estaban)
+# --------------------------
+_AR_NUM_RE = re.compile(r"[^0-9,\.\-]")
+
+def _prev_consolidar(s: pd.Series, decimals: int | None = None) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(s):
+        out = pd.to_numeric(s, errors="coerce")
+    else:
+        tmp = s.astype(str).str.strip().replace({"": None, "nan": None, "None": None})
+        tmp = tmp.apply(lambda x: None if x is None else _AR_NUM_RE.sub("", x))
+        def _swap_commas(v):
+            if v is None:
+                return None
+            if "," in v:
+                v = v.replace(".", "").replace(",", ".")
+            return v
+        tmp = tmp.apply(_swap_commas)
+        out = pd.to_numeric(tmp, errors="coerce")
+    if decimals is not None:
+        out = out.round(decimals)
+    return out
+
+def _prev_clean_number(value):
+    if pd.isna(value):
+        return 0.0
+    txt = str(value).strip()
+    neg = False
+    if txt.startswith('(') and txt.endswith(')'):
+        neg = True
+        txt = txt[1:-1]
+    if txt.startswith('-'):
+        neg = True
+        txt = txt[1:]
+    elif txt.startswith('+'):
+        txt = txt[1:]
+    txt = txt.replace('$', '').replace(' ', '')
+    if ',' in txt:
+        txt = txt.replace('.', '').replace(',', '.')
+    try:
+        num = float(txt)
+    except ValueError:
+        return 0.0
+    return -num if neg else num
+
+def _prev_extractor(raw):
+    if raw is None or (isinstance(raw, str) and raw.strip() == ""):
+        raise ValueError("Número vacío")
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    txt = str(raw).strip()
+    if "," in txt and "." in txt:
+        txt = txt.replace(".", "").replace(",", ".")
+    elif "," in txt:
+        txt = txt.replace(".", "").replace(",", ".")
+    else:
+        txt = txt.replace(",", "")
+    return float(txt)
+
+def _prev_parse_ars(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    s = str(value).strip()
+    if s == "":
+        return None
+    s = s.replace("$", "").replace("ARS", "").replace("U$S", "")
+    s = re.sub(r"[^\d,.\-]", "", s)
+    if "," in s and s.count(",") == 1 and (s.rfind(",") > s.rfind(".")):
+        s = s.replace(".", "")
+        s = s.replace(",", ".")
+    try:
+        return Decimal(s).quantize(DEC2, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        return None
+
+def _prev_to_decimal(x, quant=DEC2):
+    to_str = lambda v: "" if v is None else str(v).strip()  # noqa: E731
+    if x is None or to_str(x) == "":
+        return None
+    if isinstance(x, (int, float, Decimal)):
+        try:
+            return (Decimal(str(x))).quantize(quant, rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            return None
+    s = to_str(x)
+    s = s.replace("$", "").replace("ARS", "").replace("U$S", "")
+    s = re.sub(r"[^\d,.\-]", "", s)
+    if "," in s and s.count(",") == 1 and (s.rfind(",") > s.rfind(".")):
+        s = s.replace(".", "").replace(",", ".")
+    try:
+        return Decimal(s).quantize(quant, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        return None
+
+def _prev_to_float_q(v):
+    if v is None:
+        return None
+    s = str(v).strip()
+    if not s:
+        return None
+    s = s.replace(".", "").replace(",", ".")
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+def _prev_persistencia(val):
+    if val is None or (isinstance(val, float) and pd.isna(val)):
+        return Decimal("0")
+    if isinstance(val, (int, float, Decimal)):
+        try:
+            return Decimal(str(val))
+        except InvalidOperation:
+            return Decimal("0")
+    s = str(val).strip()
+    if not s:
+        return Decimal("0")
+    s = (s.replace("U$S", "").replace("u$s", "").replace("$", "")
+          .replace(".", "").replace(" ", "").replace(",", "."))
+    try:
+        return Decimal(s)
+    except InvalidOperation:
+        return Decimal("0")
+
+
+# --------------------------
+# Corpus
+# --------------------------
+def _fmt_ar(v: float, miles: bool = True) -> str:
+    txt = f"{abs(v):,.2f}" if miles else f"{abs(v):.2f}"
+    return txt.replace(",", "X").replace(".", ",").replace("X", ".")
+
+FORMATOS: Dict[str, Callable[[float], object]] = {
+    "ar":            lambda v: _fmt_ar(v),
+    "ar_sin_miles":  lambda v: _fmt_ar(v, miles=False),
+    "ar_neg":        lambda v: "-" + _fmt_ar(v),
+    "ar_pesos":      lambda v: "$ " + _fmt_ar(v),
+    "ar_parentesis": lambda v: "(" + _fmt_ar(v) + ")",
+    "pesos_paren":   lambda v: "$ (" + _fmt_ar(v) + ")",
+    "us_miles":      lambda v: f"{abs(v):,.2f}",
+    "plano":         lambda v: f"{abs(v):.2f}",
+    "entero":        lambda v: str(int(abs(v))),
+    "float":         lambda v: round(abs(v), 2),
+}
+VACIOS = ["", "   ", None, float("nan")]
+# "nan" textual (columnas pasadas por astype(str)): las previas devolvían NaN/Decimal('NaN')
+NAN_TEXTO = ["nan", "NaN", "None"]
+BASURA = ["abc", "-", "$", ".", "1-2", "(", "1.2.3,4,5", "12-34", "1.234,56-", "abc12", "12 pesos", "1e-07"]
+
+
+def generar_corpus(filas: int, seed: int = 42) -> Tuple[List[object], List[str], List[float]]:
+    rng = np.random.default_rng(seed)
+    magnitudes = rng.choice([10, 1_000, 100_000, 10_000_000], filas)
+    valores = np.round(rng.uniform(0, 1, filas) * magnitudes, 2)
+    nombres = list(FORMATOS)
+    fmt_idx = rng.integers(0, len(nombres), filas)
+    datos, formatos = [], []
+    for v, i in zip(valores, fmt_idx):
+        datos.append(FORMATOS[nombres[i]](float(v)))
+        formatos.append(nombres[i])
+    datos += VACIOS + NAN_TEXTO + BASURA
+    formatos += ["vacio"] * len(VACIOS) + ["nan_texto"] * len(NAN_TEXTO) + ["basura"] * len(BASURA)
+    return datos, formatos, list(valores)
+
+
+# Formatos que cada implementación previa ya resolvía bien
+_AR = {"ar", "ar_sin_miles", "ar_neg", "ar_pesos", "plano", "entero", "float", "vacio"}
+DOMINIOS: Dict[str, set] = {
+    "consolidar._to_number_ar_series": _AR | {"nan_texto"},
+    "art_parsers._clean_number":       _AR | {"ar_parentesis"},
+    "extractor.clean_number":          _AR - {"vacio", "ar_pesos"},
+    "importar.parse_ars":              _AR,
+    "volcar.to_decimal":               _AR,
+    "consulta._to_float_q":            {"ar", "ar_sin_miles", "entero", "vacio"},
+    "persistencia._to_decimal":        {"ar", "ar_sin_miles", "ar_pesos", "entero", "vacio"},
+}
+
+
+def _implementaciones() -> Dict[str, Tuple[Callable, Callable]]:
+    """(previa, actual) por función; las actuales son las de cada módulo, ya migradas al motor."""
+    from art.management.commands.importar_dashboard_art import parse_ars
+    from art.management.commands.volcar_dashboard_art import to_decimal
+    from art.services.persistencia_consolidado import _to_decimal
+    from art.views.consulta import _to_float_q
+    from extractor.common import clean_number
+    from gestion_cobranzas.parsers.art_parsers import _clean_number
+
+    return {
+        "art_parsers._clean_number": (_prev_clean_number, _clean_number),
+        "extractor.clean_number":    (_prev_extractor, clean_number),
+        "importar.parse_ars":        (_prev_parse_ars, parse_ars),
+        "volcar.to_decimal":         (_prev_to_decimal, to_decimal),
+        "consulta._to_float_q":      (_prev_to_float_q, _to_float_q),
+        "persistencia._to_decimal":  (_prev_persistencia, _to_decimal),
+    }
+
+
+def _iguales(a, b) -> bool:
+    # NaN (float o Decimal) equivale a "sin número": None en las actuales
+    def _nada(x):
+        return x is None or (isinstance(x, (float, Decimal)) and x != x)
+    if _nada(a) or _nada(b):
+        return _nada(a) and _nada(b)
+    return a == b
+
+
+def _llamar(fn: Callable, v):
+    try:
+        return fn(v)
+    except (ValueError, TypeError):
+        return "error"
+
+
+def _comparar(nombre: str, pares, formatos: List[str]) -> Dict:
+    """Falla si difieren dentro del dominio; cuenta (y muestra) las diferencias fuera de él."""
+    fuera, ejemplos = 0, []
+    for (v, a, b), f in zip(pares, formatos):
+        if _iguales(a, b):
+            continue
+        if f in DOMINIOS[nombre]:
+            raise AssertionError(f"{nombre}: {v!r} ({f}) → previo {a!r} / nuevo {b!r}")
+        fuera += 1
+        if len(ejemplos) < 3:
+            ejemplos.append(f"{v!r}: {a!r} → {b!r}")
+    return {"diferencias_fuera_de_dominio": fuera, "ejemplos": ejemplos}
+
+
+def _tiempo(fn: Callable[[], object], repeticiones: int) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def run(filas: int = 200_000, repeticiones: int = 3, seed: int = 42, **_opciones) -> Dict:
+    datos, formatos, _ = generar_corpus(filas, seed)
+    serie = pd.Series(datos, dtype=object)
+    resultados: Dict[str, Dict] = {}
+
+    # 1) Equivalencia contra cada implementación previa (sobre una muestra + vacíos/basura)
+    extra = len(VACIOS) + len(NAN_TEXTO) + len(BASURA)
+    muestra = min(filas, 50_000)
+    d_m = datos[:muestra] + datos[-extra:]
+    f_m = formatos[:muestra] + formatos[-extra:]
+
+    prev_s = _prev_consolidar(pd.Series(d_m, dtype=object), 2)
+    nuevo_s = parse_ar_series(pd.Series(d_m, dtype=object), 2)
+    resultados["consolidar._to_number_ar_series"] = _comparar(
+        "consolidar._to_number_ar_series",
+        ((v, float(a), float(b)) for v, a, b in zip(d_m, prev_s, nuevo_s)),
+        f_m,
+    )
+    for nombre, (prev, actual) in _implementaciones().items():
+        resultados[nombre] = _comparar(
+            nombre, ((v, _llamar(prev, v), _llamar(actual, v)) for v in d_m), f_m
+        )
+
+    # 2) Escalar vs. vectorizado en todo el corpus
+    vec = parse_ar_series(serie).to_numpy()
+    for v, x in zip(datos, vec):
+        e = parse_ar(v)
+        if not ((e is None and np.isnan(x)) or e == x):
+            raise AssertionError(f"escalar/vectorizado difieren en {v!r}: {e!r} vs {x!r}")
+    for v in d_m:
+        d, f = parse_ar_decimal(v), parse_ar(v)
+        if (d is None) != (f is None) or (d is not None and float(d) != f):
+            raise AssertionError(f"Decimal/float difieren en {v!r}: {d!r} vs {f!r}")
+
+    # 3) Throughput
+    n = len(datos)
+    t_prev_serie = _tiempo(lambda: _prev_consolidar(serie, 2), 1)
+    t_prev_apply = _tiempo(lambda: serie.apply(_prev_clean_number), 1)
+    t_escalar = _tiempo(lambda: [parse_ar(v) for v in datos], 1)
+    t_vec = _tiempo(lambda: parse_ar_series(serie, 2), repeticiones)
+    resultados["throughput"] = {
+        "filas": n,
+        "previo_consolidar_filas_s": int(n / t_prev_serie),
+        "previo_apply_filas_s": int(n / t_prev_apply),
+        "escalar_filas_s": int(n / t_escalar),
+        "vectorizado_filas_s": int(n / t_vec),
+        "speedup_vs_apply": round(t_prev_apply / t_vec, 1),
+    }
+    return resultados
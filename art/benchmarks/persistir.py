@@ -0,0 +1,118 @@
+# art/benchmarks/persistir.py
+"""
+Persistencia de ConsolidadoItem: mapeo fila a fila (`_row_to_item_kwargs` + bulk_create,
+lo que hacía guardar_lote_y_items) vs. mapeo columnar (`_items_por_columnas`) + `cargar_items`
+(COPY FROM STDIN en PostgreSQL, bulk_create en SQLite).
+
+Las hojas salen de un consolidado armado con insumos sintéticos (sintetico.py). Verifica que
+el mapeo columnar dé exactamente los mismos campos que el de referencia y, después de cada
+carga, que la base tenga las mismas filas. Las inserciones se deshacen al terminar.
+También mide `_calc_hash` (huella completa de las hojas) y verifica que sea estable
+(misma entrada → mismo hash) y que cambie si cambia una celda de la última fila.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from art.benchmarks.pipeline import PERIODO, _insumos_de, _sin_rastros
+from art.benchmarks.sintetico import generar_insumos
+from art.models import ConsolidadoItem, ConsolidadoLote
+from art.services import persistencia_consolidado as pc
+from art.services.consolidar import ConsolidacionContext
+
+_HOJAS = (("Consolidado", "consolidado"), ("No cruzan", "no_cruzan"), ("Productor", "productor"))
+
+
+def _por_filas(hojas, periodo: date) -> List[Dict]:
+    return [pc._row_to_item_kwargs(row, periodo=periodo, hoja=hoja)
+            for nombre, hoja in _HOJAS
+            for row in hojas[nombre].to_dict(orient="records")]
+
+
+def _por_columnas(hojas, periodo: date) -> List[Dict]:
+    return [pc._items_por_columnas(hojas[nombre], periodo, hoja) for nombre, hoja in _HOJAS]
+
+
+def _como_kwargs(bloques: List[Dict]) -> List[Dict]:
+    return [dict(zip(pc._CAMPOS_ITEM, fila)) for b in bloques for fila in zip(*(b[c] for c in pc._CAMPOS_ITEM))]
+
+
+def _en_base(lote: ConsolidadoLote) -> List[tuple]:
+    return list(ConsolidadoItem.objects.filter(lote=lote).order_by("id").values_list(*pc._CAMPOS_ITEM))
+
+
+def run(filas: int = 100_000, repeticiones: int = 1, seed: int = 42, aseguradoras: int = 6, **_opciones) -> Dict:
+    periodo = pc._parse_periodo(PERIODO)
+    with tempfile.TemporaryDirectory(prefix="bench_persistir_") as tmp:
+        insumos = generar_insumos(Path(tmp), filas, aseguradoras=aseguradoras, seed=seed, periodo=PERIODO)
+        with _insumos_de(insumos):
+            hojas = ConsolidacionContext.cargar(PERIODO).hojas()
+
+    # Hash de entrada
+    args = [hojas[nombre] for nombre, _ in _HOJAS]
+    t0 = time.perf_counter()
+    huella = pc._calc_hash(PERIODO, *args, {})
+    t_hash = time.perf_counter() - t0
+    if pc._calc_hash(PERIODO, *[df.copy() for df in args], {}) != huella:
+        raise AssertionError("hash: la misma entrada dio otro hash")
+    tocada = args[0].copy()
+    tocada.iloc[-1, -1] = "cambio"
+    if pc._calc_hash(PERIODO, tocada, *args[1:], {}) == huella:
+        raise AssertionError("hash: no detecta un cambio en la última fila")
+
+    # Mapeo
+    t0 = time.perf_counter()
+    ref = _por_filas(hojas, periodo)
+    t_ref_mapeo = time.perf_counter() - t0
+    t_new_mapeo, bloques = float("inf"), None
+    for _ in range(max(1, repeticiones)):
+        t0 = time.perf_counter()
+        bloques = _por_columnas(hojas, periodo)
+        t_new_mapeo = min(t_new_mapeo, time.perf_counter() - t0)
+    nuevos = _como_kwargs(bloques)
+    if len(nuevos) != len(ref):
+        raise AssertionError(f"mapeo: {len(nuevos)} filas vs {len(ref)}")
+    for i, (a, b) in enumerate(zip(nuevos, ref)):
+        if a != b:
+            campo = next(k for k in b if a.get(k) != b[k])
+            raise AssertionError(f"mapeo fila {i}, {campo}: {a.get(campo)!r} != {b[campo]!r}")
+
+    # Inserción: cada carga en su propia transacción deshecha (las dos arrancan con la tabla igual)
+    n = len(ref)
+
+    def insertar(cargar) -> tuple:
+        with _sin_rastros():
+            usuario, _ = get_user_model().objects.get_or_create(username="benchmark_art")
+            lote = ConsolidadoLote.objects.create(usuario=usuario, periodo=periodo)
+            t0 = time.perf_counter()
+            cargar(lote)
+            segundos = time.perf_counter() - t0
+            return segundos, _en_base(lote)
+
+    t_ref_insert, en_base_ref = insertar(lambda lote: ConsolidadoItem.objects.bulk_create(
+        [ConsolidadoItem(lote=lote, **kw) for kw in ref], batch_size=2000))
+    t_new_insert, en_base_new = insertar(lambda lote: pc.cargar_items(lote, bloques))
+    if en_base_new != en_base_ref:
+        raise AssertionError("insert: las filas guardadas no coinciden con las de referencia")
+
+    def fps(t: float) -> int:
+        return round(n / t) if t else 0
+
+    modo = pc.CARGA_ITEMS if pc.CARGA_ITEMS != "auto" else (
+        "copy" if connection.vendor == "postgresql" else "bulk_create")
+    return {
+        "hash": {"filas": n, "segundos": round(t_hash, 3)},
+        "mapeo": {"filas": n, "por_filas_s": round(t_ref_mapeo, 3), "columnar_s": round(t_new_mapeo, 3),
+                  "por_filas_filas_s": fps(t_ref_mapeo), "columnar_filas_s": fps(t_new_mapeo)},
+        "insert": {"base": connection.vendor, "carga": modo,
+                   "referencia_s": round(t_ref_insert, 3), "nuevo_s": round(t_new_insert, 3)},
+        "total": {"antes_filas_s": fps(t_ref_mapeo + t_ref_insert),
+                  "despues_filas_s": fps(t_new_mapeo + t_new_insert)},
+    }
@@ -0,0 +1,185 @@
+# art/benchmarks/pipeline.py
+"""
+Pipeline completo del Consolidado ART sobre insumos sintéticos (art/benchmarks/sintetico.py),
+etapa por etapa y de punta a punta, contra la base configurada (SQLite o Postgres local).
+
+Etapas: cargar (maestro + mapeo + deudas + cruce), hojas (ConsolidacionContext.hojas),
+derivar_hojas (art.utils.consolidado.derivar_hojas_consolidado), exportar (_exportar_excel),
+persistir (guardar_lote_y_items), volcar (volcar_dashboard_art) y end_to_end
+(ejecutar_consolidacion). Todo lo que se escribe en la base se deshace al terminar (rollback).
+
+Por etapa: tiempo (mejor de `repeticiones`), pico de RSS del proceso (muestreado) y filas/s.
+La caché de insumos se desactiva para medir lecturas en frío. Con --workers > 1 los procesos
+hijos no suman al RSS informado.
+
+    python manage.py benchmark_art pipeline --filas 100000 --aseguradoras 8 --json bench.json
+"""
+from __future__ import annotations
+
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+
+from art.benchmarks.sintetico import generar_insumos
+from art.services import cache_insumos, consolidar, pipeline_consolidado
+from art.services.consolidar import ConsolidacionContext, _exportar_excel
+from art.services.perfilado import MonitorRSS
+from art.services.persistencia_consolidado import guardar_lote_y_items
+from art.utils.consolidado import derivar_hojas_consolidado
+from core.lectura_excel import resolver_motor
+
+ETAPAS = ("cargar", "hojas", "derivar_hojas", "exportar", "persistir", "volcar", "end_to_end")
+
+# Período sin datos reales: ni el reemplazo del período ni la comparación incremental
+# tocan lotes/tablero verdaderos.
+PERIODO = "01-2000"
+
+
+def _medir(fn: Callable[[], object], repeticiones: int) -> tuple[float, Optional[int], object]:
+    mejor, pico, res = float("inf"), None, None
+    for _ in range(max(1, repeticiones)):
+        with MonitorRSS(intervalo=0.01) as monitor:
+            t0 = time.perf_counter()
+            res = fn()
+            mejor = min(mejor, time.perf_counter() - t0)
+        if monitor.pico is not None:
+            pico = max(pico or 0, monitor.pico)
+    return mejor, pico, res
+
+
+def _fila_reporte(segundos: float, pico: Optional[int], filas: int) -> Dict:
+    return {
+        "filas": filas,
+        "wall_s": round(segundos, 3),
+        "pico_rss_mb": round(pico / 1024 / 1024, 1) if pico is not None else None,
+        "filas_por_s": round(filas / segundos) if segundos else None,
+    }
+
+
+# --------------------------
+# Entorno de la corrida
+# --------------------------
+@contextmanager
+def _insumos_de(insumos) -> Iterator[None]:
+    """Apunta consolidar a los insumos sintéticos y desactiva la caché (se restaura al salir)."""
+    previos = (consolidar.BASE_ASEG_DIR, consolidar.MAESTRO_PATH, consolidar.MAPEO_ASEG_PATH,
+               pipeline_consolidado.MAESTRO_PATH, cache_insumos.CACHE_HABILITADO)
+    consolidar.BASE_ASEG_DIR = insumos.aseguradoras_dir
+    consolidar.MAESTRO_PATH = pipeline_consolidado.MAESTRO_PATH = insumos.maestro
+    consolidar.MAPEO_ASEG_PATH = insumos.mapeo
+    cache_insumos.CACHE_HABILITADO = False
+    try:
+        yield
+    finally:
+        (consolidar.BASE_ASEG_DIR, consolidar.MAESTRO_PATH, consolidar.MAPEO_ASEG_PATH,
+         pipeline_consolidado.MAESTRO_PATH, cache_insumos.CACHE_HABILITADO) = previos
+
+
+@contextmanager
+def _sin_rastros() -> Iterator[None]:
+    """Todo lo escrito en la base adentro del bloque se deshace (lotes, items, tablero, usuario)."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def run(
+    filas: int = 100_000,
+    repeticiones: int = 1,
+    seed: int = 42,
+    aseguradoras: int = 6,
+    workers: int = 1,
+    etapas: Optional[str] = None,
+    **_opciones,
+) -> Dict:
+    pedidas = [e.strip() for e in (etapas or ",".join(ETAPAS)).split(",") if e.strip()]
+    desconocidas = set(pedidas) - set(ETAPAS)
+    if desconocidas:
+        raise ValueError(f"Etapas desconocidas: {sorted(desconocidas)}. Válidas: {', '.join(ETAPAS)}")
+
+    resultado: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_art_") as tmp:
+        t0 = time.perf_counter()
+        insumos = generar_insumos(Path(tmp), filas, aseguradoras=aseguradoras, seed=seed, periodo=PERIODO)
+        resultado["entorno"] = {
+            "filas_deuda": filas,
+            "filas_maestro": insumos.filas_maestro,
+            "aseguradoras": len(insumos.aseguradoras),
+            "workers": workers,
+            "seed": seed,
+            "db": connection.vendor,
+            "motor_excel": resolver_motor() or "openpyxl",
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "plataforma": sys.platform,
+            "generacion_s": round(time.perf_counter() - t0, 1),
+        }
+        periodo = insumos.periodo
+        mm, yyyy = periodo.split("-")
+
+        with _insumos_de(insumos):
+            # El contexto se arma siempre: las etapas siguientes lo usan
+            t, pico, ctx = _medir(lambda: ConsolidacionContext.cargar(periodo, workers=workers), repeticiones)
+            if "cargar" in pedidas:
+                resultado["cargar"] = _fila_reporte(t, pico, filas)
+            errores = ctx.errores_archivos
+            assert not errores, f"Aseguradoras sintéticas ilegibles: {errores}"
+
+            t, pico, hojas = _medir(lambda: ConsolidacionContext(
+                periodo=periodo, maestro=ctx.maestro, mapeo=ctx.mapeo, deudas=ctx.deudas, cruce=ctx.cruce,
+            ).hojas(), repeticiones)
+            if "hojas" in pedidas:
+                resultado["hojas"] = _fila_reporte(t, pico, len(ctx.cruce))
+
+            if "derivar_hojas" in pedidas:
+                t, pico, _ = _medir(lambda: derivar_hojas_consolidado(ctx.consolidado, ctx.no_cruzan), repeticiones)
+                resultado["derivar_hojas"] = _fila_reporte(t, pico, len(ctx.consolidado) + len(ctx.no_cruzan))
+
+            if "exportar" in pedidas:
+                t, pico, _ = _medir(lambda: _exportar_excel(hojas, BytesIO()), repeticiones)
+                resultado["exportar"] = _fila_reporte(t, pico, sum(len(df) for df in hojas.values()))
+
+            if {"persistir", "volcar"} & set(pedidas):
+                esperados = sum(len(hojas[h]) for h in ("Consolidado", "No cruzan", "Productor"))
+                with _sin_rastros():
+                    usuario, _ = get_user_model().objects.get_or_create(username="benchmark_art")
+                    t, pico, guardado = _medir(lambda: guardar_lote_y_items(
+                        usuario=usuario, periodo_str=periodo,
+                        df_consolidado=hojas["Consolidado"], df_no_cruzan=hojas["No cruzan"],
+                        df_productor=hojas["Productor"], reemplazar_periodo=True,
+                    ), repeticiones)
+                    assert guardado.items_creados == esperados, (
+                        f"persistir: {guardado.items_creados} items != {esperados} filas de las hojas"
+                    )
+                    if "persistir" in pedidas:
+                        resultado["persistir"] = _fila_reporte(t, pico, guardado.items_creados)
+                    if "volcar" in pedidas:
+                        t, pico, _ = _medir(lambda: call_command(
+                            "volcar_dashboard_art", periodo=f"{yyyy}-{mm}", reset_periodo=True, verbosity=0,
+                        ), repeticiones)
+                        resultado["volcar"] = _fila_reporte(t, pico, guardado.items_creados)
+
+            if "end_to_end" in pedidas:
+                with _sin_rastros():
+                    usuario, _ = get_user_model().objects.get_or_create(username="benchmark_art")
+                    t, pico, res = _medir(lambda: pipeline_consolidado.ejecutar_consolidacion(
+                        periodo, usuario, on_etapa=None,
+                    ), repeticiones)
+                    assert not res.advertencias, f"end_to_end: {res.advertencias}"
+                    resultado["end_to_end"] = _fila_reporte(t, pico, filas)
+                    # Desglose que la corrida guarda en ConsolidadoLote.perfil
+                    resultado["end_to_end"]["etapas_s"] = {
+                        k: v["segundos"] for k, v in res.perfil.get("etapas", {}).items()
+                    }
+
+    return resultado
@@ -0,0 +1,172 @@
+# art/benchmarks/roll_rate.py
+"""
+Roll rate entre bandas de Q (art/services/roll_rate.py): traer los dos períodos completos de
+ArtDashboardContratoPeriodo a pandas y cruzarlos (lo que habría que hacer sin el self-join)
+vs. `matriz()` / `serie()`, una sentencia SQL cada una.
+
+Carga un tablero sintético de `periodos` meses en el que cada contrato tiene su Q mes a mes
+(sube, baja, se cura, aparece y desaparece), verifica que la matriz del último par, la de un
+par salteado y la serie de 12 meses coincidan con la referencia, y que la pantalla y el JSON
+de la serie (art/views/roll_rate.py) respondan cada uno dentro de PRESUPUESTO_MS. Todo se
+deshace al terminar.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from art.benchmarks.pipeline import _sin_rastros
+from art.models import ArtDashboardContratoPeriodo, ArtDashboardCubo
+from art.services import cubo, roll_rate
+from art.views.roll_rate import MESES_SERIE, contexto_roll_rate, serie_roll_rate
+
+PRESUPUESTO_MS = 200
+PRESUPUESTO_CONSULTAS = {"pantalla": 2, "serie_json": 1}   # pantalla: períodos + matriz
+
+_ASEGURADORAS = ["Provincia", "Experta", "Galeno", "La Segunda", "Omint", "Prevención"]
+_CLAVE = ["cuit", "contrato", "aseguradora"]
+
+
+def _tablero_sintetico(filas: int, periodos: int, seed: int) -> List[ArtDashboardContratoPeriodo]:
+    """~filas/periodos contratos por mes; el mismo CUIT tiene varios contratos y aseguradoras."""
+    rnd = random.Random(seed)
+    meses = [date(2000 + (m // 12), m % 12 + 1, 1) for m in range(periodos)]
+    objetos = []
+    for i in range(max(1, filas // periodos)):
+        cuit, contrato, aseguradora = f"30{i // 4:09d}", str(i % 2 + 1), _ASEGURADORAS[(i // 2) % 6]
+        alta = rnd.randrange(periodos) if rnd.random() < 0.3 else 0
+        baja = rnd.randrange(alta, periodos) + 1 if rnd.random() < 0.3 else periodos
+        q = Decimal(rnd.choice([0, 0, 1, 2, 3]))
+        for m in range(alta, baja):
+            if rnd.random() < 0.03:
+                continue   # hueco: no figura ese mes
+            paso = rnd.random()
+            if paso < 0.15:
+                q = Decimal("0")
+            elif paso < 0.55:
+                q += 1
+            elif paso < 0.7 and q >= 1:
+                q -= 1
+            objetos.append(ArtDashboardContratoPeriodo(
+                periodo=meses[m],
+                cuit=cuit,
+                contrato=contrato,
+                aseguradora=aseguradora,
+                deuda_total=Decimal(rnd.randint(0, 5_000_000)) / 100,
+                q_periodos_deudores=None if rnd.random() < 0.02 else q + Decimal(rnd.randint(0, 99)) / 100,
+            ))
+    return objetos
+
+
+# --------------------------
+# Referencia (pandas, dos períodos completos)
+# --------------------------
+def _periodo_df(p: date) -> pd.DataFrame:
+    filas = ArtDashboardContratoPeriodo.objects.filter(periodo=p).values_list(
+        *_CLAVE, "q_periodos_deudores", "deuda_total")
+    df = pd.DataFrame(list(filas), columns=[*_CLAVE, "q", "deuda"])
+    q = pd.to_numeric(df["q"], errors="coerce")
+    condiciones = [q >= desde for desde, _b in cubo.LIMITES_BANDA]
+    df["banda"] = np.select(condiciones, [b for _d, b in cubo.LIMITES_BANDA], ArtDashboardCubo.BANDA_SIN_DEUDA)
+    df["deuda"] = df["deuda"].astype(float)
+    return df[[*_CLAVE, "banda", "deuda"]]
+
+
+def _matriz_referencia(desde: date, hasta: date, altas: bool = True) -> Dict:
+    a, b = _periodo_df(desde), _periodo_df(hasta)
+    m = a.merge(b, on=_CLAVE, how="outer", suffixes=("_a", "_b"), indicator=True)
+    m["origen"] = m["banda_a"].where(m["_merge"] != "right_only", roll_rate.ALTA)
+    m["destino"] = m["banda_b"].where(m["_merge"] != "left_only", roll_rate.BAJA)
+    m["monto"] = m["deuda_a"].where(m["_merge"] != "right_only", m["deuda_b"])
+    if not altas:   # como roll_rate.serie(): solo a dónde fue la deuda
+        m = m[(m["_merge"] != "right_only") & m["origen"].isin(ArtDashboardCubo.BANDAS_DEUDA)]
+    g = m.groupby(["origen", "destino"]).agg(n=("monto", "size"), monto=("monto", "sum"))
+    return {k: (int(r.n), float(r.monto)) for k, r in g.iterrows()}
+
+
+def _iguales(a: Dict, b: Dict) -> bool:
+    return a.keys() == b.keys() and all(
+        a[k][0] == b[k][0] and math.isclose(a[k][1], b[k][1], rel_tol=1e-9, abs_tol=1e-6) for k in a
+    )
+
+
+def _medir(fn, repeticiones: int):
+    mejor = float("inf")
+    for _ in range(max(1, repeticiones)):
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            res = fn()
+            mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, len(ctx.captured_queries), res
+
+
+def run(filas: int = 100_000, repeticiones: int = 1, seed: int = 42, periodos: int = 24, **_opciones) -> Dict:
+    resultado: Dict = {}
+    with _sin_rastros():
+        ArtDashboardContratoPeriodo.objects.all().delete()
+        ArtDashboardContratoPeriodo.objects.bulk_create(_tablero_sintetico(filas, periodos, seed), batch_size=5000)
+        cubo.refrescar()
+        with connection.cursor() as cur:
+            # Estadísticas al día, como las deja el autovacuum de PostgreSQL: sin ellas SQLite busca
+            # el destino por el índice único y va a la tabla en vez de usar el índice compuesto
+            cur.execute(f"ANALYZE {connection.ops.quote_name(ArtDashboardContratoPeriodo._meta.db_table)}")
+        meses = sorted(set(ArtDashboardContratoPeriodo.objects.values_list("periodo", flat=True)))
+
+        casos = {"ultimo_par": (meses[-2], meses[-1]), "salteado": (meses[0], meses[len(meses) // 2])}
+        for caso, (desde, hasta) in casos.items():
+            t_ref, _q, ref = _medir(lambda: _matriz_referencia(desde, hasta), repeticiones)
+            t_new, q_new, nuevo = _medir(lambda: roll_rate.matriz(desde, hasta), repeticiones)
+            if not _iguales(nuevo, ref):
+                distintas = sorted(k for k in ref.keys() | nuevo.keys() if ref.get(k) != nuevo.get(k))
+                raise AssertionError(f"{caso}: la matriz difiere en {distintas[:5]}")
+            resultado[caso] = {
+                "desde": desde.isoformat(),
+                "hasta": hasta.isoformat(),
+                "contratos": sum(n for n, _m in nuevo.values()),
+                "consultas": q_new,
+                "pandas_s": round(t_ref, 3),
+                "sql_s": round(t_new, 3),
+                "speedup": round(t_ref / t_new, 1) if t_new else None,
+            }
+
+        pares = list(zip(meses[:-1], meses[1:]))[-MESES_SERIE:]
+        t0 = time.perf_counter()
+        ref = [(p1, _matriz_referencia(p0, p1, altas=False)) for p0, p1 in pares]
+        t_ref = time.perf_counter() - t0
+        t_new, q_new, nuevo = _medir(lambda: roll_rate.serie(meses[-1], MESES_SERIE), repeticiones)
+        if [p for p, _m in nuevo] != [p for p, _m in ref] or not all(
+            _iguales(n, r) for (_p, n), (_q, r) in zip(nuevo, ref)
+        ):
+            raise AssertionError("serie: los roll rates difieren de la referencia")
+        resultado["serie"] = {
+            "pares": len(nuevo),
+            "consultas": q_new,
+            "pandas_s": round(t_ref, 3),
+            "sql_s": round(t_new, 3),
+            "speedup": round(t_ref / t_new, 1) if t_new else None,
+        }
+
+        respuestas = {"pantalla": lambda: contexto_roll_rate(None, None), "serie_json": lambda: serie_roll_rate(None)}
+        for caso, fn in respuestas.items():
+            t, q, _ctx = _medir(fn, repeticiones)
+            if q > PRESUPUESTO_CONSULTAS[caso]:
+                raise AssertionError(f"{caso}: {q} consultas (presupuesto {PRESUPUESTO_CONSULTAS[caso]})")
+            if t * 1000 > PRESUPUESTO_MS:
+                raise AssertionError(f"{caso}: {t * 1000:.0f} ms (presupuesto {PRESUPUESTO_MS} ms)")
+            resultado[caso] = {
+                "filas_tablero": ArtDashboardContratoPeriodo.objects.count(),
+                "meses": len(meses),
+                "consultas": q,
+                "ms": round(t * 1000, 1),
+                "presupuesto_ms": PRESUPUESTO_MS,
+            }
+    return resultado
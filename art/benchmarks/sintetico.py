@@ -0,0 +1,165 @@
+# art/benchmarks/sintetico.py
+"""
+Generador reproducible (semilla) de insumos del Consolidado ART con la forma de los reales:
+maestro (export de CRM, dtype str con importes AR), «Mapeo aseguradoras.xlsx» y un archivo
+`<Aseguradora>/<MM-AAAA>.xlsx` por aseguradora.
+
+• Las filas de deuda se reparten entre las aseguradoras; Andina trae CUIT repetidos (tabla
+  dinámica), Experta deuda con signo invertido, Federación Patronal deuda "Cuota + Interes"
+  y OMINT cruza contra "Serena" en el maestro.
+• ~`cruce` de los CUIT de deuda están en el maestro (el resto va a «No cruzan»); ~5% del
+  maestro son filas duplicadas no vigentes.
+• Importes: 70% numéricos y 30% texto "$ 1.234,56"; CUIT del maestro con guiones.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import xlsxwriter
+
+from art.services import consolidar
+
+# (carpeta, columna(s) de deuda en el mapeo)
+ASEGURADORAS: List[Tuple[str, str]] = [
+    ("Andina ART", "Saldo"),
+    ("Experta", "Saldo Total"),
+    ("Galeno", "Saldo"),
+    ("OMINT", "Saldo Cuenta Corriente"),
+    ("Provincia", "SALDO"),
+    ("Federacion Patronal", "Cuota + Interes"),
+    ("Prevencion", "Deuda"),
+    ("La Segunda", "Saldo"),
+]
+
+
+@dataclass
+class InsumosSinteticos:
+    carpeta: Path
+    periodo: str                     # "MM-AAAA"
+    maestro: Path
+    mapeo: Path
+    aseguradoras_dir: Path
+    filas_deuda: int
+    filas_maestro: int
+    aseguradoras: List[str]
+
+
+def _aseguradoras(n: int) -> List[Tuple[str, str]]:
+    base = list(ASEGURADORAS[:n])
+    base += [(f"Aseguradora {i:02d}", "Saldo") for i in range(len(base) + 1, n + 1)]
+    return base
+
+
+def _importe_ar(v: float) -> str:
+    return "$ " + f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _importes(rng: np.random.Generator, n: int, bajo: float, alto: float, signo: int = 1) -> list:
+    vals = signo * np.round(rng.uniform(bajo, alto, n), 2)
+    texto = rng.random(n) < 0.3
+    return [_importe_ar(v) if t else float(v) for v, t in zip(vals, texto)]
+
+
+def _escribir(destino: Path, encabezados: List[str], columnas: List[list]) -> None:
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    wb = xlsxwriter.Workbook(str(destino), {"constant_memory": True})
+    ws = wb.add_worksheet("Hoja1")
+    ws.write_row(0, 0, encabezados)
+    for fila, valores in enumerate(zip(*columnas), start=1):
+        for col, v in enumerate(valores):
+            if v is not None:
+                ws.write(fila, col, v)
+    wb.close()
+
+
+def generar_insumos(
+    carpeta: Path,
+    filas_deuda: int,
+    aseguradoras: int = 6,
+    seed: int = 42,
+    periodo: str = "06-2025",
+    cruce: float = 0.85,
+) -> InsumosSinteticos:
+    rng = np.random.default_rng(seed)
+    carpeta = Path(carpeta)
+    specs = _aseguradoras(aseguradoras)
+    aseg_dir = carpeta / "Aseguradoras"
+    por_aseg = np.array_split(np.arange(filas_deuda), len(specs))
+
+    cols_maestro: Dict[str, list] = {c: [] for c in (
+        consolidar.M_CUIT, consolidar.M_RAZON, consolidar.M_CONTRATO, consolidar.M_ASEGURADORA,
+        consolidar.M_COSTO, consolidar.M_CUENTA_PERDIDA, consolidar.M_EMAIL, consolidar.M_NO_CONTACTAR,
+        consolidar.M_PRODUCTOR1, consolidar.M_PRODUCTOR2, consolidar.M_REFERIDO_POR,
+        consolidar.M_CLIENTE_IMP, consolidar.M_CAPITAS, consolidar.M_RAMO,
+    )}
+
+    for (nombre, deuda_col), idx in zip(specs, por_aseg):
+        n = len(idx)
+        if n == 0:
+            continue
+        cuits = rng.integers(20_000_000_000, 34_999_999_999, n, dtype=np.int64)
+        if nombre == "Andina ART":  # tabla dinámica: varias filas por CUIT
+            cuits = np.sort(rng.choice(cuits, n, replace=True))
+        signo = -1 if nombre == "Experta" else 1
+
+        if "+" in deuda_col:
+            partes = [p.strip() for p in deuda_col.split("+")]
+            valores = [_importes(rng, n, 0, 500_000) for _ in partes]
+            encabezados, columnas = ["CUIT "] + partes, [cuits.tolist()] + valores
+        else:
+            deuda = _importes(rng, n, -20_000, 2_000_000, signo)
+            encabezados, columnas = ["CUIT ", deuda_col], [cuits.tolist(), deuda]
+        _escribir(aseg_dir / nombre / f"{periodo}.xlsx", encabezados, columnas)
+
+        # Maestro: parte de los CUIT de esta aseguradora (+ duplicados no vigentes)
+        unicos = np.unique(cuits)
+        en_maestro = unicos[rng.random(len(unicos)) < cruce]
+        dup = en_maestro[rng.random(len(en_maestro)) < 0.05]
+        m = np.concatenate([en_maestro, dup])
+        k = len(m)
+        estado = np.where(np.arange(k) < len(en_maestro),
+                          rng.choice(np.array(["", "Vigente", "Vigente", "Anulada"], dtype=object), k),
+                          "Baja por falta de pago")
+        aseg_maestro = consolidar._alias_aseg_for_merge(nombre)
+        cols_maestro[consolidar.M_CUIT] += [f"{c // 10**9}-{c // 10 % 10**8:08d}-{c % 10}" for c in m]
+        cols_maestro[consolidar.M_RAZON] += [f"Empresa {c % 100_000}" for c in m]
+        cols_maestro[consolidar.M_CONTRATO] += rng.integers(100_000, 9_999_999, k).tolist()
+        cols_maestro[consolidar.M_ASEGURADORA] += [aseg_maestro] * k
+        costo = _importes(rng, k, 1_000, 300_000)
+        for i in np.flatnonzero(rng.random(k) < 0.05):   # sin costo → «Agregar costo mensual»
+            costo[i] = 0.0
+        cols_maestro[consolidar.M_COSTO] += costo
+        cols_maestro[consolidar.M_CUENTA_PERDIDA] += [e or None for e in estado]
+        cols_maestro[consolidar.M_EMAIL] += rng.choice(np.array(["cobranzas@empresa.com", "x@y.com.ar", None], dtype=object), k).tolist()
+        cols_maestro[consolidar.M_NO_CONTACTAR] += rng.choice(np.array(["true", "false", None], dtype=object), k, p=[0.05, 0.6, 0.35]).tolist()
+        cols_maestro[consolidar.M_PRODUCTOR1] += rng.choice(np.array(["Juan", "PROMECOR", None], dtype=object), k).tolist()
+        cols_maestro[consolidar.M_PRODUCTOR2] += rng.choice(np.array(["Pepe", None], dtype=object), k).tolist()
+        cols_maestro[consolidar.M_REFERIDO_POR] += rng.choice(np.array(["PREMIER", "Otro", None], dtype=object), k, p=[0.1, 0.2, 0.7]).tolist()
+        cols_maestro[consolidar.M_CLIENTE_IMP] += rng.choice(np.array(["true", "false"], dtype=object), k, p=[0.05, 0.95]).tolist()
+        cols_maestro[consolidar.M_CAPITAS] += rng.integers(1, 800, k).tolist()
+        cols_maestro[consolidar.M_RAMO] += rng.choice(np.array(["ART", "Domestica"], dtype=object), k, p=[0.97, 0.03]).tolist()
+
+    # Maestro en orden aleatorio (como el export del CRM)
+    orden = rng.permutation(len(cols_maestro[consolidar.M_CUIT]))
+    maestro_path = carpeta / "maestro.xlsx"
+    _escribir(maestro_path, list(cols_maestro),
+              [[col[i] for i in orden] for col in cols_maestro.values()])
+
+    mapeo_path = carpeta / "mapeo.xlsx"
+    _escribir(mapeo_path, ["Aseguradora", "deuda_col", "cuit_col"], [
+        [n for n, _ in specs], [d for _, d in specs], ["CUIT"] * len(specs),
+    ])
+
+    return InsumosSinteticos(
+        carpeta=carpeta,
+        periodo=periodo,
+        maestro=maestro_path,
+        mapeo=mapeo_path,
+        aseguradoras_dir=aseg_dir,
+        filas_deuda=filas_deuda,
+        filas_maestro=len(orden),
+        aseguradoras=[n for n, _ in specs],
+    )
@@ -0,0 +1,77 @@
+# art/benchmarks/volcado.py
+"""
+volcar_dashboard_art: motor "python" (update_or_create por item) vs. motor "sql"
+(art/services/volcado_sql.py, un INSERT ... SELECT ... ON CONFLICT).
+
+Guarda un lote con las hojas de un consolidado sintético (sintetico.py), vuelca el período
+completo y una aseguradora con cada motor, y verifica que ArtDashboardContratoPeriodo quede
+idéntico. Todo se deshace al terminar.
+"""
+from __future__ import annotations
+
+import io
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from art.benchmarks.pipeline import PERIODO, _insumos_de, _sin_rastros
+from art.benchmarks.sintetico import generar_insumos
+from art.models import ArtDashboardContratoPeriodo
+from art.services.consolidar import ConsolidacionContext
+from art.services.persistencia_consolidado import guardar_lote_y_items
+
+_CAMPOS = [f.name for f in ArtDashboardContratoPeriodo._meta.concrete_fields if f.name != "id"]
+
+
+def _tablero() -> List[tuple]:
+    return sorted(ArtDashboardContratoPeriodo.objects.values_list(*_CAMPOS))
+
+
+def _volcar(motor: str, **opciones) -> float:
+    t0 = time.perf_counter()
+    call_command("volcar_dashboard_art", motor=motor, stdout=io.StringIO(), **opciones)
+    return time.perf_counter() - t0
+
+
+def run(filas: int = 100_000, repeticiones: int = 1, seed: int = 42, aseguradoras: int = 6, **_opciones) -> Dict:
+    mm, yyyy = PERIODO.split("-")
+    with tempfile.TemporaryDirectory(prefix="bench_volcado_") as tmp:
+        insumos = generar_insumos(Path(tmp), filas, aseguradoras=aseguradoras, seed=seed, periodo=PERIODO)
+        with _insumos_de(insumos):
+            hojas = ConsolidacionContext.cargar(PERIODO).hojas()
+
+    resultado: Dict = {}
+    with _sin_rastros():
+        usuario, _ = get_user_model().objects.get_or_create(username="benchmark_art")
+        guardado = guardar_lote_y_items(
+            usuario=usuario, periodo_str=PERIODO, reemplazar_periodo=True,
+            df_consolidado=hojas["Consolidado"], df_no_cruzan=hojas["No cruzan"], df_productor=hojas["Productor"],
+        )
+        aseg = str(hojas["Consolidado"]["Aseguradora"].mode().iat[0])
+        del_periodo = dict(periodo__year=int(yyyy), periodo__month=int(mm))
+        # (opciones del comando, filas del tablero que vuelca ese alcance)
+        casos = {
+            "periodo": (dict(periodo=f"{yyyy}-{mm}", reset_periodo=True), del_periodo),
+            "aseguradora": (dict(periodo=f"{yyyy}-{mm}", aseguradora=aseg), dict(del_periodo, aseguradora=aseg)),
+        }
+        for caso, (opciones, alcance) in casos.items():
+            t_py = min(_volcar("python", **opciones) for _ in range(max(1, repeticiones)))
+            ref = _tablero()
+            ArtDashboardContratoPeriodo.objects.filter(**alcance).delete()   # el motor sql arranca de cero
+            t_sql = min(_volcar("sql", **opciones) for _ in range(max(1, repeticiones)))
+            nuevo = _tablero()
+            if nuevo != ref:
+                distintas = len(set(nuevo) ^ set(ref))
+                raise AssertionError(f"{caso}: el tablero difiere entre motores ({distintas} filas)")
+            resultado[caso] = {
+                "items": guardado.items_creados,
+                "filas_tablero": len(ref),
+                "python_s": round(t_py, 3),
+                "sql_s": round(t_sql, 3),
+                "speedup": round(t_py / t_sql, 1) if t_sql else None,
+            }
+    return resultado
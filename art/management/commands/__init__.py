@@ -11,6 +11,8 @@ from django.db import transaction
 import pandas as pd
 
 from art.models import ArtDashboardContratoPeriodo
+from core.lectura_excel import read_excel_fast
+from core.numeros_ar import parse_ar_decimal
 
 # ===== Helpers de parsing =====
 
@@ -51,24 +53,9 @@ def only_digits(x: str) -> str:
 def parse_ars(value) -> Decimal | None:
     """
     Convierte '$ 1.234.567,89' -> Decimal('1234567.89')
-    Soporta valores vacíos o NaN.
+    Soporta valores vacíos o NaN (motor común: core/numeros_ar.py).
     """
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return None
-    s = str(value).strip()
-    if s == "":
-        return None
-    # Quitar cualquier símbolo que no sea dígito, punto o coma, y signo
-    s = s.replace("$", "").replace("ARS", "").replace("U$S", "")
-    s = re.sub(r"[^\d,.\-]", "", s)
-    # Si viene con coma decimal latina
-    if "," in s and s.count(",") == 1 and (s.rfind(",") > s.rfind(".")):
-        s = s.replace(".", "")
-        s = s.replace(",", ".")
-    try:
-        return Decimal(s).quantize(DEC2, rounding=ROUND_HALF_UP)
-    except InvalidOperation:
-        return None
+    return parse_ar_decimal(value, DEC2)
 
 def parse_decimal(value, quant=DEC2) -> Decimal | None:
     if value is None or (isinstance(value, float) and pd.isna(value)):
@@ -165,7 +152,7 @@ class Command(BaseCommand):
         lote_ref = options["lote"]
 
         try:
-            df = pd.read_excel(archivo, sheet_name=hoja, dtype=str)
+            df = read_excel_fast(archivo, sheet_name=hoja, dtype=str)
         except Exception as e:
             raise CommandError(f"No se pudo leer el archivo/hoja: {e}")
 
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from art.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Corre un micro-benchmark del pipeline ART (verifica equivalencia y mide tiempos)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("nombre", choices=sorted(BENCHMARKS),
+                            help="Benchmark a correr.")
+        parser.add_argument("--filas", type=int, default=200_000,
+                            help="Filas sintéticas a generar (default 200000).")
+        parser.add_argument("--repeticiones", type=int, default=3,
+                            help="Repeticiones por caso; se informa la mejor (default 3).")
+        parser.add_argument("--seed", type=int, default=42,
+                            help="Semilla del generador sintético.")
+        parser.add_argument("--json", default=None,
+                            help="Ruta donde guardar el resultado en JSON (opcional).")
+        # Solo benchmark "pipeline"
+        parser.add_argument("--aseguradoras", type=int, default=6,
+                            help="[pipeline] Archivos de aseguradora sintéticos (default 6).")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="[pipeline] Procesos para leer las aseguradoras (default 1).")
+        parser.add_argument("--etapas", default=None,
+                            help="[pipeline] Etapas a medir, separadas por coma (default: todas).")
+        parser.add_argument("--periodos", type=int, default=24,
+                            help="[analisis, roll_rate] Meses del tablero sintético (default 24).")
+
+    def handle(self, *args, **options):
+        nombre = options["nombre"]
+        try:
+            resultado = BENCHMARKS[nombre](
+                filas=options["filas"],
+                repeticiones=options["repeticiones"],
+                seed=options["seed"],
+                aseguradoras=options["aseguradoras"],
+                workers=options["workers"],
+                etapas=options["etapas"],
+                periodos=options["periodos"],
+            )
+        except AssertionError as e:
+            raise CommandError(f"La versión optimizada NO coincide con la de referencia: {e}")
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for caso, datos in resultado.items():
+            detalle = " | ".join(f"{k}={v}" for k, v in datos.items())
+            self.stdout.write(f"{caso:<24} {detalle}")
+
+        if options["json"]:
+            Path(options["json"]).write_text(
+                json.dumps({"benchmark": nombre, "resultados": resultado}, indent=2, ensure_ascii=False),
+                encoding="utf-8",
+            )
+        self.stdout.write(self.style.SUCCESS(f"Benchmark '{nombre}' OK (resultados idénticos a la referencia)."))
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from art.services import cache_insumos
+
+
+class Command(BaseCommand):
+    help = "Inspecciona o limpia la caché de insumos Excel parseados (maestro, mapeo, aseguradoras)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limpiar", action="store_true",
+                            help="Borra TODAS las entradas de la caché.")
+        parser.add_argument("--evictar", action="store_true",
+                            help="Aplica la política de desalojo (antigüedad + tamaño máximo).")
+        parser.add_argument("--max-mb", type=float, default=None,
+                            help="Con --evictar: tamaño máximo en MB (default settings.ART_CACHE_MAX_MB).")
+        parser.add_argument("--max-dias", type=float, default=None,
+                            help="Con --evictar: días sin uso tolerados (default settings.ART_CACHE_MAX_DIAS).")
+
+    def handle(self, *args, **options):
+        if options["limpiar"]:
+            borradas, liberado = cache_insumos.limpiar()
+            self.stdout.write(self.style.SUCCESS(
+                f"Caché limpiada: {borradas} entradas, {liberado / 1024 / 1024:.1f} MB liberados."
+            ))
+            return
+
+        if options["evictar"]:
+            borradas, liberado = cache_insumos.evictar(options["max_mb"], options["max_dias"])
+            self.stdout.write(self.style.SUCCESS(
+                f"Desalojo: {borradas} entradas, {liberado / 1024 / 1024:.1f} MB liberados."
+            ))
+
+        entradas = cache_insumos.listar()
+        self.stdout.write(f"Directorio: {cache_insumos.CACHE_DIR}")
+        if not entradas:
+            self.stdout.write(self.style.WARNING("La caché está vacía."))
+            return
+        for e in entradas:
+            self.stdout.write(cache_insumos.describir(e))
+        total = sum(e.bytes for e in entradas)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(entradas)} entradas | {total / 1024 / 1024:.1f} MB "
+            f"(máx. {cache_insumos.CACHE_MAX_MB:.0f} MB, {cache_insumos.CACHE_MAX_DIAS:.0f} días sin uso)"
+        ))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from art.services import historico
+from art.services.excel import HISTORICO_DIR as HISTORICO_XLSX_DIR
+
+# Consolidado_ART_06-2025.xlsx, Consolidado_ART_06-2025_20250710_1030.xlsx, Consolidado 06-2025.xlsx, ...
+_PATRON_PERIODO = re.compile(r"consolidado[ _\-]*(?:art[ _\-]*)?(\d{1,2})[-_/](\d{4})", re.IGNORECASE)
+
+
+class Command(BaseCommand):
+    help = "Lista o carga el histórico Parquet de consolidados (un Parquet por período y hoja + manifiesto)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--importar", action="store_true",
+                            help="Importa los Consolidado_ART_<MM-AAAA>*.xlsx del histórico de Excel.")
+        parser.add_argument("--desde", default=None,
+                            help="Con --importar: carpeta de los XLSX (default: la de art/services/excel.py).")
+        parser.add_argument("--periodo", default=None,
+                            help="Con --importar: solo este período (MM-AAAA).")
+        parser.add_argument("--reemplazar", action="store_true",
+                            help="Con --importar: también los períodos que ya están en el histórico.")
+
+    def handle(self, *args, **options):
+        if not historico.disponible():
+            raise CommandError("El histórico Parquet está deshabilitado o falta pyarrow.")
+
+        if options["importar"]:
+            self._importar(Path(options["desde"] or HISTORICO_XLSX_DIR), options["periodo"], options["reemplazar"])
+
+        datos = historico.manifiesto()["periodos"]
+        self.stdout.write(f"Directorio: {historico.HISTORICO_DIR}")
+        if not datos:
+            self.stdout.write(self.style.WARNING("El histórico está vacío."))
+            return
+        for clave, entrada in datos.items():
+            hojas = entrada.get("hojas", {})
+            filas = sum(h.get("filas", 0) for h in hojas.values())
+            self.stdout.write(
+                f"{clave} | {len(hojas)} hojas | {filas} filas | {entrada.get('origen', '')} | {entrada.get('actualizado', '')}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(datos)} períodos."))
+
+    def _importar(self, carpeta: Path, solo_periodo: str | None, reemplazar: bool) -> None:
+        if not carpeta.is_dir():
+            raise CommandError(f"No existe la carpeta {carpeta}")
+        try:
+            solo = historico.clave_periodo(solo_periodo) if solo_periodo else None
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # Por período, el XLSX más reciente (mismo criterio que _buscar_consolidado)
+        candidatos: dict[str, Path] = {}
+        for ruta in carpeta.glob("*.xlsx"):
+            m = _PATRON_PERIODO.search(ruta.stem)
+            if not m or ruta.name.startswith("~$"):
+                continue
+            clave = f"{m.group(2)}-{int(m.group(1)):02d}"
+            if solo and clave != solo:
+                continue
+            if clave not in candidatos or ruta.stat().st_mtime > candidatos[clave].stat().st_mtime:
+                candidatos[clave] = ruta
+
+        existentes = set(historico.periodos())
+        importados = 0
+        for clave, ruta in sorted(candidatos.items()):
+            if clave in existentes and not reemplazar:
+                self.stdout.write(f"{clave}: ya está (usá --reemplazar para pisarlo).")
+                continue
+            try:
+                entrada = historico.importar_xlsx(ruta, clave)
+            except Exception as e:  # noqa: BLE001 — un archivo roto no corta la importación
+                self.stdout.write(self.style.ERROR(f"{clave}: no pude importar {ruta.name}: {e}"))
+                continue
+            importados += 1
+            self.stdout.write(f"{clave}: {ruta.name} → {len(entrada['hojas'])} hojas")
+        self.stdout.write(self.style.SUCCESS(f"Importados {importados} de {len(candidatos)} períodos encontrados."))
@@ -11,6 +11,9 @@ from django.db import transaction
 import pandas as pd
 
 from art.models import ArtDashboardContratoPeriodo
+from art.services import cubo
+from core.lectura_excel import encabezados_por_hoja, read_excel_fast
+from core.numeros_ar import parse_ar_decimal
 
 # ===== Helpers de parsing =====
 
@@ -36,23 +39,9 @@ def only_digits(x: str) -> str:
 def parse_ars(value) -> Decimal | None:
     """
     Convierte '$ 1.234.567,89' -> Decimal('1234567.89')
-    Soporta valores vacíos o NaN.
+    Soporta valores vacíos o NaN (motor común: core/numeros_ar.py).
     """
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return None
-    s = str(value).strip()
-    if s == "":
-        return None
-    s = s.replace("$", "").replace("ARS", "").replace("U$S", "")
-    s = re.sub(r"[^\d,.\-]", "", s)
-    # coma como decimal (formato AR)
-    if "," in s and s.count(",") == 1 and (s.rfind(",") > s.rfind(".")):
-        s = s.replace(".", "")
-        s = s.replace(",", ".")
-    try:
-        return Decimal(s).quantize(DEC2, rounding=ROUND_HALF_UP)
-    except InvalidOperation:
-        return None
+    return parse_ar_decimal(value, DEC2)
 
 def parse_decimal(value, quant=DEC4) -> Decimal | None:
     if value is None or (isinstance(value, float) and pd.isna(value)):
@@ -113,29 +102,127 @@ def bucket_q(value: Decimal | None) -> str:
 
 # ===== Lector de hoja =====
 
-def read_consolidado_sheet(archivo: str, hoja: str | None):
+# Columnas que usa la importación (el resto de la hoja no se carga)
+COLUMNAS_USADAS = REQUIRED_COLS + [
+    "Razón social", "Costo mensual", "Estado contrato", "Email del trato",
+    "No contactar", "Productor", "Premier", "Cliente importante",
+]
+
+CLAVE = ["periodo", "cuit", "contrato", "aseguradora"]
+
+def elegir_hoja(archivo: str, hoja: str | None) -> tuple[str, list]:
     """
-    Lee una hoja específica o autodetecta una hoja que contenga las columnas requeridas.
-    Retorna un DataFrame de strings.
+    (hoja, columnas) leyendo solo encabezados: la pedida o, con 'auto', la primera hoja
+    que tenga todas las columnas requeridas.
     """
+    encabezados = encabezados_por_hoja(archivo)
     if hoja and hoja.lower() != "auto":
-        df = pd.read_excel(archivo, sheet_name=hoja, dtype=str)
-        for c in df.columns:
-            df[c] = df[c].apply(normalize_str)
-        return df, hoja
-
-    # autodetección
-    all_sheets = pd.read_excel(archivo, sheet_name=None, dtype=str)
-    for nombre, df in all_sheets.items():
-        cols = list(df.columns)
+        if hoja not in encabezados:
+            raise CommandError(f"No existe la hoja '{hoja}'. Hojas: {list(encabezados)}")
+        return hoja, encabezados[hoja]
+    for nombre, cols in encabezados.items():
         if all(col in cols for col in REQUIRED_COLS):
-            for c in df.columns:
-                df[c] = df[c].apply(normalize_str)
-            return df, nombre
+            return nombre, cols
     raise CommandError(
         f"No se encontró ninguna hoja con todas las columnas requeridas: {REQUIRED_COLS}"
     )
 
+def read_consolidado_sheet(archivo: str, hoja: str | None):
+    """
+    Lee una hoja específica o autodetecta (por encabezados) una que contenga las columnas
+    requeridas. Solo carga las columnas usadas. Retorna un DataFrame de strings (sin NaN).
+    """
+    nombre, _cols = elegir_hoja(archivo, hoja)
+    df = read_excel_fast(archivo, sheet_name=nombre, dtype=str, usecols=lambda c: c in COLUMNAS_USADAS)
+    for c in df.columns:
+        df[c] = df[c].where(df[c].notna(), "").astype(str).str.strip()   # normalize_str
+    return df, nombre
+
+def _por_valor(valores: list, fn) -> list:
+    """fn(v) una vez por valor distinto (los textos de una columna se repiten mucho)."""
+    cache: dict = {}
+    return [cache[v] if v in cache else cache.setdefault(v, fn(v)) for v in valores]
+
+def _columna(df: pd.DataFrame, nombre: str, default=None) -> list:
+    """Como row.get(nombre, default) para todas las filas."""
+    return df[nombre].tolist() if nombre in df.columns else [default] * len(df)
+
+def periodos_hoja(df: pd.DataFrame, periodo_global: date | None) -> set:
+    """
+    Períodos de la hoja, parseando solo los valores distintos de 'Periodo'. Valida toda la
+    columna antes de escribir: el error cita la primera fila inválida, como el upsert por filas.
+    """
+    if periodo_global is not None:
+        return {periodo_global}
+    periodos = set()
+    for v in df["Periodo"].unique():
+        try:
+            periodos.add(parse_periodo_str(v))
+        except ValueError as e:
+            i = int((df["Periodo"] == v).to_numpy().argmax())
+            raise CommandError(f"Error en fila {i+2} (contando encabezado): {e}")
+    return periodos
+
+def filas_dashboard(df: pd.DataFrame, periodo_global: date | None, lote_ref: str) -> list[dict]:
+    """
+    Parseo vectorizado de la hoja (o de una tanda `df.iloc[...]`) → un dict de campos de
+    ArtDashboardContratoPeriodo por fila (mismas reglas que el upsert fila a fila: parse_ars,
+    parse_decimal, parse_bool_generic).
+    """
+    n = len(df)
+    if periodo_global is not None:
+        periodos = [periodo_global] * n
+    else:
+        crudos = _columna(df, "Periodo", "")
+        errores: dict = {}
+
+        def periodo_de(v):
+            try:
+                return parse_periodo_str(v)
+            except ValueError as e:
+                errores[v] = e
+                return None
+
+        periodos = _por_valor(crudos, periodo_de)
+        if errores:
+            i = next(i for i, v in enumerate(crudos) if v in errores)
+            fila = df.index[i]   # una tanda conserva el índice de la hoja completa
+            raise CommandError(f"Error en fila {fila+2} (contando encabezado): {errores[crudos[i]]}")
+
+    cuits = df["CUIT"].str.replace(r"\D+", "", regex=True).str[:20].tolist()
+    deudas = _por_valor(_columna(df, "Deuda total"), parse_ars)
+    costos = _por_valor(_columna(df, "Costo mensual"), parse_ars)
+    qpds = _por_valor(_columna(df, "Q periodos deudores"), lambda v: parse_decimal(v, quant=DEC4))
+    buckets = _por_valor(qpds, bucket_q)
+
+    def vs_costo(deuda, costo):
+        if deuda is not None and costo and costo > 0:
+            return (deuda / costo).quantize(DEC4, rounding=ROUND_HALF_UP)
+        return None
+
+    columnas = {
+        "periodo": periodos,
+        "razon_social": _columna(df, "Razón social", ""),
+        "cuit": cuits,
+        "contrato": _columna(df, "Contrato", ""),
+        "aseguradora": _columna(df, "Aseguradora", ""),
+        "deuda_total": [d or Decimal("0.00") for d in deudas],
+        "costo_mensual": costos,
+        "q_periodos_deudores": qpds,
+        "estado_contrato": _columna(df, "Estado contrato", ""),
+        "email_trato": _columna(df, "Email del trato", ""),
+        "no_contactar": _por_valor(_columna(df, "No contactar"), parse_bool_generic),
+        "productor": _columna(df, "Productor", ""),
+        "premier": _por_valor(_columna(df, "Premier"), parse_bool_generic),
+        "cliente_importante": _por_valor(_columna(df, "Cliente importante"), parse_bool_generic),
+        "riesgo_flag": [q is not None and q >= Decimal("2") for q in qpds],
+        "bucket_q": buckets,
+        "deuda_vs_costo": [vs_costo(d, c) for d, c in zip(deudas, costos)],
+        "lote_ref": [lote_ref or ""] * n,
+    }
+    nombres = list(columnas)
+    return [dict(zip(nombres, fila)) for fila in zip(*columnas.values())]
+
 # ===== Command =====
 
 class Command(BaseCommand):
@@ -162,27 +249,41 @@ class Command(BaseCommand):
             default="",
             help="Identificador libre para trazabilidad (ej: '2025-06').",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Filas de la hoja que se parsean y upsertean por tanda (INSERT ... ON CONFLICT); "
+                 "acota la memoria de los dicts/objetos a una tanda. Default 2000.",
+        )
 
     def handle(self, *args, **options):
         archivo = options["archivo"]
         hoja = options["hoja"]
         periodo_cli = options["periodo"]
         lote_ref = options["lote"]
+        chunk = max(1, options["chunk_size"])
 
         try:
-            df, hoja_usada = read_consolidado_sheet(archivo, hoja)
+            nombre_hoja, cols = elegir_hoja(archivo, hoja)
+        except CommandError:
+            raise
         except Exception as e:
             raise CommandError(f"No se pudo leer el archivo/hoja: {e}")
 
-        # Validación de columnas
-        cols = list(df.columns)
+        # Validación de columnas (con los encabezados, antes de leer los datos)
         faltantes = [c for c in REQUIRED_COLS if c not in cols]
         if faltantes:
             raise CommandError(
-                f"Faltan columnas obligatorias en '{hoja_usada}': {faltantes}. "
+                f"Faltan columnas obligatorias en '{nombre_hoja}': {faltantes}. "
                 f"Columnas disponibles: {cols}"
             )
 
+        try:
+            df, hoja_usada = read_consolidado_sheet(archivo, nombre_hoja)
+        except Exception as e:
+            raise CommandError(f"No se pudo leer el archivo/hoja: {e}")
+
         # Determinar período (global o por fila)
         periodo_global = None
         if periodo_cli:
@@ -191,79 +292,39 @@ class Command(BaseCommand):
             except Exception as e:
                 raise CommandError(str(e))
 
-        creados = 0
-        actualizados = 0
-        errores = 0
+        periodos = periodos_hoja(df, periodo_global)
+        n = len(df)
 
+        # Upsert por clave única: con claves repetidas gana la última fila (como el update_or_create
+        # por fila). Las tandas se recorren de la última a la primera y solo se guarda el set de
+        # claves ya escritas: la primera aparición vista es la última de la hoja.
+        vistas: set = set()
+        qs_periodos = ArtDashboardContratoPeriodo.objects.filter(periodo__in=periodos)
         with transaction.atomic():
-            for i, row in df.iterrows():
+            antes = qs_periodos.count()
+            for desde in reversed(range(0, n, chunk)):
+                tanda = []
+                for f in reversed(filas_dashboard(df.iloc[desde:desde + chunk], periodo_global, lote_ref)):
+                    clave = tuple(f[c] for c in CLAVE)
+                    if clave not in vistas:
+                        vistas.add(clave)
+                        tanda.append(f)
+                if not tanda:
+                    continue
                 try:
-                    periodo = periodo_global or parse_periodo_str(row.get("Periodo", ""))
-                    razon_social = row.get("Razón social", "")
-                    cuit = only_digits(row.get("CUIT", ""))[:20]
-                    contrato = row.get("Contrato", "")
-                    aseguradora = row.get("Aseguradora", "")
-
-                    deuda_total = parse_ars(row.get("Deuda total"))
-                    costo_mensual = parse_ars(row.get("Costo mensual"))
-                    qpd = parse_decimal(row.get("Q periodos deudores"), quant=DEC4)
-
-                    estado_contrato = row.get("Estado contrato", "")
-                    email = row.get("Email del trato", "")
-                    no_contactar = parse_bool_generic(row.get("No contactar"))
-                    productor = row.get("Productor", "")
-                    premier = parse_bool_generic(row.get("Premier"))
-                    cliente_imp = parse_bool_generic(row.get("Cliente importante"))
-
-                    riesgo = False
-                    if qpd is not None:
-                        try:
-                            riesgo = (qpd >= Decimal("2"))
-                        except Exception:
-                            riesgo = False
-
-                    bq = bucket_q(qpd)
-
-                    deuda_vs_costo = None
-                    if deuda_total is not None and costo_mensual:
-                        try:
-                            if costo_mensual > 0:
-                                deuda_vs_costo = (deuda_total / costo_mensual).quantize(DEC4, rounding=ROUND_HALF_UP)
-                        except Exception:
-                            deuda_vs_costo = None
-
-                    # Upsert por clave única
-                    obj, created = ArtDashboardContratoPeriodo.objects.update_or_create(
-                        periodo=periodo,
-                        cuit=cuit,
-                        contrato=contrato,
-                        aseguradora=aseguradora,
-                        defaults=dict(
-                            razon_social=razon_social,
-                            deuda_total=deuda_total or Decimal("0.00"),
-                            costo_mensual=costo_mensual,
-                            q_periodos_deudores=qpd,
-                            estado_contrato=estado_contrato,
-                            email_trato=email,
-                            no_contactar=no_contactar,
-                            productor=productor,
-                            premier=premier,
-                            cliente_importante=cliente_imp,
-                            riesgo_flag=riesgo,
-                            bucket_q=bq,
-                            deuda_vs_costo=deuda_vs_costo,
-                            lote_ref=lote_ref or "",
-                        ),
+                    ArtDashboardContratoPeriodo.objects.bulk_create(
+                        [ArtDashboardContratoPeriodo(**f) for f in tanda],
+                        update_conflicts=True, unique_fields=CLAVE,
+                        update_fields=[c for c in tanda[0] if c not in CLAVE],
                     )
-                    if created:
-                        creados += 1
-                    else:
-                        actualizados += 1
-
                 except Exception as e:
-                    errores += 1
-                    raise CommandError(f"Error en fila {i+2} (contando encabezado): {e}")
+                    hasta = min(desde + chunk, n)
+                    raise CommandError(f"Error en filas {desde + 2}-{hasta + 1} (contando encabezado): {e}")
+            creados = qs_periodos.count() - antes
+            cubo.refrescar(periodos)   # cubo de Análisis de los meses importados
 
+        # Cada fila que no creó un registro lo actualizó (mismo conteo que antes)
+        actualizados = n - creados
         self.stdout.write(self.style.SUCCESS(
-            f"Importación finalizada (hoja: {hoja_usada}). Creados: {creados} | Actualizados: {actualizados} | Errores: {errores}"
+            f"Importación finalizada (hoja: {hoja_usada}). Creados: {creados} | Actualizados: {actualizados} | Errores: 0"
         ))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from art.services import particiones
+from art.services.persistencia_consolidado import _parse_periodo
+
+
+class Command(BaseCommand):
+    help = "Particionado mensual de art_consolidado_item (PostgreSQL): estado, conversión y borrado de períodos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--convertir", action="store_true",
+                            help="Convierte la tabla en particionada por mes (una vez; bloquea la tabla mientras copia).")
+        parser.add_argument("--eliminar-periodo", default=None,
+                            help="Borra los items de un período (MM-AAAA) con DROP TABLE de su partición.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError(f"El particionado requiere PostgreSQL (base actual: {connection.vendor}).")
+
+        if options["convertir"]:
+            try:
+                creadas = particiones.convertir()
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"{particiones.TABLA} particionada: {len(creadas)} meses."))
+
+        if options["eliminar_periodo"]:
+            if not particiones.particionado():
+                raise CommandError(f"{particiones.TABLA} no está particionada (usá --convertir).")
+            try:
+                periodo = _parse_periodo(options["eliminar_periodo"])
+            except ValueError as e:
+                raise CommandError(str(e))
+            if particiones.eliminar_periodo(periodo):
+                self.stdout.write(self.style.SUCCESS(f"Período {periodo:%m-%Y} eliminado."))
+            else:
+                self.stdout.write(self.style.WARNING(f"No hay partición para {periodo:%m-%Y}."))
+
+        if not particiones.particionado():
+            self.stdout.write(self.style.WARNING(f"{particiones.TABLA} no está particionada."))
+            return
+        filas = particiones.particiones()
+        for nombre, limites, estimadas in filas:
+            self.stdout.write(f"{nombre} | {limites} | ~{max(estimadas, 0)} filas")
+        self.stdout.write(self.style.SUCCESS(f"{len(filas)} particiones."))
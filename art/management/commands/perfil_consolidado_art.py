@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+
+from art.models import ConsolidadoLote
+from art.services.persistencia_consolidado import _parse_periodo
+
+
+def _agrupar(etapas: dict, detalle: bool) -> dict:
+    """{etapa: segundos}; sin detalle suma las subetapas ("persistir.insert" → "persistir")."""
+    out: dict = {}
+    for nombre, datos in etapas.items():
+        clave = nombre if detalle else nombre.split(".", 1)[0]
+        out[clave] = round(out.get(clave, 0) + (datos.get("segundos") or 0), 3)
+    return out
+
+
+class Command(BaseCommand):
+    help = "Tendencia del perfil por etapa (tiempo y memoria) de los últimos ConsolidadoLote."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ultimos", type=int, default=20,
+                            help="Cantidad de lotes (los más recientes con perfil). Default 20.")
+        parser.add_argument("--periodo", default=None,
+                            help="Solo lotes de este período (MM-AAAA).")
+        parser.add_argument("--detalle", action="store_true",
+                            help="Una columna por subetapa (cargar.maestro, persistir.insert, ...).")
+        parser.add_argument("--json", default=None,
+                            help="Además, escribe los datos en este archivo JSON.")
+
+    def handle(self, *args, **options):
+        qs = ConsolidadoLote.objects.exclude(perfil={}).order_by("-id")
+        if options["periodo"]:
+            try:
+                qs = qs.filter(periodo=_parse_periodo(options["periodo"]))
+            except ValueError as e:
+                raise CommandError(str(e))
+        lotes = list(qs[: max(1, options["ultimos"])])[::-1]   # del más viejo al más nuevo
+        if not lotes:
+            self.stdout.write(self.style.WARNING("No hay lotes con perfil registrado."))
+            return
+
+        filas = []
+        for lote in lotes:
+            perfil = lote.perfil or {}
+            filas.append({
+                "lote": lote.id,
+                "creado_en": f"{lote.creado_en:%Y-%m-%d %H:%M}",
+                "periodo": f"{lote.periodo:%m-%Y}" if lote.periodo else "",
+                "filas": lote.filas_consolidado + lote.filas_no_cruzan,
+                "total_s": perfil.get("total_s"),
+                "pico_rss_mb": perfil.get("pico_rss_mb"),
+                "etapas": _agrupar(perfil.get("etapas") or {}, options["detalle"]),
+            })
+
+        columnas = []
+        for f in filas:
+            columnas += [c for c in f["etapas"] if c not in columnas]
+
+        encabezado = ["lote", "creado_en", "periodo", "filas", "total_s", "pico_rss_mb"] + columnas
+        anchos = [max(len(c), 8) for c in encabezado]
+        anchos[1] = 16
+        self.stdout.write(" ".join(c.rjust(a) for c, a in zip(encabezado, anchos)))
+        for f in filas:
+            valores = [f["lote"], f["creado_en"], f["periodo"], f["filas"], f["total_s"], f["pico_rss_mb"]]
+            valores += [f["etapas"].get(c, "") for c in columnas]
+            self.stdout.write(" ".join(str("—" if v is None else v).rjust(a) for v, a in zip(valores, anchos)))
+
+        # Tendencia: último lote contra la mediana de los anteriores
+        if len(filas) > 1:
+            self.stdout.write("")
+            self.stdout.write(f"Último lote (#{filas[-1]['lote']}) vs. mediana de los {len(filas) - 1} anteriores:")
+            for c in ["total_s"] + columnas:
+                previos = [(f["etapas"].get(c) if c != "total_s" else f["total_s"]) for f in filas[:-1]]
+                previos = [v for v in previos if v]
+                ultimo = filas[-1]["etapas"].get(c) if c != "total_s" else filas[-1]["total_s"]
+                if not previos or ultimo is None:
+                    continue
+                base = median(previos)
+                cambio = (ultimo - base) / base * 100 if base else 0
+                linea = f"  {c:<22} {ultimo:>9.2f}s  (mediana {base:.2f}s, {cambio:+.0f}%)"
+                self.stdout.write(self.style.WARNING(linea) if cambio > 25 else linea)
+
+        if options["json"]:
+            with open(options["json"], "w", encoding="utf-8") as fh:
+                json.dump(filas, fh, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Datos escritos en {options['json']}"))
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from art.services import cubo
+from art.services.persistencia_consolidado import _parse_periodo
+
+
+class Command(BaseCommand):
+    help = "Rearma el cubo de la pantalla de Análisis (ArtDashboardCubo) desde ArtDashboardContratoPeriodo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--periodo", default=None,
+                            help="Solo este período (MM-AAAA). Sin esto, rearma todo el cubo.")
+
+    def handle(self, *args, **options):
+        periodos = None
+        if options["periodo"]:
+            try:
+                periodos = [_parse_periodo(options["periodo"])]
+            except ValueError as e:
+                raise CommandError(str(e))
+        filas = cubo.refrescar(periodos)
+        alcance = f"{periodos[0]:%m-%Y}" if periodos else "todos los períodos"
+        self.stdout.write(self.style.SUCCESS(f"Cubo de Análisis rearmado ({alcance}): {filas} filas."))
@@ -3,16 +3,20 @@ from __future__ import annotations
 
 import re
 from datetime import date
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from decimal import Decimal, ROUND_HALF_UP
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models import Q
 
 from art.models import (
     ArtDashboardContratoPeriodo,
     ConsolidadoItem,
     ConsolidadoLote,
 )
+from art.services import cubo, volcado_sql
+from art.services.perfilado import etapa
+from core.numeros_ar import parse_ar_decimal
 
 # ------------- Helpers genéricos -------------
 DEC2 = Decimal("0.01")
@@ -28,23 +32,8 @@ def only_digits(s: str) -> str:
     return re.sub(r"\D+", "", s or "")
 
 def to_decimal(x, quant=DEC2) -> Decimal | None:
-    if x is None or to_str(x) == "":
-        return None
-    if isinstance(x, (int, float, Decimal)):
-        try:
-            return (Decimal(str(x))).quantize(quant, rounding=ROUND_HALF_UP)
-        except InvalidOperation:
-            return None
-    s = to_str(x)
-    # Soporta "$ 1.234.567,89" / "1.234.567,89" / "1234567.89"
-    s = s.replace("$", "").replace("ARS", "").replace("U$S", "")
-    s = re.sub(r"[^\d,.\-]", "", s)
-    if "," in s and s.count(",") == 1 and (s.rfind(",") > s.rfind(".")):
-        s = s.replace(".", "").replace(",", ".")
-    try:
-        return Decimal(s).quantize(quant, rounding=ROUND_HALF_UP)
-    except InvalidOperation:
-        return None
+    # Soporta "$ 1.234.567,89" / "1.234.567,89" / "1234567.89" (core/numeros_ar.py)
+    return parse_ar_decimal(x, quant)
 
 def to_bool_generic(x) -> bool:
     s = to_str(x).lower()
@@ -100,37 +89,27 @@ def get_attr(obj, names: list[str], default=None):
     return default
 
 # ------------- Core de volcado -------------
-def iter_items_filtrados(lote_id: int | None, periodo: date | None):
-    qs = ConsolidadoItem.objects.all()
-
-    # Filtro por lote (intentamos ambas formas)
+def iter_items_filtrados(lote_id: int | None, periodo: date | None,
+                         aseguradora: str | None = None, productor: str | None = None):
+    """
+    Items del alcance, filtrados en la base: lote, mes (rango sobre `periodo`, índice
+    (periodo, aseguradora); los items sin período toman el de su lote), aseguradora y productor.
+    """
+    qs = ConsolidadoItem.objects.select_related("lote")
     if lote_id is not None:
-        try:
-            qs = qs.filter(lote_id=lote_id)
-        except Exception:
-            try:
-                qs = qs.filter(lote__id=lote_id)
-            except Exception:
-                pass
-
-    # Si no hay filtro por período, devolvemos directo
-    if periodo is None:
-        yield from (qs.iterator() if hasattr(qs, "iterator") else qs)
-        return
-
-    # Con filtro por período, normalizamos comparando mes/año
-    for it in (qs.iterator() if hasattr(qs, "iterator") else qs):
-        p_val = get_attr(it, ["periodo", "periodo_str", "mes_periodo", "period"])
-        if not p_val:
-            lote_obj = get_attr(it, ["lote"])
-            if lote_obj:
-                p_val = get_attr(lote_obj, ["periodo", "periodo_str", "mes_periodo", "period"])
-        try:
-            p_date = parse_periodo_any(p_val)
-            if p_date == periodo:
-                yield it
-        except Exception:
-            continue
+        qs = qs.filter(lote_id=lote_id)
+    if periodo is not None:
+        desde = date(periodo.year, periodo.month, 1)
+        hasta = date(desde.year + desde.month // 12, desde.month % 12 + 1, 1)
+        qs = qs.filter(
+            Q(periodo__gte=desde, periodo__lt=hasta)
+            | Q(periodo__isnull=True, lote__periodo__gte=desde, lote__periodo__lt=hasta)
+        )
+    if aseguradora:
+        qs = qs.filter(aseguradora__iexact=aseguradora)
+    if productor:
+        qs = qs.filter(productor__iexact=productor)
+    yield from qs.iterator(chunk_size=2000)
 
 def build_dashboard_row_from_item(it, periodo: date | None, lote_id: int | None):
     razon_social = to_str(get_attr(it, ["razon_social", "razon", "razon_social_cliente"]))
@@ -217,13 +196,16 @@ class Command(BaseCommand):
                             help="Filtrar por aseguradora (opcional).")
         parser.add_argument("--productor", default=None,
                             help="Filtrar por productor (opcional).")
+        parser.add_argument("--motor", choices=["sql", "python"], default=None,
+                            help="sql: un INSERT ... SELECT ... ON CONFLICT; python: update_or_create por item. "
+                                 "Default settings.ART_VOLCADO_MOTOR (auto: sql en PostgreSQL, python en SQLite).")
 
     def handle(self, *args, **options):
-        lote_id = options.get("desde-lote")
+        lote_id = options.get("desde_lote")
         periodo_cli = options.get("periodo")
         # Mantengo la opción por compatibilidad, pero ya no se usa para decidir
         # reset: el reset ahora es automático en función del alcance del volcado.
-        _reset_periodo_flag = bool(options.get("reset-periodo"))
+        _reset_periodo_flag = bool(options.get("reset_periodo"))
         filtro_aseg = to_str(options.get("aseguradora")) or None
         filtro_prod = to_str(options.get("productor")) or None
 
@@ -239,16 +221,34 @@ class Command(BaseCommand):
                 "No se indicó --desde-lote ni --periodo. Se volcarán TODOS los items (puede tardar)."
             ))
 
-        # 1) Obtener ITEMS a volcar
-        items = list(iter_items_filtrados(lote_id, periodo_date))
-
-        # Aplicar filtros de alcance (aseguradora / productor) sobre los items a volcar
-        if filtro_aseg:
-            items = [it for it in items if to_str(get_attr(it, ["aseguradora", "compania", "compania_art", "aseguradora_nombre"])).lower() == filtro_aseg.lower()]
-        if filtro_prod:
-            items = [it for it in items if to_str(get_attr(it, ["productor", "productor_nombre", "ejecutivo"])).lower() == filtro_prod.lower()]
-
-        if not items:
+        motor = options.get("motor") or volcado_sql.motor()
+        alcance_sql = volcado_sql.Alcance(lote_id=lote_id, periodo=periodo_date,
+                                          aseguradora=filtro_aseg, productor=filtro_prod)
+
+        # 1) Obtener ITEMS a volcar (motor sql: solo cuántos y de qué períodos)
+        items = []
+        periodos_sql = []
+        with etapa("volcar.lectura") as e:
+            if motor == "sql":
+                n_items, periodos_sql = volcado_sql.periodos_del_alcance(alcance_sql)
+            else:
+                items = list(iter_items_filtrados(lote_id, periodo_date, filtro_aseg, filtro_prod))
+                n_items = len(items)
+            e.filas = n_items
+
+        if not n_items:
+            if periodo_date is not None and filtro_aseg:
+                # Alcance acotado (reconsolidación incremental): la aseguradora dejó de tener
+                # items en el período → sus filas del panel también se van.
+                borradas, _ = ArtDashboardContratoPeriodo.objects.filter(
+                    periodo__year=periodo_date.year, periodo__month=periodo_date.month,
+                    aseguradora__iexact=filtro_aseg,
+                ).delete()
+                cubo.refrescar([periodo_date], aseguradora=filtro_aseg)
+                self.stdout.write(self.style.WARNING(
+                    f"Sin items para {periodo_date:%Y-%m} | aseguradora={filtro_aseg}: borradas {borradas} filas del panel."
+                ))
+                return
             self.stdout.write(self.style.WARNING("No se encontraron items para volcar con los filtros indicados."))
             return
 
@@ -271,6 +271,8 @@ class Command(BaseCommand):
         periodos_afectados = set()
         if periodo_date is not None:
             periodos_afectados.add(periodo_date)
+        elif motor == "sql":
+            periodos_afectados.update(periodos_sql)
         else:
             for it in items:
                 p = periodo_de_item(it)
@@ -278,27 +280,32 @@ class Command(BaseCommand):
                     periodos_afectados.add(p)
 
         borradas_total = 0
-        for p in sorted(periodos_afectados):
-            qs_reset = ArtDashboardContratoPeriodo.objects.filter(periodo__year=p.year, periodo__month=p.month)
-            if filtro_aseg:
-                qs_reset = qs_reset.filter(aseguradora__iexact=filtro_aseg)
-            if filtro_prod:
-                qs_reset = qs_reset.filter(productor__iexact=filtro_prod)
-            borradas, _ = qs_reset.delete()
-            borradas_total += borradas
-            alcance = f"{p:%Y-%m}"
-            if filtro_aseg:
-                alcance += f" | aseguradora={filtro_aseg}"
-            if filtro_prod:
-                alcance += f" | productor={filtro_prod}"
-            self.stdout.write(self.style.WARNING(f"Reset automático: borradas {borradas} filas de {alcance}."))
+        with etapa("volcar.reset") as e:
+            for p in sorted(periodos_afectados):
+                qs_reset = ArtDashboardContratoPeriodo.objects.filter(periodo__year=p.year, periodo__month=p.month)
+                if filtro_aseg:
+                    qs_reset = qs_reset.filter(aseguradora__iexact=filtro_aseg)
+                if filtro_prod:
+                    qs_reset = qs_reset.filter(productor__iexact=filtro_prod)
+                borradas, _ = qs_reset.delete()
+                borradas_total += borradas
+                alcance = f"{p:%Y-%m}"
+                if filtro_aseg:
+                    alcance += f" | aseguradora={filtro_aseg}"
+                if filtro_prod:
+                    alcance += f" | productor={filtro_prod}"
+                self.stdout.write(self.style.WARNING(f"Reset automático: borradas {borradas} filas de {alcance}."))
+            e.filas = borradas_total
 
         # 3) Upsert de los items del alcance
         creados = 0
         actualizados = 0
         errores = 0
 
-        with transaction.atomic():
+        with etapa("volcar.upsert") as medicion, transaction.atomic():
+            if motor == "sql":
+                res = volcado_sql.volcar(alcance_sql)
+                creados, actualizados = res.creados, res.actualizados
             for it in items:
                 try:
                     data = build_dashboard_row_from_item(it, periodo_date, lote_id)
@@ -320,8 +327,16 @@ class Command(BaseCommand):
                 except Exception as e:
                     errores += 1
                     raise CommandError(f"Error al volcar item ID={getattr(it,'id', '?')}: {e}")
+            medicion.filas = creados + actualizados
+
+        # 4) Cubo de Análisis: solo los meses (y aseguradora/productor) del alcance
+        with etapa("volcar.cubo") as e:
+            e.filas = cubo.refrescar(periodos_afectados, aseguradora=filtro_aseg, productor=filtro_prod)
 
         self.stdout.write(self.style.SUCCESS(
-            f"Volcado finalizado. Reseteadas: {borradas_total} | Items procesados: {len(items)} | "
+            f"Volcado finalizado ({motor}). Reseteadas: {borradas_total} | Items procesados: {n_items} | "
             f"Creados: {creados} | Actualizados: {actualizados} | Errores: {errores}"
         ))
+        self.stdout.write(
+            f"Filas leídas de art_consolidado_item: {n_items} | escritas en el panel: {creados + actualizados}"
+        )
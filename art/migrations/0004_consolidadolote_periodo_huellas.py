@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-16 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('art', '0003_artdashboardcontratoperiodo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consolidadolote',
+            name='huellas_fuente',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='consolidadolote',
+            name='periodo',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-16 19:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('art', '0004_consolidadolote_periodo_huellas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsolidacionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+                ('terminado_en', models.DateTimeField(blank=True, null=True)),
+                ('periodo', models.CharField(max_length=7)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_curso', 'En curso'), ('ok', 'Terminado'), ('error', 'Error')], db_index=True, default='pendiente', max_length=10)),
+                ('etapa', models.CharField(blank=True, choices=[('cargando', 'Cargando insumos'), ('cruzando', 'Cruzando deudas con el maestro'), ('exportando', 'Generando XLSX'), ('persistiendo', 'Guardando lote e items'), ('tablero', 'Actualizando tablero')], max_length=15)),
+                ('etapas', models.JSONField(blank=True, default=dict)),
+                ('task_id', models.CharField(blank=True, max_length=255)),
+                ('archivo', models.CharField(blank=True, max_length=500)),
+                ('avisos', models.JSONField(blank=True, default=list)),
+                ('advertencias', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True)),
+                ('lote', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='art.consolidadolote')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='jobs_consolidacion', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'art_consolidacion_job',
+                'ordering': ['-creado_en'],
+            },
+        ),
+    ]
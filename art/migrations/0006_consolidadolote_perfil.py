@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-16 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('art', '0005_consolidacionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consolidadolote',
+            name='perfil',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-16 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('art', '0006_consolidadolote_perfil'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consolidadoitem',
+            index=models.Index(fields=['periodo', 'aseguradora'], name='art_consoli_periodo_4d1143_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2 on 2026-10-16 20:53
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Case, CharField, Count, Sum, Value, When
+
+
+def poblar_cubo(apps, schema_editor):
+    """Primer armado del cubo con lo que ya hay en el tablero (mismas bandas que art/services/cubo.py)."""
+    Dash = apps.get_model("art", "ArtDashboardContratoPeriodo")
+    Cubo = apps.get_model("art", "ArtDashboardCubo")
+    banda = Case(
+        *[When(q_periodos_deudores__gte=d, then=Value(b)) for d, b in [(6, "6+"), (4, "4-5"), (3, "3"), (2, "2"), (1, "1")]],
+        default=Value("0"),
+        output_field=CharField(),
+    )
+    filas = (
+        Dash.objects.annotate(banda=banda)
+        .values("periodo", "aseguradora", "productor", "banda")
+        .annotate(contratos=Count("id"), deuda=Sum("deuda_total"), suma_q=Sum("q_periodos_deudores"))
+        .order_by()
+    )
+    Cubo.objects.bulk_create(
+        [
+            Cubo(periodo=r["periodo"], aseguradora=r["aseguradora"], productor=r["productor"], banda_q=r["banda"],
+                 contratos=r["contratos"], deuda=r["deuda"] or 0, suma_q=r["suma_q"] or 0)
+            for r in filas
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('art', '0007_consolidadoitem_periodo_aseguradora_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtDashboardCubo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('periodo', models.DateField()),
+                ('aseguradora', models.CharField(max_length=120)),
+                ('productor', models.CharField(blank=True, default='', max_length=120)),
+                ('banda_q', models.CharField(help_text="'0' (Q < 1 o vacío), '1' (1 ≤ Q < 2), '2', '3', '4-5', '6+' — los buckets de Análisis", max_length=10)),
+                ('contratos', models.PositiveIntegerField(default=0)),
+                ('deuda', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('suma_q', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Suma de Q períodos deudores (promedio = suma_q / contratos)', max_digits=20)),
+            ],
+            options={
+                'verbose_name': 'ART Dashboard (cubo)',
+                'verbose_name_plural': 'ART Dashboard (cubo)',
+                'db_table': 'art_dashboard_cubo',
+                'constraints': [models.UniqueConstraint(fields=('periodo', 'aseguradora', 'productor', 'banda_q'), name='uniq_art_cubo_periodo_aseg_prod_banda')],
+            },
+        ),
+        migrations.RunPython(poblar_cubo, migrations.RunPython.noop),
+    ]
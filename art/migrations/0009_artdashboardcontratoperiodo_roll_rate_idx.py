@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-16 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('art', '0008_artdashboardcubo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artdashboardcontratoperiodo',
+            index=models.Index(fields=['periodo', 'cuit', 'contrato', 'aseguradora', 'q_periodos_deudores', 'deuda_total'], name='art_artdash_periodo_c0dd25_idx'),
+        ),
+    ]
@@ -30,6 +30,16 @@ class ConsolidadoLote(models.Model):
     # Para deduplicar si hiciera falta (hash de insumos)
     hash_entrada = models.CharField(max_length=64, blank=True, db_index=True)
 
+    # Reconsolidación incremental: período del lote + huella de cada insumo
+    # {"maestro": h, "mapeo": h, "archivos": {"Andina": {"archivo": "06-2025.xlsx", "huella": h, "aseguradoras": [...]}},
+    #  "errores": {"Galeno": "mensaje"}}  (carpetas que no se pudieron leer; conservan la huella del lote previo)
+    periodo = models.DateField(null=True, blank=True, db_index=True)
+    huellas_fuente = models.JSONField(default=dict, blank=True)
+
+    # Perfil de la corrida por etapa (art/services/perfilado.py)
+    # {"total_s": s, "pico_rss_mb": mb, "etapas": {"cargar.maestro": {"segundos", "filas", "pico_rss_mb", "delta_rss_mb", "veces"}, ...}}
+    perfil = models.JSONField(default=dict, blank=True)
+
     observaciones = models.TextField(blank=True)
 
     class Meta:
@@ -90,6 +100,7 @@ class ConsolidadoItem(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["cuit", "periodo"]),
+            models.Index(fields=["periodo", "aseguradora"]),   # volcado/consultas de un mes
             models.Index(fields=["aseguradora"]),
             models.Index(fields=["hoja"]),
         ]
@@ -104,6 +115,66 @@ class ConsolidadoItem(models.Model):
         return f"{self.cuit} - {self.aseguradora} ({self.hoja}) {per}"
 
 
+class ConsolidacionJob(models.Model):
+    """
+    Corrida del consolidado en segundo plano (Celery, art.tasks.task_consolidar).
+    Registra la etapa en curso, cuándo empezó/terminó cada una y el XLSX resultante.
+    """
+    ESTADOS = [
+        ("pendiente", "Pendiente"),
+        ("en_curso", "En curso"),
+        ("ok", "Terminado"),
+        ("error", "Error"),
+    ]
+    # Mismo orden que art.services.pipeline_consolidado.ETAPAS
+    ETAPAS = [
+        ("cargando", "Cargando insumos"),
+        ("cruzando", "Cruzando deudas con el maestro"),
+        ("exportando", "Generando XLSX"),
+        ("persistiendo", "Guardando lote e items"),
+        ("tablero", "Actualizando tablero"),
+    ]
+
+    creado_en = models.DateTimeField(auto_now_add=True)
+    actualizado_en = models.DateTimeField(auto_now=True)
+    terminado_en = models.DateTimeField(null=True, blank=True)
+    usuario = models.ForeignKey(
+        User, on_delete=models.PROTECT, related_name="jobs_consolidacion"
+    )
+
+    periodo = models.CharField(max_length=7)                       # 'MM-AAAA'
+    estado = models.CharField(max_length=10, choices=ESTADOS, default="pendiente", db_index=True)
+    etapa = models.CharField(max_length=15, choices=ETAPAS, blank=True)
+    etapas = models.JSONField(default=dict, blank=True)            # {"cargando": {"inicio": iso, "fin": iso}, ...}
+    task_id = models.CharField(max_length=255, blank=True)
+
+    # Resultado
+    archivo = models.CharField(max_length=500, blank=True)         # ruta del XLSX generado
+    lote = models.ForeignKey(
+        ConsolidadoLote, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs"
+    )
+    avisos = models.JSONField(default=list, blank=True)
+    advertencias = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-creado_en"]
+        db_table = "art_consolidacion_job"
+
+    def __str__(self):
+        return f"Job #{self.id} - {self.periodo} ({self.estado})"
+
+    @property
+    def progreso(self) -> int:
+        """0-100 según la etapa en curso (cada etapa pesa lo mismo)."""
+        if self.estado == "ok":
+            return 100
+        claves = [k for k, _ in self.ETAPAS]
+        if self.etapa not in claves:
+            return 0
+        return int(100 * claves.index(self.etapa) / len(claves))
+
+
 # =========================
 # 2) LOG DE ENVÍOS DE MAIL
 # =========================
@@ -258,7 +329,49 @@ class ArtDashboardContratoPeriodo(models.Model):
             models.Index(fields=["bucket_q"]),
             models.Index(fields=["premier"]),
             models.Index(fields=["cliente_importante"]),
+            # Roll rate (art/services/roll_rate.py): self-join por período + clave del contrato
+            # leyendo Q y deuda del índice, sin ir a la tabla
+            models.Index(fields=["periodo", "cuit", "contrato", "aseguradora", "q_periodos_deudores", "deuda_total"]),
+        ]
+
+    def __str__(self):
+        return f"{self.periodo} | {self.aseguradora} | {self.contrato} | {self.cuit}"
+
+
+class ArtDashboardCubo(models.Model):
+    """
+    Resumen de ArtDashboardContratoPeriodo para la pantalla de Análisis:
+    1 fila = período × aseguradora × productor × banda de Q.
+    Se recalcula por período al final de volcar/importar (art/services/cubo.py).
+    """
+    BANDA_SIN_DEUDA = "0"
+    BANDAS_DEUDA = ["1", "2", "3", "4-5", "6+"]
+    BANDAS_RIESGO = ["3", "4-5", "6+"]
+
+    periodo = models.DateField()
+    aseguradora = models.CharField(max_length=120)
+    productor = models.CharField(max_length=120, blank=True, default="")
+    banda_q = models.CharField(
+        max_length=10,
+        help_text="'0' (Q < 1 o vacío), '1' (1 ≤ Q < 2), '2', '3', '4-5', '6+' — los buckets de Análisis",
+    )
+
+    # Medidas
+    contratos = models.PositiveIntegerField(default=0)
+    deuda = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    suma_q = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal("0.00"),
+                                 help_text="Suma de Q períodos deudores (promedio = suma_q / contratos)")
+
+    class Meta:
+        db_table = "art_dashboard_cubo"
+        verbose_name = "ART Dashboard (cubo)"
+        verbose_name_plural = "ART Dashboard (cubo)"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["periodo", "aseguradora", "productor", "banda_q"],
+                name="uniq_art_cubo_periodo_aseg_prod_banda",
+            )
         ]
 
     def __str__(self):
-        return f"{self.periodo} | {self.aseguradora} | {self.contrato} | {self.cuit}"
\ No newline at end of file
+        return f"{self.periodo} | {self.aseguradora} | {self.productor} | Q {self.banda_q}"
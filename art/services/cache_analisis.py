@@ -0,0 +1,87 @@
+# art/services/cache_analisis.py
+"""
+Caché del contexto de la pantalla de Análisis (art/views/analisis.py).
+---------------------------------------------------------------------
+• Una entrada por grupo de datos ("pagina" o un grupo de los endpoints JSON) y período
+  seleccionado ("ultimo" si no se pidió ninguno), guardada junto con la VERSIÓN de los datos
+  con la que se calculó: {"version": v, "contexto": {...}}.
+• La versión vive en la misma caché (clave "version") y cambia cada vez que se reescribe el
+  cubo (art/services/cubo.py, al final de volcar/importar). Se cambia con
+  `transaction.on_commit`: nadie puede leer la versión nueva antes de que los datos nuevos
+  estén confirmados, y lo calculado con datos viejos queda bajo la versión vieja.
+• Un acierto cuesta un solo GET (get_many de versión + entrada); la entrada vale solo si su
+  versión coincide con la actual.
+• Si la caché no está configurada (ART_ANALISIS_CACHE = "") o no responde (Redis caído), se
+  calcula el contexto en cada pedido, como antes.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Callable, Optional
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+ALIAS: str = getattr(settings, "ART_ANALISIS_CACHE", "art_analisis")
+
+_CLAVE_VERSION = "version"
+
+
+def _cache():
+    if not ALIAS or ALIAS not in getattr(settings, "CACHES", {}):
+        return None
+    return caches[ALIAS]
+
+
+def _clave(grupo: str, periodo_sel: Optional[date]) -> str:
+    return f"{grupo}:{periodo_sel.isoformat() if periodo_sel else 'ultimo'}"
+
+
+def _nueva_version() -> None:
+    cache = _cache()
+    if cache is None:
+        return
+    try:
+        # Un número que no se repite aunque la clave se haya perdido (desalojo, reinicio de Redis)
+        cache.set(_CLAVE_VERSION, time.time_ns(), timeout=None)
+    except Exception as e:
+        log.error("No se pudo invalidar la caché de Análisis (%s): puede servir datos viejos hasta que venza.", e)
+
+
+def invalidar() -> None:
+    """Nueva versión de los datos de Análisis cuando se confirme la transacción en curso."""
+    transaction.on_commit(_nueva_version)
+
+
+def obtener(grupo: str, periodo_sel: Optional[date], calcular: Callable[[], dict]) -> dict:
+    """Datos de Análisis (`grupo`, `periodo_sel`) desde la caché o, si no están vigentes, `calcular()`."""
+    cache = _cache()
+    if cache is None:
+        return calcular()
+
+    clave = _clave(grupo, periodo_sel)
+    try:
+        leidos = cache.get_many([_CLAVE_VERSION, clave])
+        version = leidos.get(_CLAVE_VERSION)
+        entrada = leidos.get(clave)
+        if version is not None and entrada is not None and entrada["version"] == version:
+            return entrada["contexto"]
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(_CLAVE_VERSION, version, timeout=None):
+                version = cache.get(_CLAVE_VERSION)
+    except Exception as e:
+        log.warning("Caché de Análisis no disponible (%s); se calcula sin caché.", e)
+        return calcular()
+
+    contexto = calcular()
+    try:
+        cache.set(clave, {"version": version, "contexto": contexto})
+    except Exception as e:
+        log.warning("No se pudo guardar el contexto de Análisis en caché (%s).", e)
+    return contexto
@@ -0,0 +1,266 @@
+# art/services/cache_insumos.py
+"""
+Caché en disco de insumos Excel ya parseados (maestro, mapeo y archivos de aseguradoras).
+------------------------------------------------------------------------------------------
+• Clave: ruta absoluta + tamaño + mtime (o SHA-256 del contenido si ART_CACHE_CLAVE="sha256")
+  + "tipo" de lectura (qué parser y con qué columnas) + FORMATO_VERSION.
+• Valor: el DataFrame YA normalizado, en Parquet (si hay pyarrow) o pickle como alternativa.
+• Cada entrada es <clave>.<ext> + <clave>.json (metadatos). Al guardar una versión nueva de
+  un archivo se borran las entradas viejas de esa misma ruta/tipo.
+• Desalojo: entradas sin uso hace más de ART_CACHE_MAX_DIAS y, luego, LRU hasta quedar por
+  debajo de ART_CACHE_MAX_MB.
+
+Administración: `python manage.py cache_insumos_art [--limpiar | --evictar]`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+# Subir este número si cambia la normalización de algún parser (invalida todo lo cacheado).
+FORMATO_VERSION = 1
+
+CACHE_DIR: Path = Path(getattr(
+    settings, "ART_CACHE_DIR",
+    Path(getattr(settings, "BASE_DIR", Path.cwd())) / ".cache" / "art_insumos",
+))
+CACHE_HABILITADO: bool = bool(getattr(settings, "ART_CACHE_HABILITADO", True))
+CACHE_CLAVE: str = str(getattr(settings, "ART_CACHE_CLAVE", "mtime")).lower()   # "mtime" | "sha256"
+CACHE_MAX_MB: float = float(getattr(settings, "ART_CACHE_MAX_MB", 512))
+CACHE_MAX_DIAS: float = float(getattr(settings, "ART_CACHE_MAX_DIAS", 60))
+
+
+@dataclass
+class EntradaCache:
+    clave: str
+    ruta: str
+    tipo: str
+    formato: str
+    filas: int
+    bytes: int
+    creado: float
+    ultimo_uso: float
+
+    @property
+    def archivo(self) -> Path:
+        return CACHE_DIR / f"{self.clave}.{self.formato}"
+
+    @property
+    def meta(self) -> Path:
+        return CACHE_DIR / f"{self.clave}.json"
+
+
+# --------------------------
+# Helpers
+# --------------------------
+def _parquet_disponible() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _sha256_archivo(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for bloque in iter(lambda: fh.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def clave_archivo(path: Path, tipo: str) -> str:
+    """Clave de caché para (archivo en su estado actual, tipo de lectura)."""
+    path = Path(path).resolve()
+    st = path.stat()
+    partes = [FORMATO_VERSION, tipo, str(path), st.st_size]
+    if CACHE_CLAVE == "sha256":
+        partes.append(_sha256_archivo(path))
+    else:
+        partes.append(st.st_mtime_ns)
+    return hashlib.sha256(json.dumps(partes, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _escribir_atomico(destino: Path, escribir: Callable[[Path], None]) -> None:
+    tmp = destino.with_name(f".{destino.name}.{os.getpid()}.tmp")
+    try:
+        escribir(tmp)
+        os.replace(tmp, destino)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _guardar_df(df: pd.DataFrame, destino: Path, formato: str) -> None:
+    if formato == "parquet":
+        _escribir_atomico(destino, lambda p: df.to_parquet(p, index=True))
+    else:
+        _escribir_atomico(destino, lambda p: df.to_pickle(p))
+
+
+def _leer_df(origen: Path, formato: str) -> pd.DataFrame:
+    if formato != "parquet":
+        return pd.read_pickle(origen)
+    df = pd.read_parquet(origen)
+    # Parquet devuelve None donde pandas tenía NaN en columnas object: lo restauramos
+    # para que el resto del pipeline (astype(str) → "nan", etc.) se comporte igual.
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].where(df[c].notna(), np.nan)
+    return df
+
+
+def _leer_meta(meta: Path) -> Optional[EntradaCache]:
+    try:
+        data = json.loads(meta.read_text(encoding="utf-8"))
+        return EntradaCache(**data)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _guardar_meta(entrada: EntradaCache) -> None:
+    texto = json.dumps(entrada.__dict__, ensure_ascii=False)
+    _escribir_atomico(entrada.meta, lambda p: p.write_text(texto, encoding="utf-8"))
+
+
+def _borrar(entrada: EntradaCache) -> int:
+    liberado = 0
+    for p in (entrada.archivo, entrada.meta):
+        try:
+            liberado += p.stat().st_size
+            p.unlink()
+        except FileNotFoundError:
+            pass
+    return liberado
+
+
+# --------------------------
+# API principal
+# --------------------------
+def cargar_o_parsear(path: Path, tipo: str, parser: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Devuelve el DataFrame de `path` desde la caché si el archivo no cambió;
+    si no, llama a `parser()`, guarda el resultado y lo devuelve.
+
+    - tipo: identifica la lectura (p.ej. "maestro" o "deudas|Galeno|CUIT|Saldo"); dos lecturas
+      distintas del mismo archivo no comparten entrada.
+    - Cualquier error de la caché (disco lleno, entrada corrupta) cae al parser: la caché nunca
+      hace fallar la consolidación.
+    """
+    if not CACHE_HABILITADO:
+        return parser()
+
+    try:
+        clave = clave_archivo(path, tipo)
+    except OSError:
+        return parser()
+
+    meta = CACHE_DIR / f"{clave}.json"
+    entrada = _leer_meta(meta) if meta.exists() else None
+    if entrada is not None and entrada.archivo.exists():
+        try:
+            df = _leer_df(entrada.archivo, entrada.formato)
+            entrada.ultimo_uso = time.time()
+            _guardar_meta(entrada)
+            return df
+        except Exception as e:  # noqa: BLE001
+            log.warning("Caché de insumos: entrada %s ilegible (%s); se vuelve a parsear.", clave[:12], e)
+            _borrar(entrada)
+
+    df = parser()
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        formato = "parquet" if _parquet_disponible() else "pkl"
+        entrada = EntradaCache(
+            clave=clave, ruta=str(Path(path).resolve()), tipo=tipo, formato=formato,
+            filas=len(df), bytes=0, creado=time.time(), ultimo_uso=time.time(),
+        )
+        try:
+            _guardar_df(df, entrada.archivo, formato)
+        except Exception:  # noqa: BLE001
+            if formato != "parquet":
+                raise
+            # Columnas con tipos mezclados que Arrow no acepta → pickle
+            entrada.formato = "pkl"
+            _guardar_df(df, entrada.archivo, "pkl")
+        entrada.bytes = entrada.archivo.stat().st_size
+        _guardar_meta(entrada)
+
+        # La versión anterior de este mismo archivo ya no sirve
+        for vieja in listar():
+            if vieja.clave != clave and vieja.ruta == entrada.ruta and vieja.tipo == tipo:
+                _borrar(vieja)
+        evictar()
+    except Exception as e:  # noqa: BLE001
+        log.warning("Caché de insumos: no se pudo guardar %s (%s).", path, e)
+
+    return df
+
+
+def listar() -> List[EntradaCache]:
+    """Entradas actuales, de la más reciente a la más vieja (por último uso)."""
+    if not CACHE_DIR.exists():
+        return []
+    entradas = [e for e in (_leer_meta(m) for m in CACHE_DIR.glob("*.json")) if e is not None]
+    return sorted(entradas, key=lambda e: e.ultimo_uso, reverse=True)
+
+
+def evictar(max_mb: Optional[float] = None, max_dias: Optional[float] = None) -> Tuple[int, int]:
+    """
+    Aplica la política de desalojo. Devuelve (entradas borradas, bytes liberados).
+    """
+    max_bytes = (CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+    max_dias = CACHE_MAX_DIAS if max_dias is None else max_dias
+    limite_uso = time.time() - max_dias * 86400
+
+    borradas, liberado = 0, 0
+    restantes: List[EntradaCache] = []
+    for e in listar():
+        if e.ultimo_uso < limite_uso or not e.archivo.exists():
+            liberado += _borrar(e)
+            borradas += 1
+        else:
+            restantes.append(e)
+
+    total = sum(e.bytes for e in restantes)
+    while restantes and total > max_bytes:
+        e = restantes.pop()          # la de uso más antiguo
+        total -= e.bytes
+        liberado += _borrar(e)
+        borradas += 1
+    return borradas, liberado
+
+
+def limpiar() -> Tuple[int, int]:
+    """Borra toda la caché. Devuelve (entradas borradas, bytes liberados)."""
+    borradas, liberado = 0, 0
+    for e in listar():
+        liberado += _borrar(e)
+        borradas += 1
+    if CACHE_DIR.exists():
+        for huerfano in list(CACHE_DIR.glob("*.parquet")) + list(CACHE_DIR.glob("*.pkl")):
+            liberado += huerfano.stat().st_size
+            huerfano.unlink()
+    return borradas, liberado
+
+
+def describir(entrada: EntradaCache) -> str:
+    uso = datetime.fromtimestamp(entrada.ultimo_uso).strftime("%Y-%m-%d %H:%M")
+    return (
+        f"{entrada.clave[:12]}  {entrada.tipo:<40.40}  {entrada.filas:>8} filas  "
+        f"{entrada.bytes / 1024:>9.1f} KB  {entrada.formato:<7}  uso {uso}  {entrada.ruta}"
+    )
@@ -13,19 +13,33 @@ Reglas principales:
 • **Andina ART y Parana Seguros**: agrupar por CUIT y sumar (archivos tipo tabla dinámica).
 • “Experta”: deuda con signo invertido → se invierte.
 • Moneda ARS "$  #,##0.00"; CUIT 11 dígitos; zoom 80% en todas las hojas.
+• Maestro, mapeo y archivos de deuda pasan por la caché de insumos (art/services/cache_insumos.py).
+• Archivos de deuda: se leen en paralelo (settings.ART_DEUDAS_WORKERS procesos); un archivo con error se reporta y se saltea.
 
-Incluye: parser robusto AR para importes + tolerancia a espacios en encabezados (strip) + normalización de acentos (slug) + alias OMINT→Serena.
+Incluye: parser robusto AR para importes (core/numeros_ar.py) + tolerancia a espacios en encabezados (strip) + normalización de acentos (slug) + alias OMINT→Serena.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
 from io import BytesIO
 from pathlib import Path
-from typing import List, Dict, Set
-import re
+from typing import Callable, List, Dict, Set, Tuple, Optional
+import logging
 import unicodedata
 
+import numpy as np
 import pandas as pd
 from django.conf import settings
 
+from art.services import cache_insumos
+from art.services.perfilado import etapa
+from core.lectura_excel import read_excel_fast
+from core.numeros_ar import parse_ar_series
+
+log = logging.getLogger(__name__)
 
 # ------------------------------------------------------------------#
 # Rutas y columnas
@@ -45,6 +59,9 @@ MAPEO_ASEG_PATH: Path = getattr(
     Path(r"C:/Users/Promecor/Documents/Aplicativo cobranzas/ART/Mapeo aseguradoras.xlsx"),
 )
 
+# Procesos para leer los archivos de las aseguradoras (1 = lectura serial).
+DEUDAS_WORKERS: int = int(getattr(settings, "ART_DEUDAS_WORKERS", 1) or 1)
+
 COLUMNS_ORDER: List[str] = [
     "Periodo", "Razón social", "CUIT", "Contrato", "Aseguradora",
     "Deuda total", "Costo mensual", "Q periodos deudores", "Estado contrato",
@@ -120,32 +137,59 @@ def _norm_periodo(periodo: str) -> str:
     mm, yyyy = p.split("-")
     return f"{mm.zfill(2)}-{yyyy}"
 
-_AR_NUM_RE = re.compile(r"[^0-9,\.\-]")
-
 def _to_number_ar_series(s: pd.Series, decimals: int | None = None) -> pd.Series:
-    if pd.api.types.is_numeric_dtype(s):
-        out = pd.to_numeric(s, errors="coerce")
-    else:
-        tmp = s.astype(str).str.strip().replace({"": None, "nan": None, "None": None})
-        tmp = tmp.apply(lambda x: None if x is None else _AR_NUM_RE.sub("", x))
-        def _swap_commas(v):
-            if v is None:
-                return None
-            if "," in v:
-                v = v.replace(".", "").replace(",", ".")
-            return v
-        tmp = tmp.apply(_swap_commas)
-        out = pd.to_numeric(tmp, errors="coerce")
-    if decimals is not None:
-        out = out.round(decimals)
+    """Importes AR/US → float (NaN si no hay número). Ver core/numeros_ar.py."""
+    return parse_ar_series(s, decimals)
+
+def _round2(x: pd.Series) -> pd.Series:
+    """
+    round(v, 2) de Python, vectorizado. `Series.round` escala ×100 y puede diferir de
+    round() justo en los empates binarios (p.ej. 2.675); esos pocos valores se recalculan con round().
+    """
+    out = x.round(2)
+    esc = x * 100
+    dudosos = (esc - np.floor(esc) - 0.5).abs() < 1e-6
+    if dudosos.any():
+        out[dudosos] = x[dudosos].map(lambda v: round(v, 2))
     return out
 
+def _q_periodos(deuda: pd.Series, costo: pd.Series) -> pd.Series:
+    """Q = Deuda / Costo con 2 decimales; NaN si el costo es vacío o 0."""
+    con_costo = costo.notna() & costo.ne(0)
+    return _round2(deuda.where(con_costo) / costo.where(con_costo))
+
+def _mascara_por_unicos(s: pd.Series, cond) -> np.ndarray:
+    """
+    Evalúa `cond` (una función Series[str] → Series[bool]) sólo sobre los valores distintos de `s`
+    y la expande con los códigos de `pd.factorize`. Columnas como «Cuenta Perdida» tienen un puñado
+    de valores distintos en cientos de miles de filas; los NaN se evalúan como el texto "nan".
+    """
+    codigos, unicos = pd.factorize(s, use_na_sentinel=True)
+    mask_unicos = cond(pd.Series(unicos, dtype=object).astype(str)).to_numpy(dtype=bool)
+    mask_na = bool(cond(pd.Series(["nan"])).iloc[0])
+    return np.where(codigos >= 0, mask_unicos[codigos] if len(unicos) else False, mask_na)
+
+def _estado_contrato(cuenta_perdida: pd.Series) -> pd.Series:
+    """«Cuenta Perdida» vacía o “Vigente” → "Vigente"; si no, el texto original."""
+    es_vigente = cuenta_perdida.isna().to_numpy() | _mascara_por_unicos(
+        cuenta_perdida, lambda u: u.str.strip().str.casefold().isin({"", "vigente"})
+    )
+    return cuenta_perdida.where(~es_vigente, "Vigente")
+
+def _premier(referido_por: pd.Series) -> pd.Series:
+    """«Referido por» == PREMIER (sin importar mayúsculas/espacios) → "Premier"."""
+    es_premier = _mascara_por_unicos(referido_por, lambda u: u.str.strip().str.upper().eq("PREMIER"))
+    return pd.Series(np.where(es_premier, "Premier", "No es Premier"), index=referido_por.index, dtype=object)
+
 
 # ------------------------------------------------------------------#
 # Lectura de insumos
 # ------------------------------------------------------------------#
 def _leer_mapeo_aseguradoras(path: Path) -> pd.DataFrame:
-    df = pd.read_excel(path, sheet_name=0, dtype=str)
+    return cache_insumos.cargar_o_parsear(path, "mapeo", lambda: _parsear_mapeo_aseguradoras(path))
+
+def _parsear_mapeo_aseguradoras(path: Path) -> pd.DataFrame:
+    df = read_excel_fast(path, sheet_name=0, dtype=str)
     df.columns = df.columns.str.strip()
     need = {"Aseguradora", "deuda_col", "cuit_col"}
     faltan = need - set(df.columns)
@@ -156,12 +200,15 @@ def _leer_mapeo_aseguradoras(path: Path) -> pd.DataFrame:
     return df
 
 def _cargar_maestro_raw(path: Path) -> pd.DataFrame:
+    return cache_insumos.cargar_o_parsear(path, "maestro", lambda: _parsear_maestro_raw(path))
+
+def _parsear_maestro_raw(path: Path) -> pd.DataFrame:
     use_cols = [
         M_CUIT, M_RAZON, M_CONTRATO, M_ASEGURADORA, M_COSTO,
         M_CUENTA_PERDIDA, M_EMAIL, M_NO_CONTACTAR, M_PRODUCTOR1, M_PRODUCTOR2,
         M_REFERIDO_POR, M_CLIENTE_IMP, M_CAPITAS, M_RAMO,
     ]
-    maestro = pd.read_excel(path, sheet_name=0, dtype=str)
+    maestro = read_excel_fast(path, sheet_name=0, dtype=str)
     presentes = [c for c in use_cols if c in maestro.columns]
     maestro = maestro[presentes].copy()
     for c in use_cols:
@@ -172,7 +219,26 @@ def _cargar_maestro_raw(path: Path) -> pd.DataFrame:
     maestro[M_COSTO] = _to_number_ar_series(maestro[M_COSTO], decimals=2)
     return maestro
 
+def _spec_mapeo(nombre_aseg: str, mapeo: pd.DataFrame) -> Tuple[str, str]:
+    """(cuit_col, deuda_col) de la aseguradora según 'Mapeo aseguradoras.xlsx'."""
+    spec = mapeo[mapeo["Aseguradora"].astype(str).str.strip().str.casefold()
+                 == nombre_aseg.strip().casefold()]
+    if spec.empty:
+        raise ValueError(f"No hay mapeo para '{nombre_aseg}'. Verificá 'Mapeo aseguradoras.xlsx'.")
+    return str(spec.iloc[0]["cuit_col"]).strip(), str(spec.iloc[0]["deuda_col"]).strip()
+
 def _leer_deudas_archivo(fp: Path, nombre_aseg: str, mapeo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Devuelve: ['cuit', 'deuda_total', 'aseguradora_origen']
+    Pasa por la caché de insumos: si el archivo (y su fila de mapeo) no cambió, no se re-parsea.
+    """
+    cuit_col, deuda_col = _spec_mapeo(nombre_aseg, mapeo)
+    tipo = f"deudas|{nombre_aseg}|{cuit_col}|{deuda_col}"
+    return cache_insumos.cargar_o_parsear(
+        fp, tipo, lambda: _parsear_deudas_archivo(fp, nombre_aseg, cuit_col, deuda_col)
+    )
+
+def _parsear_deudas_archivo(fp: Path, nombre_aseg: str, cuit_col: str, deuda_col: str) -> pd.DataFrame:
     """
     Devuelve: ['cuit', 'deuda_total', 'aseguradora_origen']
       - Federación Patronal: permite deuda_col "X + Y".
@@ -180,17 +246,9 @@ def _leer_deudas_archivo(fp: Path, nombre_aseg: str, mapeo: pd.DataFrame) -> pd.
       - Experta: invierte signo.
       - Alias de aseguradora para merge (p.ej., OMINT→Serena).
     """
-    df = pd.read_excel(fp, sheet_name=0)
+    df = read_excel_fast(fp, sheet_name=0)
     df.columns = df.columns.str.strip()
 
-    spec = mapeo[mapeo["Aseguradora"].astype(str).str.strip().str.casefold()
-                 == nombre_aseg.strip().casefold()]
-    if spec.empty:
-        raise ValueError(f"No hay mapeo para '{nombre_aseg}'. Verificá 'Mapeo aseguradoras.xlsx'.")
-
-    cuit_col = str(spec.iloc[0]["cuit_col"]).strip()
-    deuda_col = str(spec.iloc[0]["deuda_col"]).strip()
-
     def _check_cols(cols: List[str]):
         miss = [c for c in cols if c not in df.columns]
         if miss:
@@ -232,7 +290,44 @@ def _leer_deudas_archivo(fp: Path, nombre_aseg: str, mapeo: pd.DataFrame) -> pd.
 
     return tmp[["cuit", "deuda_total", "aseguradora_origen"]]
 
-def _cargar_deudas(periodo: str, mapeo: pd.DataFrame) -> pd.DataFrame:
+def _leer_deudas_seguro(fp: Path, nombre_aseg: str, mapeo: pd.DataFrame) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """
+    Envoltorio de `_leer_deudas_archivo` para el pool de procesos: nunca lanza,
+    devuelve (df, None) o (None, mensaje de error). Así una aseguradora con el
+    archivo roto no aborta el período y no dependemos de que la excepción sea picklable.
+    """
+    try:
+        return _leer_deudas_archivo(fp, nombre_aseg, mapeo), None
+    except Exception as e:  # noqa: BLE001
+        return None, f"{type(e).__name__}: {e}"
+
+def _leer_deudas_en_paralelo(
+    tareas: List[Tuple[str, Path]], mapeo: pd.DataFrame, workers: int
+) -> List[Tuple[Optional[pd.DataFrame], Optional[str]]]:
+    """
+    Lee los archivos en un ProcessPoolExecutor y devuelve los resultados en el
+    MISMO orden de `tareas` (orden alfabético de carpetas), sin importar cuál termina primero.
+    Si no se puede levantar el pool (p.ej. dentro de un worker daemon de Celery) cae a serial.
+    """
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = [pool.submit(_leer_deudas_seguro, fp, nombre, mapeo) for nombre, fp in tareas]
+            return [f.result() for f in futuros]
+    except (OSError, AssertionError, BrokenProcessPool) as e:
+        log.warning("No se pudo usar el pool de procesos (%s); se leen las aseguradoras en serie.", e)
+        return [_leer_deudas_seguro(fp, nombre, mapeo) for nombre, fp in tareas]
+
+def _cargar_deudas(periodo: str, mapeo: pd.DataFrame, workers: int | None = None) -> pd.DataFrame:
+    """
+    Lee `<ART_ASEG_DIR>/<Aseguradora>/<MM-AAAA>.xlsx` para todas las carpetas.
+
+    - workers: procesos a usar (default settings.ART_DEUDAS_WORKERS). Con 1 se lee en serie.
+    - Los errores por archivo no cortan el período: se loguean y quedan en
+      `deudas.attrs["errores_archivos"]` ({carpeta: mensaje}). Solo se lanza si no
+      se pudo leer ningún archivo.
+    - `deudas.attrs["archivos"]`: por carpeta leída, nombre de archivo, huella y las
+      aseguradoras que aporta (para la reconsolidación incremental).
+    """
     fn = f"{_norm_periodo(periodo)}.xlsx"
     dfs: List[pd.DataFrame] = []
 
@@ -240,31 +335,60 @@ def _cargar_deudas(periodo: str, mapeo: pd.DataFrame) -> pd.DataFrame:
     if not base.exists():
         raise FileNotFoundError(f"No existe la carpeta de Aseguradoras: {base}")
 
+    tareas: List[Tuple[str, Path]] = []
     for carpeta in sorted([p for p in base.iterdir() if p.is_dir()]):
         fp = carpeta / fn
-        if not fp.exists():
+        if fp.exists():
+            tareas.append((carpeta.name, fp))
+
+    if not tareas:
+        raise FileNotFoundError(f"No hay archivos {fn} en {base}")
+
+    workers = max(1, int(workers or DEUDAS_WORKERS))
+    if workers > 1 and len(tareas) > 1:
+        resultados = _leer_deudas_en_paralelo(tareas, mapeo, min(workers, len(tareas)))
+    else:
+        resultados = [_leer_deudas_seguro(fp, nombre, mapeo) for nombre, fp in tareas]
+
+    errores: Dict[str, str] = {}
+    archivos: Dict[str, dict] = {}
+    for (nombre, fp), (dfi, err) in zip(tareas, resultados):
+        if err is not None:
+            log.warning("Deudas ART %s: no se pudo leer '%s': %s", fn, nombre, err)
+            errores[nombre] = err
             continue
-        dfi = _leer_deudas_archivo(fp, carpeta.name, mapeo)
         dfs.append(dfi)
+        archivos[nombre] = {
+            "archivo": fp.name,
+            "huella": cache_insumos.clave_archivo(fp, "huella"),
+            "aseguradoras": sorted(dfi["aseguradora_origen"].dropna().astype(str).unique().tolist()),
+        }
 
     if not dfs:
-        raise FileNotFoundError(f"No hay archivos {fn} en {base}")
+        detalle = "; ".join(f"{k} → {v}" for k, v in errores.items())
+        raise ValueError(f"No se pudo leer ningún archivo {fn}: {detalle}")
 
     deudas = pd.concat(dfs, ignore_index=True)
     deudas = (
         deudas.groupby(["cuit", "aseguradora_origen"], as_index=False, sort=False)["deuda_total"]
               .sum()
     )
+    deudas.attrs["errores_archivos"] = errores
+    deudas.attrs["archivos"] = archivos
     return deudas
 
 
 # ------------------------------------------------------------------#
-# Hoja «Consolidado»
+# Cruce deudas × maestro
 # ------------------------------------------------------------------#
-def df_consolidado(periodo: str) -> pd.DataFrame:
-    maestro = _cargar_maestro_raw(MAESTRO_PATH)
-    mapeo = _leer_mapeo_aseguradoras(MAPEO_ASEG_PATH)
-    deudas = _cargar_deudas(periodo, mapeo)
+def _cruzar_deudas_maestro(deudas: pd.DataFrame, maestro: pd.DataFrame) -> pd.DataFrame:
+    """
+    LEFT JOIN deudas → maestro por (CUIT + aseguradora de origen), eligiendo en el maestro
+    la fila vigente (o la primera) de cada par. Las filas sin '_ASEG_n' son las que no cruzan.
+    No modifica los DataFrames recibidos.
+    """
+    maestro = maestro.copy()
+    deudas = deudas.copy()
 
     # Vigente: vacío o literal "Vigente"
     cp = maestro[M_CUENTA_PERDIDA].astype(str).str.strip().str.casefold()
@@ -277,7 +401,7 @@ def df_consolidado(periodo: str) -> pd.DataFrame:
     maestro_sorted = maestro.sort_values([M_CUIT, "_ASEG_n", "Vigente"], ascending=[True, True, False])
     maestro_compacto = maestro_sorted.drop_duplicates([M_CUIT, "_ASEG_n"], keep="first")
 
-    df = deudas.merge(
+    return deudas.merge(
         maestro_compacto,
         how="left",
         left_on=["cuit", "_ASEG_ORIGEN_n"],
@@ -285,7 +409,104 @@ def df_consolidado(periodo: str) -> pd.DataFrame:
         suffixes=("", "_m"),
     )
 
-    df = df[df["_ASEG_n"].notna()].copy()
+
+@dataclass
+class ConsolidacionContext:
+    """
+    Insumos de UNA corrida, leídos una sola vez: maestro, mapeo, deudas del período
+    y el cruce entre ambos. Todas las hojas del XLSX se derivan de acá.
+
+        ctx = ConsolidacionContext.cargar("06-2025")
+        hojas = ctx.hojas()
+    """
+    periodo: str
+    maestro: pd.DataFrame
+    mapeo: pd.DataFrame
+    deudas: pd.DataFrame
+    cruce: pd.DataFrame = field(repr=False)
+
+    @classmethod
+    def cargar(
+        cls,
+        periodo: str,
+        workers: int | None = None,
+        on_etapa: Optional[Callable[[str], None]] = None,
+    ) -> "ConsolidacionContext":
+        """`on_etapa("cargando" | "cruzando")` avisa el avance (jobs en segundo plano)."""
+        avisar = on_etapa or (lambda _etapa: None)
+        avisar("cargando")
+        with etapa("cargar.maestro") as e:
+            maestro = _cargar_maestro_raw(MAESTRO_PATH)
+            e.filas = len(maestro)
+        with etapa("cargar.mapeo") as e:
+            mapeo = _leer_mapeo_aseguradoras(MAPEO_ASEG_PATH)
+            e.filas = len(mapeo)
+        with etapa("cargar.deudas") as e:
+            deudas = _cargar_deudas(periodo, mapeo, workers=workers)
+            e.filas = len(deudas)
+        avisar("cruzando")
+        with etapa("cruce") as e:
+            cruce = _cruzar_deudas_maestro(deudas, maestro)
+            e.filas = len(cruce)
+        return cls(periodo=periodo, maestro=maestro, mapeo=mapeo, deudas=deudas, cruce=cruce)
+
+    @property
+    def errores_archivos(self) -> Dict[str, str]:
+        return dict(self.deudas.attrs.get("errores_archivos", {}))
+
+    def archivos_fuente(self) -> Dict[str, str]:
+        """{carpeta: archivo} de las aseguradoras leídas (para ConsolidadoLote.archivos_fuente)."""
+        return {k: v["archivo"] for k, v in self.deudas.attrs.get("archivos", {}).items()}
+
+    def huellas(self) -> Dict[str, object]:
+        """
+        Huella de cada insumo de la corrida (ver ConsolidadoLote.huellas_fuente). Con ella
+        la persistencia sabe qué aseguradoras cambiaron respecto del lote anterior; las
+        carpetas en "errores" no se leyeron y no cuentan como archivos quitados.
+        """
+        return {
+            "maestro": cache_insumos.clave_archivo(MAESTRO_PATH, "huella"),
+            "mapeo": cache_insumos.clave_archivo(MAPEO_ASEG_PATH, "huella"),
+            "archivos": dict(self.deudas.attrs.get("archivos", {})),
+            "errores": self.errores_archivos,
+        }
+
+    @cached_property
+    def consolidado(self) -> pd.DataFrame:
+        out = _armar_consolidado(self.cruce, self.periodo)
+        out.attrs["errores_archivos"] = self.errores_archivos
+        return out
+
+    @cached_property
+    def no_cruzan(self) -> pd.DataFrame:
+        return _armar_no_cruzan(self.cruce, self.periodo)
+
+    def hojas(self) -> Dict[str, pd.DataFrame]:
+        base = self.consolidado
+        return {
+            "Consolidado":           _ensure_columns(base, COLUMNS_ORDER),
+            "No cruzan":             _ensure_columns(self.no_cruzan, COLUMNS_ORDER),
+            "Sin mail":              _ensure_columns(df_sin_mail(base), COLUMNS_ORDER),
+            "Anuladas":              _ensure_columns(df_anuladas(base), COLUMNS_ORDER),
+            "No contactar":          _ensure_columns(df_no_contactar(base), COLUMNS_ORDER),
+            "Clientes importantes":  _ensure_columns(df_clientes_importantes(base), COLUMNS_ORDER),
+            "1 Q.deudor":            _ensure_columns(df_un_q_deudor(base), COLUMNS_ORDER),
+            "Premier":               _ensure_columns(df_premier(base), COLUMNS_ORDER),
+            "Productor":             _ensure_columns(df_productor(base), COLUMNS_ORDER),
+            "Deuda Promecor":        _ensure_columns(df_deuda_promecor(base), COLUMNS_ORDER),
+            "Agregar costo mensual": df_agregar_costo_mensual(base, maestro=self.maestro),
+        }
+
+
+# ------------------------------------------------------------------#
+# Hoja «Consolidado»
+# ------------------------------------------------------------------#
+def df_consolidado(periodo: str, ctx: Optional[ConsolidacionContext] = None) -> pd.DataFrame:
+    ctx = ctx or ConsolidacionContext.cargar(periodo)
+    return ctx.consolidado
+
+def _armar_consolidado(cruce: pd.DataFrame, periodo: str) -> pd.DataFrame:
+    df = cruce[cruce["_ASEG_n"].notna()].copy()
 
     df["Periodo"]          = _norm_periodo(periodo)
     df["Razón social"]     = df[M_RAZON]
@@ -295,20 +516,11 @@ def df_consolidado(periodo: str) -> pd.DataFrame:
     df["Deuda total"]      = _to_number_ar_series(df["deuda_total"], decimals=2)
     df["Costo mensual"]    = _to_number_ar_series(df[M_COSTO], decimals=2)
 
-    df["Q periodos deudores"] = df.apply(
-        lambda r: round(r["Deuda total"] / r["Costo mensual"], 2)
-        if pd.notna(r["Costo mensual"]) and r["Costo mensual"] else None,
-        axis=1,
-    )
+    df["Q periodos deudores"] = _q_periodos(df["Deuda total"], df["Costo mensual"])
     df.loc[(df["Costo mensual"].isna()) | (df["Costo mensual"].eq(0)), ["Costo mensual", "Q periodos deudores"]] = pd.NA
 
-    df["Estado contrato"] = df[M_CUENTA_PERDIDA].apply(
-        lambda x: "Vigente" if (pd.isna(x) or str(x).strip().casefold() in {"", "vigente"}) else x
-    )
-
-    df["Premier"] = df[M_REFERIDO_POR].apply(
-        lambda x: "Premier" if str(x).strip().upper() == "PREMIER" else "No es Premier"
-    )
+    df["Estado contrato"] = _estado_contrato(df[M_CUENTA_PERDIDA])
+    df["Premier"] = _premier(df[M_REFERIDO_POR])
 
     df["Email del trato"]  = df[M_EMAIL]
     df["No contactar"]     = df[M_NO_CONTACTAR]
@@ -336,30 +548,12 @@ def df_consolidado(periodo: str) -> pd.DataFrame:
 # ------------------------------------------------------------------#
 # Hoja «No cruzan»
 # ------------------------------------------------------------------#
-def df_no_cruzan(periodo: str, cuits_duplicados: Set[str]) -> pd.DataFrame:
-    mapeo = _leer_mapeo_aseguradoras(MAPEO_ASEG_PATH)
-    deudas = _cargar_deudas(periodo, mapeo)
-
-    maestro = _cargar_maestro_raw(MAESTRO_PATH)
-    cp = maestro[M_CUENTA_PERDIDA].astype(str).str.strip().str.casefold()
-    is_vigente = maestro[M_CUENTA_PERDIDA].isna() | cp.isin({"", "vigente"})
-    maestro["Vigente"] = is_vigente
-
-    maestro["_ASEG_n"] = _norm_aseg_str(maestro[M_ASEGURADORA])
-    deudas["_ASEG_ORIGEN_n"] = _norm_aseg_str(deudas["aseguradora_origen"])
-
-    maestro_sorted = maestro.sort_values([M_CUIT, "_ASEG_n", "Vigente"], ascending=[True, True, False])
-    maestro_compacto = maestro_sorted.drop_duplicates([M_CUIT, "_ASEG_n"], keep="first")
-
-    merged = deudas.merge(
-        maestro_compacto,
-        how="left",
-        left_on=["cuit", "_ASEG_ORIGEN_n"],
-        right_on=[M_CUIT, "_ASEG_n"],
-        suffixes=("", "_m"),
-    )
+def df_no_cruzan(periodo: str, cuits_duplicados: Set[str], ctx: Optional[ConsolidacionContext] = None) -> pd.DataFrame:
+    ctx = ctx or ConsolidacionContext.cargar(periodo)
+    return ctx.no_cruzan
 
-    df_nc = merged[merged["_ASEG_n"].isna()].copy()
+def _armar_no_cruzan(cruce: pd.DataFrame, periodo: str) -> pd.DataFrame:
+    df_nc = cruce[cruce["_ASEG_n"].isna()].copy()
 
     df_nc["Periodo"]             = _norm_periodo(periodo)
     df_nc["Razón social"]        = pd.NA
@@ -457,8 +651,9 @@ def df_deuda_promecor(base: pd.DataFrame) -> pd.DataFrame:
 # ------------------------------------------------------------------#
 # «Agregar costo mensual»
 # ------------------------------------------------------------------#
-def df_agregar_costo_mensual(base: pd.DataFrame) -> pd.DataFrame:
-    maestro = _cargar_maestro_raw(MAESTRO_PATH)
+def df_agregar_costo_mensual(base: pd.DataFrame, maestro: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    if maestro is None:
+        maestro = _cargar_maestro_raw(MAESTRO_PATH)
     maestro_cap = maestro[[M_CUIT, M_CAPITAS]].rename(columns={M_CUIT: "CUIT"})
 
     aux = base.merge(maestro_cap, on="CUIT", how="left")
@@ -477,114 +672,179 @@ def df_agregar_costo_mensual(base: pd.DataFrame) -> pd.DataFrame:
 # ------------------------------------------------------------------#
 # Exportador genérico
 # ------------------------------------------------------------------#
+MONEY_FMT = '"$ " #,##0.00'
+Q_FMT     = "0.00"
+CUIT_FMT  = "00000000000"
+INT_FMT   = "0"
+
+# Columnas que se exportan como número (con su formato de celda)
+_COLS_NUMERICAS: Dict[str, str] = {
+    "Deuda total": MONEY_FMT, "Costo mensual": MONEY_FMT,
+    "Q periodos deudores": Q_FMT, "Contrato": INT_FMT, "Capitas": INT_FMT,
+}
+
+_ANCHOS: Dict[str, int] = {
+    "Periodo": 10, "Razón social": 35, "CUIT": 14, "Contrato": 14, "Aseguradora": 18,
+    "Deuda total": 16, "Costo mensual": 16, "Q periodos deudores": 14, "Estado contrato": 18,
+    "Email del trato": 34, "No contactar": 12, "Productor": 14, "Premier": 14,
+    "Cliente importante": 16, "Capitas": 14,
+}
+
+# A partir de cuántas filas (en la hoja más grande) se escribe en modo constant_memory
+EXPORT_CONSTANT_MEMORY_FILAS: int = int(getattr(settings, "ART_EXPORT_CONSTANT_MEMORY_FILAS", 50_000))
+
+
+def _cuit_celda(v):
+    """CUIT como entero (sin perder ceros a la izquierda: los muestra CUIT_FMT); si no es numérico, tal cual."""
+    txt = str(v).strip()
+    if txt in ("", "None", "nan", "<NA>"):
+        return None
+    try:
+        return int(txt)
+    except ValueError:
+        return v
+
+
+def _valores_celda(serie: pd.Series, nombre: str) -> list:
+    """
+    Columna → lista de valores listos para xlsxwriter (None = celda vacía).
+    Mismas conversiones que hacía `DataFrame.to_excel` + el retoque de CUIT.
+    """
+    if nombre == "CUIT":
+        codigos, unicos = pd.factorize(serie, sort=False)
+        mapeados = [_cuit_celda(v) for v in unicos] + [None]   # código -1 = NaN
+        return [mapeados[c] for c in codigos]
+
+    if nombre in _COLS_NUMERICAS:
+        serie = pd.to_numeric(serie, errors="coerce")
+
+    if pd.api.types.is_float_dtype(serie):
+        arr = serie.to_numpy(dtype="float64")
+        out = serie.astype(object).where(np.isfinite(arr), None)
+        inf = np.isinf(arr)
+        if inf.any():
+            out[inf] = np.where(arr[inf] > 0, "inf", "-inf")
+        return out.tolist()
+    if pd.api.types.is_integer_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return serie.astype(object).where(serie.notna(), None).tolist()
+
+    def _conv(v):
+        if v is None or v is pd.NA or v is pd.NaT or (isinstance(v, float) and v != v):
+            return None
+        if isinstance(v, (str, int, float, bool)):
+            return v
+        if isinstance(v, np.generic):
+            return v.item()
+        if isinstance(v, (pd.Timestamp, date)):
+            return v
+        return str(v)
+    return [_conv(v) for v in serie.tolist()]
+
+
 def _exportar_excel(hojas: Dict[str, pd.DataFrame], destino: Path | BytesIO) -> None:
+    """
+    Escribe todas las hojas con xlsxwriter en UNA pasada: tabla con estilo, anchos,
+    formatos de número por celda y CUIT como entero. Sin recargar el libro con openpyxl.
+    Con hojas grandes usa `constant_memory` (escritura fila por fila, a disco).
+    """
     import xlsxwriter
-    from openpyxl import load_workbook
 
-    MONEY_FMT = '"$ " #,##0.00'
-    Q_FMT     = '0.00'
-    CUIT_FMT  = "00000000000"
-    INT_FMT   = "0"
+    grande = max((len(df) for df in hojas.values()), default=0) >= EXPORT_CONSTANT_MEMORY_FILAS
+    wb = xlsxwriter.Workbook(destino, {"constant_memory": grande})
+    try:
+        fmt_celda = {fmt: wb.add_format({"num_format": fmt}) for fmt in (MONEY_FMT, Q_FMT, INT_FMT, CUIT_FMT)}
+        fmt_tabla = {
+            "cuit":    wb.add_format({"num_format": "0"}),
+            MONEY_FMT: wb.add_format({"num_format": MONEY_FMT, "align": "right"}),
+            Q_FMT:     wb.add_format({"num_format": Q_FMT, "align": "right"}),
+            INT_FMT:   wb.add_format({"num_format": INT_FMT, "align": "right"}),
+        }
+        fmt_fecha = wb.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+        fmt_encabezado = wb.add_format({"bold": True, "font_color": "#FFFFFF", "bg_color": "#4472C4"})
 
-    tmp = BytesIO()
-    with pd.ExcelWriter(tmp, engine="xlsxwriter") as writer:
         for nombre, df in hojas.items():
-            safe = df.copy()
-
-            for c in ["Deuda total", "Costo mensual", "Q periodos deudores", "Contrato", "Capitas"]:
-                if c in safe.columns:
-                    safe[c] = pd.to_numeric(safe[c], errors="coerce")
+            ws = wb.add_worksheet(nombre)
+            columnas = [str(c) for c in df.columns]
 
-            safe.to_excel(writer, sheet_name=nombre, index=False)
-            wb, ws = writer.book, writer.sheets[nombre]
-
-            fmt_cuit  = wb.add_format({"num_format": "0"})
-            fmt_money = wb.add_format({"num_format": MONEY_FMT, "align": "right"})
-            fmt_q     = wb.add_format({"num_format": Q_FMT, "align": "right"})
-            fmt_int   = wb.add_format({"num_format": INT_FMT, "align": "right"})
-
-            cols_meta = []
-            for col in safe.columns:
+            cols_meta, formatos = [], []
+            for col in columnas:
                 if col.upper().startswith("CUIT"):
-                    cols_meta.append({"header": col, "format": fmt_cuit})
-                elif col in ("Deuda total", "Costo mensual"):
-                    cols_meta.append({"header": col, "format": fmt_money})
-                elif col == "Q periodos deudores":
-                    cols_meta.append({"header": col, "format": fmt_q})
-                elif col in ("Contrato", "Capitas"):
-                    cols_meta.append({"header": col, "format": fmt_int})
+                    cols_meta.append({"header": col, "format": fmt_tabla["cuit"]})
+                elif col in _COLS_NUMERICAS:
+                    cols_meta.append({"header": col, "format": fmt_tabla[_COLS_NUMERICAS[col]]})
                 else:
                     cols_meta.append({"header": col})
-
-            r, c = safe.shape
-            ws.add_table(0, 0, max(r, 1), max(c - 1, 0), {"style": "Table Style Medium 2", "columns": cols_meta})
-
-            ancho = {
-                "Periodo": 10, "Razón social": 35, "CUIT": 14, "Contrato": 14, "Aseguradora": 18,
-                "Deuda total": 16, "Costo mensual": 16, "Q periodos deudores": 14, "Estado contrato": 18,
-                "Email del trato": 34, "No contactar": 12, "Productor": 14, "Premier": 14,
-                "Cliente importante": 16, "Capitas": 14,
-            }
-            for i, col in enumerate(safe.columns):
-                ws.set_column(i, i, ancho.get(col, 12))
+                if col == "CUIT":
+                    formatos.append(fmt_celda[CUIT_FMT])
+                elif col in _COLS_NUMERICAS:
+                    formatos.append(fmt_celda[_COLS_NUMERICAS[col]])
+                else:
+                    formatos.append(None)
+
+            # Encabezados y configuración: antes de las filas, que en constant_memory deben ir
+            # en orden. xlsxwriter no admite tablas en ese modo → autofiltro + encabezado con
+            # los colores de "Table Style Medium 2".
+            r, c = df.shape
+            if grande:
+                ws.write_row(0, 0, columnas, fmt_encabezado)
+                ws.autofilter(0, 0, max(r, 1), max(c - 1, 0))
+            else:
+                ws.add_table(0, 0, max(r, 1), max(c - 1, 0), {"style": "Table Style Medium 2", "columns": cols_meta})
+            for i, col in enumerate(columnas):
+                ws.set_column(i, i, _ANCHOS.get(col, 12))
             ws.freeze_panes(1, 0)
             ws.set_zoom(80)
 
-    tmp.seek(0)
-    wb2 = load_workbook(tmp)
-
-    def _set_col_format(ws, header_name: str, fmt: str, transform=None):
-        headers = [cell.value for cell in ws[1]]
-        if header_name in headers:
-            j = headers.index(header_name) + 1
-            col_letter = ws.cell(row=1, column=j).column_letter
-            for cell in ws[col_letter][1:]:
-                if transform:
-                    try:
-                        cell.value = transform(cell.value)
-                    except Exception:
-                        pass
-                cell.number_format = fmt
-
-    for nombre, df in hojas.items():
-        ws2 = wb2[nombre]
-        _set_col_format(ws2, "CUIT", CUIT_FMT, transform=lambda v: int(str(v).strip()) if str(v).strip() not in ("", "None", "nan") else None)
-        _set_col_format(ws2, "Deuda total", MONEY_FMT)
-        _set_col_format(ws2, "Costo mensual", MONEY_FMT)
-        _set_col_format(ws2, "Q periodos deudores", Q_FMT)
-        _set_col_format(ws2, "Contrato", INT_FMT)
-        _set_col_format(ws2, "Capitas", INT_FMT)
+            valores = [_valores_celda(df.iloc[:, j], columnas[j]) for j in range(c)]
+            for fila, celdas in enumerate(zip(*valores), start=1):
+                for j, v in enumerate(celdas):
+                    fmt = formatos[j]
+                    if v is None:
+                        if fmt is not None:
+                            ws.write_blank(fila, j, None, fmt)
+                    elif isinstance(v, (pd.Timestamp, date)):
+                        ws.write_datetime(fila, j, v, fmt or fmt_fecha)
+                    else:
+                        ws.write(fila, j, v, fmt)
+    finally:
+        wb.close()
 
     if isinstance(destino, BytesIO):
         destino.seek(0)
-        wb2.save(destino)
-        destino.seek(0)
-    else:
-        wb2.save(destino)
 
 
 # ------------------------------------------------------------------#
 # API pública
 # ------------------------------------------------------------------#
-def generar_xlsx(periodo: str) -> BytesIO:
-    base = df_consolidado(periodo)
-    cuits_dup = base.attrs.get("cuits_ambig", set())
-
-    hojas: Dict[str, pd.DataFrame] = {
-        "Consolidado":           _ensure_columns(base, COLUMNS_ORDER),
-        "No cruzan":             _ensure_columns(df_no_cruzan(periodo, cuits_dup), COLUMNS_ORDER),
-        "Sin mail":              _ensure_columns(df_sin_mail(base), COLUMNS_ORDER),
-        "Anuladas":              _ensure_columns(df_anuladas(base), COLUMNS_ORDER),
-        "No contactar":          _ensure_columns(df_no_contactar(base), COLUMNS_ORDER),
-        "Clientes importantes":  _ensure_columns(df_clientes_importantes(base), COLUMNS_ORDER),
-        "1 Q.deudor":            _ensure_columns(df_un_q_deudor(base), COLUMNS_ORDER),
-        "Premier":               _ensure_columns(df_premier(base), COLUMNS_ORDER),
-        "Productor":             _ensure_columns(df_productor(base), COLUMNS_ORDER),
-        "Deuda Promecor":        _ensure_columns(df_deuda_promecor(base), COLUMNS_ORDER),
-        "Agregar costo mensual": df_agregar_costo_mensual(base),
-    }
+@dataclass
+class ConsolidadoGenerado:
+    """
+    Resultado de una corrida: el libro ya escrito y las hojas con las que se escribió.
+    La persistencia usa `hojas` directo (con sus tipos) en lugar de volver a leer el XLSX.
+    """
+    xlsx: BytesIO
+    hojas: Dict[str, pd.DataFrame] = field(repr=False)
+
+
+def generar_consolidado(periodo: str, ctx: Optional[ConsolidacionContext] = None) -> ConsolidadoGenerado:
+    """
+    Genera el XLSX completo del período y devuelve también sus hojas en memoria.
+    Lee maestro, mapeo y deudas UNA vez (vía ConsolidacionContext); se puede pasar
+    un contexto ya cargado.
+    """
+    ctx = ctx or ConsolidacionContext.cargar(periodo)
+    with etapa("hojas") as e:
+        hojas = ctx.hojas()
+        e.filas = sum(len(df) for df in hojas.values())
 
     buf = BytesIO()
-    _exportar_excel(hojas, buf)
+    with etapa("exportar") as e:
+        _exportar_excel(hojas, buf)
+        e.filas = sum(len(df) for df in hojas.values())
     buf.seek(0)
-    return buf
+    return ConsolidadoGenerado(xlsx=buf, hojas=hojas)
+
+
+def generar_xlsx(periodo: str, ctx: Optional[ConsolidacionContext] = None) -> BytesIO:
+    """Solo el XLSX del período (ver `generar_consolidado`)."""
+    return generar_consolidado(periodo, ctx=ctx).xlsx
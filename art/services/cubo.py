@@ -0,0 +1,103 @@
+# art/services/cubo.py
+"""
+Cubo de la pantalla de Análisis (ArtDashboardCubo).
+---------------------------------------------------
+Una fila por período × aseguradora × productor × banda de Q con contratos, deuda y suma de Q.
+La pantalla de Análisis (art/views/analisis.py) lee solo de acá, así que su costo depende de
+cuántas combinaciones hay, no de cuántos contratos.
+
+Bandas (las de los gráficos de Análisis, no las de `bucket_q` del tablero):
+    '0'   Q vacío o < 1 (sin deuda; entra en el cubo pero no en los gráficos)
+    '1'   1 ≤ Q < 2      '2'  2 ≤ Q < 3      '3'  3 ≤ Q < 4
+    '4-5' 4 ≤ Q < 6      '6+' Q ≥ 6
+Deuda = bandas ≠ '0' (Q ≥ 1); Riesgo = '3', '4-5', '6+' (Q ≥ 3).
+
+`refrescar()` rearma solo los meses (y la aseguradora/productor) que se tocaron: lo llaman
+volcar_dashboard_art e importar_dashboard_art al terminar. Todo el cubo de una vez:
+`python manage.py refrescar_cubo_art`. Cada refresco invalida la caché de Análisis
+(art/services/cache_analisis.py) al confirmarse la transacción.
+"""
+from __future__ import annotations
+
+import operator
+from datetime import date
+from functools import reduce
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Case, CharField, Count, Q, Sum, Value, When
+
+from art.models import ArtDashboardContratoPeriodo, ArtDashboardCubo
+from art.services import cache_analisis
+
+
+# (Q desde, banda), de la más alta a la más baja; debajo de 1 es BANDA_SIN_DEUDA
+LIMITES_BANDA = [(6, "6+"), (4, "4-5"), (3, "3"), (2, "2"), (1, "1")]
+
+
+def banda_q():
+    """Expresión SQL de la banda de Q (ver docstring del módulo)."""
+    return Case(
+        *[When(q_periodos_deudores__gte=desde, then=Value(banda)) for desde, banda in LIMITES_BANDA],
+        default=Value(ArtDashboardCubo.BANDA_SIN_DEUDA),
+        output_field=CharField(),
+    )
+
+
+def _mes_siguiente(p: date) -> date:
+    return date(p.year + p.month // 12, p.month % 12 + 1, 1)
+
+
+def _alcance(periodos: Optional[Iterable[date]], aseguradora: Optional[str], productor: Optional[str]) -> Optional[Q]:
+    """Filtro común al tablero y al cubo; None si no hay meses que tocar."""
+    filtro = Q()
+    if periodos is not None:
+        meses = sorted({date(p.year, p.month, 1) for p in periodos})
+        if not meses:
+            return None
+        filtro &= reduce(operator.or_, [Q(periodo__gte=m, periodo__lt=_mes_siguiente(m)) for m in meses])
+    if aseguradora:
+        filtro &= Q(aseguradora__iexact=aseguradora)
+    if productor:
+        filtro &= Q(productor__iexact=productor)
+    return filtro
+
+
+def refrescar(
+    periodos: Optional[Iterable[date]] = None,
+    aseguradora: Optional[str] = None,
+    productor: Optional[str] = None,
+) -> int:
+    """
+    Rearma las filas del cubo de esos meses (todos si `periodos` es None), opcionalmente solo
+    de una aseguradora/productor (mismo criterio iexact que el reset de volcar_dashboard_art).
+    Devuelve cuántas filas quedaron en el alcance.
+    """
+    filtro = _alcance(periodos, aseguradora, productor)
+    if filtro is None:
+        return 0
+
+    with transaction.atomic():
+        filas = (
+            ArtDashboardContratoPeriodo.objects.filter(filtro)
+            .annotate(banda=banda_q())
+            .values("periodo", "aseguradora", "productor", "banda")
+            .annotate(contratos=Count("id"), deuda=Sum("deuda_total"), suma_q=Sum("q_periodos_deudores"))
+            .order_by()
+        )
+        nuevas = [
+            ArtDashboardCubo(
+                periodo=r["periodo"],
+                aseguradora=r["aseguradora"],
+                productor=r["productor"],
+                banda_q=r["banda"],
+                contratos=r["contratos"],
+                deuda=r["deuda"] or 0,
+                suma_q=r["suma_q"] or 0,
+            )
+            for r in filas
+        ]
+        ArtDashboardCubo.objects.filter(filtro).delete()
+        ArtDashboardCubo.objects.bulk_create(nuevas, batch_size=2000)
+        cache_analisis.invalidar()
+    return len(nuevas)
@@ -3,6 +3,7 @@
 Lee un Consolidado_ART_MM-AAAA[...].xlsx desde el histórico y devuelve
 la info agrupada por Email del trato para una hoja dada (p.ej. "Deuda Promecor" o "Productor").
 Incluye:
+- Histórico Parquet primero (art/services/historico.py): sin parsear el XLSX.
 - Búsqueda robusta del archivo (con o sin timestamp en el nombre).
 - Soporte de periodo "MM/AAAA" o "MM-AAAA".
 - Conversión segura de 'Q periodos deudores' a numérico.
@@ -13,6 +14,9 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import pandas as pd
 
+from art.services import historico
+from core.lectura_excel import read_excel_fast
+
 # Ruta raíz donde viven los excels históricos
 HISTORICO_DIR = Path(r"C:\Users\Promecor\Documents\ART\Deuda ART Historico")
 
@@ -70,7 +74,7 @@ def cargar_consolidado(
     periodo: str,
     hoja: str,
     umbral_intimado: float = 3.0,
-    engine: Optional[str] = "openpyxl",
+    engine: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Lee la hoja pedida y agrupa por 'Email del trato'.
@@ -79,7 +83,7 @@ def cargar_consolidado(
         periodo           -> "07/2025" o "07-2025"
         hoja              -> "Deuda Promecor" o "Productor" (u otra hoja válida)
         umbral_intimado   -> valor de Q desde el cual se marca 'intimado' (default 3.0)
-        engine            -> engine de pandas para leer excel (default 'openpyxl')
+        engine            -> motor de lectura (default: settings.ART_EXCEL_ENGINE; ver core/lectura_excel.py)
 
     Returns:
         [
@@ -91,19 +95,28 @@ def cargar_consolidado(
           ...
         ]
     """
-    # 1) Periodo → nombre de archivo robusto
+    # 1) Periodo → histórico Parquet; si no está, nombre de archivo robusto
     mm, yyyy = _normalizar_periodo(periodo)
-    archivo = _buscar_consolidado(mm, yyyy)
-
-    # 2) Leer hoja
     try:
-        df = pd.read_excel(archivo, sheet_name=hoja, engine=engine)
-    except ValueError as e:
-        # pandas lanza ValueError si la hoja no existe
-        raise ValueError(f"No se pudo leer la hoja '{hoja}' en '{archivo.name}': {e}")
+        archivo: Optional[Path] = _buscar_consolidado(mm, yyyy)
+    except FileNotFoundError:
+        archivo = None
+    if historico.tiene(f"{mm}-{yyyy}", hoja, xlsx=archivo):
+        df = historico.leer_hoja(f"{mm}-{yyyy}", hoja)
+        origen = f"histórico {mm}-{yyyy}"
+    else:
+        archivo = archivo or _buscar_consolidado(mm, yyyy)   # sin Parquet ni XLSX → FileNotFoundError
+        origen = archivo.name
+
+        # 2) Leer hoja
+        try:
+            df = read_excel_fast(archivo, sheet_name=hoja, engine=engine)
+        except ValueError as e:
+            # pandas lanza ValueError si la hoja no existe
+            raise ValueError(f"No se pudo leer la hoja '{hoja}' en '{archivo.name}': {e}")
 
     if df.empty:
-        raise ValueError(f"La hoja '{hoja}' en '{archivo.name}' está vacía.")
+        raise ValueError(f"La hoja '{hoja}' en '{origen}' está vacía.")
 
     # 3) Validar columnas mínimas
     _validar_columnas(df)
@@ -0,0 +1,328 @@
+# art/services/historico.py
+"""
+Histórico columnar de consolidados: un Parquet por período y hoja + un manifiesto.
+----------------------------------------------------------------------------------
+• Cada consolidado generado (art/services/pipeline_consolidado.py) se guarda también acá;
+  los períodos viejos se importan desde los Consolidado_ART_<MM-AAAA>.xlsx del histórico
+  con `python manage.py historico_art --importar`.
+• Estructura (particionado estilo Hive):
+
+      <ART_HISTORICO_PARQUET_DIR>/periodo=2025-06/hoja=productor/part.parquet
+      <ART_HISTORICO_PARQUET_DIR>/manifiesto.json
+
+  El manifiesto es el índice: {"periodos": {"2025-06": {"hojas": {"Productor": {"archivo",
+  "filas", "columnas", "columnas_texto"}}, "origen", "actualizado"}}}. Un período sin entrada
+  en el manifiesto no existe para los lectores (se escribe primero el Parquet, después el índice).
+• Los valores son los que devolvería `read_excel(xlsx, sheet_name=hoja)` sobre el XLSX exportado
+  (mismas celdas, mismo parser de pandas), así que los lectores pueden cambiar de XLSX a Parquet
+  sin notar diferencias. Con `como_texto=True` se emula `dtype=str` (enteros sin ".0"); la
+  única diferencia es que las columnas de texto "true"/"false" vuelven como "True"/"False".
+  Columnas con tipos mezclados que Arrow no admite se guardan como texto (`columnas_texto`).
+• Si el lector conoce el XLSX del período y éste es más nuevo que el Parquet (o el período
+  todavía no está), el XLSX se importa en ese momento (ver `info_hoja`).
+• Lectura con poda de columnas y de filas (filtros de pyarrow sobre las estadísticas del Parquet):
+
+      leer_hoja("06-2025", "Productor", columnas=["Contrato", "Productor"])
+      leer_historico("Consolidado", columnas=["Periodo", "Deuda total"], filtros=[("CUIT", "==", 30712345678)])
+
+Requiere pyarrow; sin él `disponible()` es False y los lectores siguen con el XLSX.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import json
+import logging
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from pandas.io.parsers import TextParser
+
+from art.services.consolidar import _slug, _valores_celda
+from core.lectura_excel import read_excel_fast
+
+log = logging.getLogger(__name__)
+
+FORMATO_VERSION = 1
+
+HISTORICO_DIR: Path = Path(getattr(
+    settings, "ART_HISTORICO_PARQUET_DIR",
+    Path(getattr(settings, "BASE_DIR", Path.cwd())) / "data" / "art_historico",
+))
+HISTORICO_HABILITADO: bool = bool(getattr(settings, "ART_HISTORICO_PARQUET", True))
+
+MANIFIESTO = "manifiesto.json"
+
+
+# --------------------------
+# Helpers
+# --------------------------
+def disponible() -> bool:
+    if not HISTORICO_HABILITADO:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def clave_periodo(periodo: str) -> str:
+    """'06-2025' | '06/2025' | '6-2025' | '2025-06' → '2025-06' (orden cronológico)."""
+    a, b = re.split(r"[-/]", str(periodo).strip())
+    yyyy, mm = (a, b) if len(a) == 4 else (b, a)
+    if len(yyyy) != 4 or not (yyyy.isdigit() and mm.isdigit()) or not 1 <= int(mm) <= 12:
+        raise ValueError(f"Periodo inválido: {periodo!r}")
+    return f"{yyyy}-{int(mm):02d}"
+
+
+def _slug_hoja(hoja: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "_", _slug(hoja)).strip("_") or "hoja"
+
+
+def _escribir_atomico(destino: Path, contenido: str) -> None:
+    tmp = destino.with_name(f".{destino.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(contenido, encoding="utf-8")
+        os.replace(tmp, destino)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def manifiesto() -> Dict:
+    ruta = HISTORICO_DIR / MANIFIESTO
+    try:
+        datos = json.loads(ruta.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": FORMATO_VERSION, "periodos": {}}
+    datos.setdefault("periodos", {})
+    return datos
+
+
+def periodos() -> List[str]:
+    """Períodos guardados ('AAAA-MM'), del más viejo al más nuevo."""
+    return sorted(manifiesto()["periodos"])
+
+
+def info_hoja(periodo: str, hoja: str, xlsx: Optional[Path] = None) -> Optional[Dict]:
+    """
+    Entrada del manifiesto para (período, hoja), o None si no está guardada.
+    Con `xlsx` (el Consolidado del período en el histórico de Excel): si el período no está
+    guardado, o ese archivo se modificó después que el Parquet (p. ej. se corrigió a mano),
+    se (re)importa primero; así el Parquet nunca queda más viejo que el XLSX.
+    """
+    if not disponible():
+        return None
+    try:
+        clave = clave_periodo(periodo)
+    except ValueError:
+        return None
+    info = manifiesto()["periodos"].get(clave, {}).get("hojas", {}).get(hoja)
+    try:
+        vigente = info is not None and (
+            xlsx is None or not Path(xlsx).exists()
+            or Path(xlsx).stat().st_mtime <= (HISTORICO_DIR / info["archivo"]).stat().st_mtime
+        )
+    except OSError:
+        vigente = False
+    if vigente:
+        return info
+    if xlsx is None or not Path(xlsx).exists():
+        return None
+    try:
+        entrada = importar_xlsx(Path(xlsx), clave)
+    except Exception:
+        log.exception("Histórico Parquet %s: no pude importar %s", clave, xlsx)
+        return None
+    return (entrada or {}).get("hojas", {}).get(hoja)
+
+
+def tiene(periodo: str, hoja: str, xlsx: Optional[Path] = None) -> bool:
+    return info_hoja(periodo, hoja, xlsx=xlsx) is not None
+
+
+# --------------------------
+# Escritura
+# --------------------------
+def _celda_excel(v):
+    """Valor de celda como lo entrega el motor de lectura: vacío → "", float entero → int."""
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def como_excel(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Hoja en memoria → el DataFrame que devolvería read_excel sobre el XLSX exportado:
+    mismas celdas que escribe `_exportar_excel` y el mismo TextParser que usa pandas.
+    """
+    columnas = [str(c) for c in df.columns]
+    celdas = [[_celda_excel(v) for v in _valores_celda(df.iloc[:, j], columnas[j])]
+              for j in range(len(columnas))]
+    return TextParser([columnas] + [list(f) for f in zip(*celdas)], header=0).read()
+
+
+def _tabla_arrow(df: pd.DataFrame):
+    """DataFrame → (pa.Table, columnas guardadas como texto por tener tipos mezclados)."""
+    import pyarrow as pa
+
+    columnas_texto: List[str] = []
+    arrays = []
+    for col in df.columns:
+        serie = df[col]
+        try:
+            arrays.append(pa.array(serie, from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            columnas_texto.append(str(col))
+            arrays.append(pa.array(serie.map(lambda v: v if _es_nulo(v) else str(v)), from_pandas=True))
+    return pa.Table.from_arrays(arrays, names=[str(c) for c in df.columns]), columnas_texto
+
+
+def _es_nulo(v) -> bool:
+    return v is None or (isinstance(v, float) and v != v)
+
+
+def _guardar_frames(periodo: str, frames: Dict[str, pd.DataFrame], origen: str) -> Dict:
+    import pyarrow.parquet as pq
+
+    clave = clave_periodo(periodo)
+    destino = HISTORICO_DIR / f"periodo={clave}"
+    tmp = HISTORICO_DIR / f".periodo={clave}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    hojas: Dict[str, Dict] = {}
+    try:
+        for hoja, df in frames.items():
+            slug = _slug_hoja(hoja)
+            tabla, columnas_texto = _tabla_arrow(df)
+            (tmp / f"hoja={slug}").mkdir(parents=True, exist_ok=True)
+            pq.write_table(tabla, tmp / f"hoja={slug}" / "part.parquet", compression="zstd")
+            hojas[hoja] = {
+                "archivo": f"periodo={clave}/hoja={slug}/part.parquet",
+                "filas": len(df),
+                "columnas": [str(c) for c in df.columns],
+                "columnas_texto": columnas_texto,
+            }
+        shutil.rmtree(destino, ignore_errors=True)
+        os.replace(tmp, destino)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    entrada = {"hojas": hojas, "origen": origen, "actualizado": datetime.now().isoformat(timespec="seconds")}
+    datos = manifiesto()
+    datos["version"] = FORMATO_VERSION
+    datos["periodos"][clave] = entrada
+    datos["periodos"] = dict(sorted(datos["periodos"].items()))
+    _escribir_atomico(HISTORICO_DIR / MANIFIESTO, json.dumps(datos, ensure_ascii=False, indent=1))
+    log.info("Histórico Parquet %s: %d hojas (%s)", clave, len(hojas), origen)
+    return entrada
+
+
+def guardar_periodo(periodo: str, hojas: Dict[str, pd.DataFrame], origen: str = "consolidar") -> Optional[Dict]:
+    """
+    Guarda las hojas EN MEMORIA de un consolidado (ConsolidadoGenerado.hojas) como Parquet,
+    reemplazando el período si ya estaba. Devuelve la entrada del manifiesto (None si no hay pyarrow).
+    """
+    if not disponible():
+        return None
+    HISTORICO_DIR.mkdir(parents=True, exist_ok=True)
+    return _guardar_frames(periodo, {h: como_excel(df) for h, df in hojas.items()}, origen)
+
+
+def importar_xlsx(ruta: Path, periodo: str) -> Optional[Dict]:
+    """Guarda un Consolidado_ART_<MM-AAAA>.xlsx ya existente (todas sus hojas) en el histórico."""
+    if not disponible():
+        return None
+    HISTORICO_DIR.mkdir(parents=True, exist_ok=True)
+    frames = read_excel_fast(ruta, sheet_name=None)
+    return _guardar_frames(periodo, frames, f"xlsx:{Path(ruta).name}")
+
+
+# --------------------------
+# Lectura
+# --------------------------
+def _a_texto(serie: pd.Series) -> pd.Series:
+    """Como read_excel(dtype=str): enteros sin '.0', nulos siguen siendo NaN."""
+    if pd.api.types.infer_dtype(serie, skipna=True) in ("string", "empty"):
+        return serie.astype(object)
+    if pd.api.types.is_float_dtype(serie):
+        out = serie.astype(object)
+        hay = serie.notna()
+        enteros = hay & (serie == np.floor(serie))
+        out[enteros] = serie[enteros].astype("int64").astype(str)
+        out[hay & ~enteros] = serie[hay & ~enteros].astype(str)
+        return out
+    if pd.api.types.is_integer_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return serie.astype(str).astype(object)
+
+    def conv(v):
+        if _es_nulo(v):
+            return np.nan
+        if isinstance(v, (float, np.floating)) and float(v).is_integer():
+            return str(int(v))
+        return v if isinstance(v, str) else str(v)
+    return serie.map(conv).astype(object)
+
+
+def _a_pandas(tabla) -> pd.DataFrame:
+    df = tabla.to_pandas()
+    # Arrow devuelve None donde read_excel daba NaN (texto / bool con vacíos): lo restauramos
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].where(df[c].notna(), np.nan)
+    return df
+
+
+def leer_hoja(
+    periodo: str,
+    hoja: str,
+    columnas: Optional[Iterable[str]] = None,
+    filtros: Optional[list] = None,
+    como_texto: bool = False,
+) -> pd.DataFrame:
+    """
+    Una hoja de un período. `columnas`: solo esas (las inexistentes se ignoran);
+    `filtros`: formato de pyarrow, p. ej. [("Aseguradora", "==", "Galeno")].
+    KeyError si el período/hoja no está en el histórico.
+    """
+    import pyarrow.parquet as pq
+
+    info = info_hoja(periodo, hoja)
+    if info is None:
+        raise KeyError(f"'{hoja}' de {periodo} no está en el histórico Parquet ({HISTORICO_DIR}).")
+    cols = None if columnas is None else [c for c in columnas if c in info["columnas"]]
+    df = _a_pandas(pq.read_table(HISTORICO_DIR / info["archivo"], columns=cols, filters=filtros))
+    if como_texto:
+        df = df.apply(_a_texto) if len(df) else df.astype(object)
+    return df
+
+
+def leer_historico(
+    hoja: str,
+    columnas: Optional[Iterable[str]] = None,
+    filtros: Optional[list] = None,
+    desde: Optional[str] = None,
+    hasta: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    La misma hoja de todos los períodos guardados (o entre `desde` y `hasta`, inclusive),
+    concatenada en orden cronológico. Los períodos sin esa hoja se saltean.
+    """
+    lo = clave_periodo(desde) if desde else None
+    hi = clave_periodo(hasta) if hasta else None
+    partes = []
+    for clave in periodos():
+        if (lo and clave < lo) or (hi and clave > hi) or not tiene(clave, hoja):
+            continue
+        partes.append(leer_hoja(clave, hoja, columnas=columnas, filtros=filtros))
+    if not partes:
+        return pd.DataFrame(columns=list(columnas or []))
+    return pd.concat(partes, ignore_index=True)
@@ -0,0 +1,297 @@
+# art/services/particiones.py
+"""
+Particionado mensual de art_consolidado_item en PostgreSQL (RANGE por `periodo`).
+---------------------------------------------------------------------------------
+• La tabla se convierte una vez con `python manage.py particionar_items_art --convertir`:
+  una partición por mes (art_consolidado_item_pAAAAMM) + una DEFAULT de resguardo.
+  PK física (id, periodo) y `periodo` NOT NULL (PostgreSQL exige la clave de partición en
+  PK/UNIQUE); índices y constraints conservan sus nombres, así que el estado de las
+  migraciones de Django no cambia.
+• Reemplazar un período (guardar_lote_y_items con reemplazar_periodo) ya no hace
+  DELETE + INSERT: arma el período en una tabla aparte (`ReemplazoPeriodo`) y al final
+  hace DETACH de la partición vieja, ATTACH de la nueva y DROP TABLE de la vieja, dentro
+  de la transacción del lote. Los lectores ven el período viejo o el nuevo, nunca uno a
+  medias, y no queda WAL de borrado ni tuplas muertas para autovacuum.
+• Sin PostgreSQL (SQLite) o con la tabla sin convertir, `particionado()` da False y la
+  persistencia sigue con DELETE + INSERT.
+
+Los límites de rango van como literales (fechas): el DDL no acepta parámetros en psycopg 3.
+Conversión, swap y secuencias (id IDENTITY y serial) están cubiertos por ParticionesPostgresTests
+(art/tests.py), que corre solo contra PostgreSQL.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, List
+import logging
+
+from django.db import connection, transaction
+
+from art.models import ConsolidadoItem, ConsolidadoLote
+
+log = logging.getLogger(__name__)
+
+TABLA = ConsolidadoItem._meta.db_table
+SIN_PARTICIONAR = f"{TABLA}_sin_particionar"
+DEFAULT = f"{TABLA}_default"
+
+
+def _qn(nombre: str) -> str:
+    return connection.ops.quote_name(nombre)
+
+
+def _mes_siguiente(periodo: date) -> date:
+    return date(periodo.year + periodo.month // 12, periodo.month % 12 + 1, 1)
+
+
+def _rango(periodo: date) -> str:
+    return f"FROM ('{periodo:%Y-%m-01}') TO ('{_mes_siguiente(periodo):%Y-%m-%d}')"
+
+
+def nombre_particion(periodo: date) -> str:
+    return f"{TABLA}_p{periodo:%Y%m}"
+
+
+def _disparar_diferidos() -> None:
+    """
+    Las FK de Django son DEFERRABLE INITIALLY DEFERRED: si la transacción ya escribió items,
+    quedan chequeos pendientes y PostgreSQL rechaza ALTER/DETACH/DROP sobre la tabla
+    ("pending trigger events"). Se disparan ahora y las FK vuelven a quedar diferidas.
+    """
+    connection.check_constraints()
+
+
+def _existe(tabla: str) -> bool:
+    with connection.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", [tabla])
+        return cur.fetchone()[0]
+
+
+def particionado() -> bool:
+    """True si la base es PostgreSQL y art_consolidado_item ya es una tabla particionada."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [TABLA])
+        return cur.fetchone() is not None
+
+
+def particiones() -> List[tuple]:
+    """[(nombre, límites, filas estimadas)] de las particiones actuales."""
+    with connection.cursor() as cur:
+        cur.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            ORDER BY c.relname
+            """,
+            [TABLA],
+        )
+        return cur.fetchall()
+
+
+def _sacar_de_default(cur, periodo: date) -> str:
+    """
+    Si la DEFAULT tiene filas del mes, las pasa a una tabla temporal (si no, crear/adjuntar
+    la partición del mes falla). Devuelve el nombre de esa tabla o "" si no había filas.
+    """
+    if not _existe(DEFAULT):
+        return ""
+    desde, hasta = periodo.replace(day=1), _mes_siguiente(periodo)
+    cur.execute(f"SELECT EXISTS (SELECT 1 FROM {_qn(DEFAULT)} WHERE periodo >= %s AND periodo < %s)",
+                [desde, hasta])
+    if not cur.fetchone()[0]:
+        return ""
+    tmp = f"_art_item_default_{periodo:%Y%m}"
+    cur.execute(f"CREATE TEMP TABLE {_qn(tmp)} ON COMMIT DROP AS "
+                f"SELECT * FROM {_qn(DEFAULT)} WHERE periodo >= %s AND periodo < %s", [desde, hasta])
+    cur.execute(f"DELETE FROM {_qn(DEFAULT)} WHERE periodo >= %s AND periodo < %s", [desde, hasta])
+    return tmp
+
+
+def asegurar_particion(periodo: date) -> None:
+    """Crea la partición del mes si falta (para los INSERT que no reemplazan el período)."""
+    nombre = nombre_particion(periodo)
+    if _existe(nombre):
+        return
+    with transaction.atomic(), connection.cursor() as cur:
+        _disparar_diferidos()
+        movidas = _sacar_de_default(cur, periodo)
+        cur.execute(f"CREATE TABLE {_qn(nombre)} PARTITION OF {_qn(TABLA)} FOR VALUES {_rango(periodo)}")
+        if movidas:
+            cur.execute(f"INSERT INTO {_qn(TABLA)} SELECT * FROM {_qn(movidas)}")
+    log.info("Partición %s creada", nombre)
+
+
+def eliminar_periodo(periodo: date) -> bool:
+    """Borra los items de un período con DROP TABLE de su partición. False si no existía."""
+    nombre = nombre_particion(periodo)
+    if not _existe(nombre):
+        return False
+    with transaction.atomic(), connection.cursor() as cur:
+        _disparar_diferidos()
+        cur.execute(f"ALTER TABLE {_qn(TABLA)} DETACH PARTITION {_qn(nombre)}")
+        cur.execute(f"DROP TABLE {_qn(nombre)}")
+    log.info("Partición %s eliminada", nombre)
+    return True
+
+
+class ReemplazoPeriodo:
+    """
+    Período nuevo armado aparte y cambiado de una vez. Debe usarse dentro de la transacción
+    del lote (los DDL de PostgreSQL son transaccionales: si algo falla, no cambia nada).
+
+        reemplazo = ReemplazoPeriodo(periodo, lote)
+        reemplazo.copiar_vigentes(previo, aseguradoras_cambiadas)   # incremental (opcional)
+        cargar_items(lote, bloques, tabla=reemplazo.tabla)          # COPY a la tabla nueva
+        reemplazo.intercambiar()
+    """
+
+    def __init__(self, periodo: date, lote):
+        self.periodo = periodo
+        self.lote = lote
+        self.tabla = f"{nombre_particion(periodo)}_l{lote.id}"
+        with connection.cursor() as cur:
+            # Sin índices ni constraints: se crean (o se adjuntan) recién en el ATTACH, ya con datos
+            cur.execute(f"CREATE TABLE {_qn(self.tabla)} (LIKE {_qn(TABLA)} INCLUDING DEFAULTS)")
+            # El id lo sigue dando la secuencia de la tabla madre (INSERT directo a la partición)
+            cur.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLA])
+            secuencia = cur.fetchone()[0]
+            cur.execute(f"ALTER TABLE {_qn(self.tabla)} ALTER COLUMN id SET DEFAULT nextval('{secuencia}'::regclass)")
+
+    def copiar_vigentes(self, previo, excluir_aseguradoras: Iterable[str]) -> int:
+        """
+        Incremental: copia al período nuevo las filas del lote `previo` cuya aseguradora no
+        cambió (con su id, reasignadas al lote nuevo). Devuelve cuántas copió.
+        """
+        meta = ConsolidadoItem._meta
+        columnas = [f.column for f in meta.concrete_fields if f.column not in ("id", "lote_id")]
+        lista = ", ".join(_qn(c) for c in columnas)
+        with connection.cursor() as cur:
+            cur.execute(
+                f"INSERT INTO {_qn(self.tabla)} (id, lote_id, {lista}) "
+                f"SELECT id, %s, {lista} FROM {_qn(TABLA)} "
+                f"WHERE periodo = %s AND lote_id = %s AND NOT (aseguradora = ANY(%s))",
+                [self.lote.id, self.periodo, previo.id, list(excluir_aseguradoras)],
+            )
+            return cur.rowcount
+
+    def intercambiar(self) -> None:
+        """DETACH + DROP de la partición vigente del mes y ATTACH de la tabla nueva en su lugar."""
+        nombre = nombre_particion(self.periodo)
+        restriccion = f"{self.tabla}_rango"
+        _disparar_diferidos()
+        with connection.cursor() as cur:
+            cur.execute(f"ALTER TABLE {_qn(self.tabla)} ALTER COLUMN id DROP DEFAULT")
+            # Con el CHECK equivalente al rango, el ATTACH no vuelve a recorrer la tabla
+            cur.execute(
+                f"ALTER TABLE {_qn(self.tabla)} ADD CONSTRAINT {_qn(restriccion)} "
+                f"CHECK (periodo IS NOT NULL AND periodo >= '{self.periodo:%Y-%m-01}' "
+                f"AND periodo < '{_mes_siguiente(self.periodo):%Y-%m-%d}')"
+            )
+            if _existe(nombre):
+                cur.execute(f"ALTER TABLE {_qn(TABLA)} DETACH PARTITION {_qn(nombre)}")
+                cur.execute(f"DROP TABLE {_qn(nombre)}")
+            elif _existe(DEFAULT):
+                # El período se reemplaza entero: lo que haya caído en la DEFAULT sobra
+                cur.execute(f"DELETE FROM {_qn(DEFAULT)} WHERE periodo >= %s AND periodo < %s",
+                            [self.periodo, _mes_siguiente(self.periodo)])
+            cur.execute(f"ALTER TABLE {_qn(TABLA)} ATTACH PARTITION {_qn(self.tabla)} "
+                        f"FOR VALUES {_rango(self.periodo)}")
+            cur.execute(f"ALTER TABLE {_qn(self.tabla)} DROP CONSTRAINT {_qn(restriccion)}")
+            cur.execute(f"ALTER TABLE {_qn(self.tabla)} RENAME TO {_qn(nombre)}")
+        log.info("Partición %s reemplazada (lote #%s)", nombre, self.lote.id)
+
+
+# --------------------------
+# Conversión (una vez)
+# --------------------------
+def convertir() -> List[str]:
+    """
+    Convierte art_consolidado_item en tabla particionada por mes, con los datos adentro.
+    Todo en una transacción (con la tabla bloqueada). Devuelve las particiones creadas.
+    """
+    if connection.vendor != "postgresql":
+        raise RuntimeError("El particionado solo existe en PostgreSQL.")
+    if particionado():
+        raise RuntimeError(f"{TABLA} ya está particionada.")
+
+    with transaction.atomic(), connection.cursor() as cur:
+        _disparar_diferidos()
+        cur.execute(f"LOCK TABLE {_qn(TABLA)} IN ACCESS EXCLUSIVE MODE")
+
+        # periodo es la clave de partición: los items viejos sin período toman el del lote
+        cur.execute(
+            f"UPDATE {_qn(TABLA)} i SET periodo = l.periodo FROM {_qn(ConsolidadoLote._meta.db_table)} l "
+            f"WHERE i.lote_id = l.id AND i.periodo IS NULL AND l.periodo IS NOT NULL"
+        )
+        cur.execute(f"SELECT count(*) FROM {_qn(TABLA)} WHERE periodo IS NULL")
+        sin_periodo = cur.fetchone()[0]
+        if sin_periodo:
+            raise RuntimeError(f"Hay {sin_periodo} items sin período (ni en su lote): completalos antes de particionar.")
+
+        # Índices y constraints actuales (para recrearlos con el mismo nombre)
+        cur.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f', 'c')", [TABLA]
+        )
+        constraints = cur.fetchall()
+        cur.execute(
+            "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE x.indrelid = to_regclass(%s) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)", [TABLA]
+        )
+        indices = cur.fetchall()
+        cur.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLA])
+        secuencia = cur.fetchone()[0]
+        cur.execute("SELECT attidentity <> '' FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = 'id'",
+                    [TABLA])
+        identidad = cur.fetchone()[0]
+
+        # La tabla vieja libera los nombres
+        for nombre, _tipo, _def in constraints:
+            cur.execute(f"ALTER TABLE {_qn(TABLA)} RENAME CONSTRAINT {_qn(nombre)} TO {_qn(nombre[:55] + '_sinpart')}")
+        for nombre, _def in indices:
+            cur.execute(f"ALTER INDEX {_qn(nombre)} RENAME TO {_qn(nombre[:55] + '_sinpart')}")
+        cur.execute(f"ALTER TABLE {_qn(TABLA)} RENAME TO {_qn(SIN_PARTICIONAR)}")
+
+        cur.execute(
+            f"CREATE TABLE {_qn(TABLA)} (LIKE {_qn(SIN_PARTICIONAR)} INCLUDING DEFAULTS INCLUDING IDENTITY "
+            f"INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE (periodo)"
+        )
+        cur.execute(f"ALTER TABLE {_qn(TABLA)} ALTER COLUMN periodo SET NOT NULL")
+        if not identidad and secuencia:
+            # serial: el DEFAULT nextval(...) se copió; la secuencia pasa a la tabla nueva
+            cur.execute(f"ALTER SEQUENCE {secuencia} OWNED BY {_qn(TABLA)}.id")
+
+        for nombre, tipo, definicion in constraints:
+            if tipo == "p":
+                definicion = "PRIMARY KEY (id, periodo)"
+            elif tipo == "u" and "periodo" not in definicion:
+                raise RuntimeError(f"El UNIQUE {nombre} no incluye periodo: no se puede particionar.")
+            cur.execute(f"ALTER TABLE {_qn(TABLA)} ADD CONSTRAINT {_qn(nombre)} {definicion}")
+        for nombre, definicion in indices:
+            # pg_get_indexdef ya apunta a la tabla nueva: se leyó antes del RENAME
+            cur.execute(definicion)
+
+        # Particiones de los meses con datos + DEFAULT de resguardo
+        cur.execute(f"SELECT DISTINCT date_trunc('month', periodo)::date FROM {_qn(SIN_PARTICIONAR)} ORDER BY 1")
+        meses = [fila[0] for fila in cur.fetchall()]
+        creadas = []
+        for mes in meses:
+            cur.execute(f"CREATE TABLE {_qn(nombre_particion(mes))} PARTITION OF {_qn(TABLA)} "
+                        f"FOR VALUES {_rango(mes)}")
+            creadas.append(nombre_particion(mes))
+        cur.execute(f"CREATE TABLE {_qn(DEFAULT)} PARTITION OF {_qn(TABLA)} DEFAULT")
+
+        cur.execute(f"INSERT INTO {_qn(TABLA)} OVERRIDING SYSTEM VALUE SELECT * FROM {_qn(SIN_PARTICIONAR)}")
+        _disparar_diferidos()
+        if identidad:
+            cur.execute(f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                        f"COALESCE((SELECT max(id) FROM {_qn(TABLA)}), 0) + 1, false)", [TABLA])
+        cur.execute(f"DROP TABLE {_qn(SIN_PARTICIONAR)}")
+    with connection.cursor() as cur:
+        cur.execute(f"ANALYZE {_qn(TABLA)}")
+    log.info("%s particionada: %d meses", TABLA, len(creadas))
+    return creadas
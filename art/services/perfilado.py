@@ -0,0 +1,182 @@
+# art/services/perfilado.py
+"""
+Perfilado liviano por etapa de la consolidación ART: duración, filas y pico de memoria.
+---------------------------------------------------------------------------------------
+• `perfilar()` abre un Perfil para la corrida (lo hace art/services/pipeline_consolidado.py);
+  mientras está abierto, cada `etapa("nombre")` registra en él su medición. Sin perfil
+  abierto `etapa()` no hace nada (ni mide), así que las funciones instrumentadas siguen
+  costando lo mismo cuando se llaman sueltas (shell, comandos, benchmarks).
+• Se propaga con contextvars: alcanza con que el código instrumentado corra en el mismo
+  hilo (incluye `call_command("volcar_dashboard_art", ...)`).
+• Memoria = RSS del proceso muestreado por un hilo (ART_PERFIL_INTERVALO_RSS segundos).
+  Los procesos hijos (lectura de deudas con workers > 1) no suman.
+• Una etapa que se repite (p. ej. un volcado por aseguradora) acumula tiempo y filas.
+
+El resultado se guarda en ConsolidadoLote.perfil (ver `Perfil.como_dict`); tendencia entre
+lotes: `python manage.py perfil_consolidado_art`.
+
+    with etapa("cargar.maestro") as e:
+        maestro = _cargar_maestro_raw(MAESTRO_PATH)
+        e.filas = len(maestro)
+
+    @etapa("exportar")          # también como decorador (sin filas)
+    def _exportar(...): ...
+"""
+from __future__ import annotations
+
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+import os
+import threading
+import time
+
+from django.conf import settings
+
+INTERVALO_RSS: float = float(getattr(settings, "ART_PERFIL_INTERVALO_RSS", 0.05))
+
+_perfil_actual: ContextVar[Optional["Perfil"]] = ContextVar("perfil_consolidado_art", default=None)
+
+
+# --------------------------
+# Memoria (RSS del proceso)
+# --------------------------
+def rss_actual() -> Optional[int]:
+    """RSS en bytes: psutil (requirements.txt, también en Windows); sin él /proc (Linux); si no None."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class MonitorRSS:
+    """Hilo que muestrea el RSS cada `intervalo` segundos y guarda el máximo (y el inicial)."""
+
+    def __init__(self, intervalo: float = INTERVALO_RSS):
+        self.intervalo = intervalo
+        self.inicial: Optional[int] = rss_actual()
+        self.pico: Optional[int] = self.inicial
+        self._fin = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _registrar(self) -> None:
+        rss = rss_actual()
+        if rss is not None and (self.pico is None or rss > self.pico):
+            self.pico = rss
+
+    def _muestrear(self) -> None:
+        while not self._fin.wait(self.intervalo):
+            self._registrar()
+
+    def __enter__(self) -> "MonitorRSS":
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._fin.set()
+        self._hilo.join()
+        self._registrar()
+
+
+def _mb(n: Optional[int]) -> Optional[float]:
+    return None if n is None else round(n / 1024 / 1024, 1)
+
+
+# --------------------------
+# Perfil de una corrida
+# --------------------------
+@dataclass
+class MedicionEtapa:
+    """Lo que una etapa informa; `filas` lo completa el código instrumentado."""
+    nombre: str
+    filas: Optional[int] = None
+
+
+@dataclass
+class Perfil:
+    etapas: Dict[str, Dict] = field(default_factory=dict)
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+    _t_fin: Optional[float] = field(default=None, repr=False)
+    _monitor: Optional[MonitorRSS] = field(default=None, repr=False)
+
+    def registrar(self, nombre: str, segundos: float, filas: Optional[int],
+                  pico: Optional[int], inicial: Optional[int]) -> None:
+        previa = self.etapas.get(nombre)
+        delta = None if pico is None or inicial is None else max(pico - inicial, 0)
+        if previa is None:
+            self.etapas[nombre] = {
+                "segundos": round(segundos, 3),
+                "filas": filas,
+                "pico_rss_mb": _mb(pico),
+                "delta_rss_mb": _mb(delta),
+                "veces": 1,
+            }
+            return
+        previa["segundos"] = round(previa["segundos"] + segundos, 3)
+        if filas is not None:
+            previa["filas"] = (previa["filas"] or 0) + filas
+        for clave, valor in (("pico_rss_mb", _mb(pico)), ("delta_rss_mb", _mb(delta))):
+            if valor is not None:
+                previa[clave] = max(previa[clave] or 0, valor)
+        previa["veces"] += 1
+
+    def como_dict(self) -> Dict:
+        """Formato de ConsolidadoLote.perfil: totales de la corrida + etapas en orden de inicio."""
+        pico = self._monitor.pico if self._monitor is not None else None
+        return {
+            "total_s": round((self._t_fin or time.perf_counter()) - self._t0, 3),
+            "pico_rss_mb": _mb(pico),
+            "etapas": dict(self.etapas),
+        }
+
+
+@contextmanager
+def perfilar() -> Iterator[Perfil]:
+    """Abre un Perfil para todo lo que corra adentro del bloque (en este hilo/contexto)."""
+    perfil = Perfil()
+    token = _perfil_actual.set(perfil)
+    try:
+        with MonitorRSS() as monitor:
+            perfil._monitor = monitor
+            yield perfil
+    finally:
+        perfil._t_fin = time.perf_counter()
+        _perfil_actual.reset(token)
+
+
+def perfil_actual() -> Optional[Perfil]:
+    return _perfil_actual.get()
+
+
+class etapa(ContextDecorator):
+    """Mide el bloque (o la función decorada) como etapa `nombre` del perfil abierto, si hay."""
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+
+    def _recreate_cm(self) -> "etapa":
+        # Como decorador: instancia nueva por llamada (reentrante)
+        return type(self)(self.nombre)
+
+    def __enter__(self) -> MedicionEtapa:
+        self._perfil = _perfil_actual.get()
+        self._medicion = MedicionEtapa(self.nombre)
+        if self._perfil is not None:
+            self._monitor = MonitorRSS().__enter__()
+            self._t0 = time.perf_counter()
+        return self._medicion
+
+    def __exit__(self, *exc) -> None:
+        if self._perfil is None:
+            return
+        segundos = time.perf_counter() - self._t0
+        self._monitor.__exit__(*exc)
+        self._perfil.registrar(self.nombre, segundos, self._medicion.filas,
+                               self._monitor.pico, self._monitor.inicial)
@@ -1,16 +1,31 @@
 # art/services/persistencia_consolidado.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal, InvalidOperation
-from typing import Dict, Optional, List, Iterable
+from typing import Dict, Optional, List, Iterable, Set, Tuple
+import csv
 import hashlib
+import io
 import json
+import logging
 
+import numpy as np
 import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
 
 from art.models import ConsolidadoLote, ConsolidadoItem
+from art.services import particiones
+from art.services.perfilado import etapa
+from core.numeros_ar import parse_ar_decimal
+
+log = logging.getLogger(__name__)
+
+# Carga de ConsolidadoItem: "auto" (COPY en PostgreSQL, bulk_create en el resto), "copy" o "bulk_create"
+CARGA_ITEMS: str = getattr(settings, "ART_ITEMS_CARGA", "auto")
+COPY_FILAS_POR_BLOQUE: int = int(getattr(settings, "ART_ITEMS_COPY_BLOQUE", 50_000))
 
 
 # --------------------------
@@ -34,33 +49,32 @@ def _parse_periodo(periodo_str: str) -> date:
     return date(year=yyyy, month=mm, day=1)
 
 
+def _es_vacio(val) -> bool:
+    """None / NaN / pd.NA / NaT (las hojas en memoria traen nulos tipados, no solo NaN)."""
+    try:
+        return val is None or bool(pd.isna(val))
+    except (TypeError, ValueError):  # listas/arrays: no son escalares vacíos
+        return False
+
+
+def _valor_json(val):
+    """Escalar de pandas/numpy → tipo nativo serializable en JSONField (nulos → None)."""
+    if _es_vacio(val):
+        return None
+    if hasattr(val, "isoformat"):
+        return val.isoformat()
+    if hasattr(val, "item"):
+        return val.item()
+    return val
+
+
 def _to_decimal(val) -> Decimal:
     """
-    Convierte valores como '$ 100.000,00', '100.000,00', 100000.0 a Decimal.
-    NaN/None -> Decimal('0').
+    Convierte valores como '$ 100.000,00', '100.000,00', 100000.0 a Decimal
+    (core/numeros_ar.py). NaN/None/ilegible -> Decimal('0').
     """
-    if val is None or (isinstance(val, float) and pd.isna(val)):
-        return Decimal("0")
-    if isinstance(val, (int, float, Decimal)):
-        try:
-            return Decimal(str(val))
-        except InvalidOperation:
-            return Decimal("0")
-    s = str(val).strip()
-    if not s:
-        return Decimal("0")
-    s = (
-        s.replace("U$S", "")
-         .replace("u$s", "")
-         .replace("$", "")
-         .replace(".", "")
-         .replace(" ", "")
-         .replace(",", ".")
-    )
-    try:
-        return Decimal(s)
-    except InvalidOperation:
-        return Decimal("0")
+    d = parse_ar_decimal(val)
+    return Decimal("0") if d is None else d
 
 
 # --- FLAGS: versión estricta ---
@@ -72,9 +86,9 @@ def _to_bool_flag_strict(val) -> bool:
     'verdadero', 'true', 'si', 'sí', '1' o boolean True.
     Cualquier otro texto (incluido 'No es Premier', 'ok', '-') -> False.
     """
-    if isinstance(val, bool):
-        return val
-    if val is None:
+    if isinstance(val, (bool, np.bool_)):
+        return bool(val)
+    if _es_vacio(val):
         return False
     s = str(val).strip().lower()
     if s in _TRUE_TOKENS:
@@ -88,62 +102,88 @@ def _to_bool_flag_strict(val) -> bool:
 
 def _get_from_low(low: Dict[str, any], keys: Iterable[str], default="") -> str:
     for k in keys:
-        if k in low and str(low[k]).strip():
+        if k in low and not _es_vacio(low[k]) and str(low[k]).strip():
             return str(low[k]).strip()
     return default
 
 
 # --------------------------
-# Mapeo por fila (DataFrame -> ConsolidadoItem)
+# Mapeo DataFrame -> ConsolidadoItem
 # --------------------------
+# Sinónimos de encabezado (en minúsculas) por campo, en orden de prioridad
+_K_RAZON = ["razón social", "razon social", "razon_social", "razón social (nombre de cuenta)"]
+_K_CUIT = ["cuit"]
+_K_ASEGURADORA = ["aseguradora"]
+_K_CONTRATO = [
+    "nro. contrato", "nro contrato", "nro de contrato", "nro. de contrato",
+    "número de contrato", "numero de contrato",
+    "nº de contrato", "n° de contrato", "nº contrato", "n° contrato",
+    "contrato",
+]
+_K_ESTADO = ["estado contrato", "estado", "estado_contrato"]
+_K_PRODUCTOR = ["productor"]
+_K_EMAIL = ["email del trato", "email_del_trato", "email"]
+_K_Q = ["q periodos deudores", "q períodos deudores", "q_periodos_deudores"]
+_K_DEUDA = ["deuda_total", "deuda total", "deuda"]
+_K_COSTO = ["costo_mensual", "costo mensual"]
+_K_NO_CONTACTAR = ["no contactar", "no_contactar", "no contactar (nombre de cuenta)"]
+_K_PREMIER = ["premier", "premier (nombre de cuenta)"]
+_K_CLIENTE_IMP = ["cliente importante", "cliente_importante", "cliente importante (nombre de cuenta)"]
+
+# Lo que no está acá va a `extra`
+_RECONOCIDAS = {
+    *_K_RAZON, *_K_CUIT, *_K_ASEGURADORA, *_K_CONTRATO, *_K_ESTADO, *_K_PRODUCTOR, *_K_EMAIL,
+    *_K_Q, *_K_DEUDA, *_K_COSTO, *_K_NO_CONTACTAR, *_K_PREMIER, *_K_CLIENTE_IMP,
+}
+
+
+def _primera_presente(low: Dict[str, any], keys: List[str], default=None):
+    """low.get(k1, low.get(k2, ...)): la primera CLAVE presente, aunque su valor esté vacío."""
+    for k in keys:
+        if k in low:
+            return low[k]
+    return default
+
+
+def _q_decimal(q_per_raw) -> Optional[Decimal]:
+    try:
+        return None if _es_vacio(q_per_raw) or q_per_raw == "" else Decimal(str(q_per_raw))
+    except InvalidOperation:
+        return None
+
+
 def _row_to_item_kwargs(row: dict, periodo: date, hoja: str) -> dict:
     """
     Mapea una fila del DF a kwargs de ConsolidadoItem.
     Tolerante a variaciones de encabezados (case-insensitive + sinónimos).
+    Referencia fila a fila de `_items_por_columnas` (misma salida, ver benchmark "persistir").
     """
     low = { (k or "").strip().lower(): v for k, v in row.items() }
 
     # Identificadores y contexto
-    razon_social = _get_from_low(low, [
-        "razón social", "razon social", "razon_social", "razón social (nombre de cuenta)"
-    ])
-    cuit = _get_from_low(low, ["cuit"])
-    aseguradora = _get_from_low(low, ["aseguradora"])
-    contrato = _get_from_low(low, [
-        "nro. contrato", "nro contrato", "nro de contrato", "nro. de contrato",
-        "número de contrato", "numero de contrato",
-        "nº de contrato", "n° de contrato", "nº contrato", "n° contrato",
-        "contrato"
-    ])
-    estado_contrato = _get_from_low(low, ["estado contrato", "estado", "estado_contrato"])
-    productor = _get_from_low(low, ["productor"], default="PROMECOR")
-    email_trato = _get_from_low(low, ["email del trato", "email_del_trato", "email"])
+    razon_social = _get_from_low(low, _K_RAZON)
+    cuit = _get_from_low(low, _K_CUIT)
+    aseguradora = _get_from_low(low, _K_ASEGURADORA)
+    contrato = _get_from_low(low, _K_CONTRATO)
+    estado_contrato = _get_from_low(low, _K_ESTADO)
+    productor = _get_from_low(low, _K_PRODUCTOR, default="PROMECOR")
+    email_trato = _get_from_low(low, _K_EMAIL)
 
     # Métricas
-    q_per_raw = low.get("q periodos deudores", low.get("q períodos deudores", low.get("q_periodos_deudores")))
-    try:
-        q_per = None if q_per_raw in (None, "") or (isinstance(q_per_raw, float) and pd.isna(q_per_raw)) else Decimal(str(q_per_raw))
-    except InvalidOperation:
-        q_per = None
+    q_per = _q_decimal(_primera_presente(low, _K_Q))
 
-    deuda = _to_decimal(low.get("deuda_total", low.get("deuda total", low.get("deuda", 0))))
-    costo_mensual = low.get("costo_mensual", low.get("costo mensual"))
-    costo_mensual = None if costo_mensual is None else _to_decimal(costo_mensual)
+    deuda = _to_decimal(_primera_presente(low, _K_DEUDA, 0))
+    costo_mensual = _primera_presente(low, _K_COSTO)
+    costo_mensual = None if _es_vacio(costo_mensual) else _to_decimal(costo_mensual)
 
     # Flags (incluye variantes '(... Nombre de Cuenta)')
-    no_contactar = _to_bool_flag_strict(
-        low.get("no contactar", low.get("no_contactar", low.get("no contactar (nombre de cuenta)", False)))
-    )
+    no_contactar = _to_bool_flag_strict(_primera_presente(low, _K_NO_CONTACTAR, False))
 
     # PREMIER: ESTRICTO → solo "Premier" (case-insensitive) produce "Premier"
-    premier_raw = (low.get("premier") or low.get("premier (nombre de cuenta)") or "")
-    premier = "Premier" if str(premier_raw).strip().lower() == "premier" else "No es Premier"
+    premier_raw = _get_from_low(low, _K_PREMIER)
+    premier = "Premier" if premier_raw.lower() == "premier" else "No es Premier"
 
-    cliente_importante = _to_bool_flag_strict(
-        low.get("cliente importante",
-        low.get("cliente_importante",
-        low.get("cliente importante (nombre de cuenta)", False)))
-    )
+    cliente_importante = _to_bool_flag_strict(_primera_presente(low, _K_CLIENTE_IMP, False))
 
     kwargs = dict(
         cuit=cuit,
@@ -165,34 +205,209 @@ def _row_to_item_kwargs(row: dict, periodo: date, hoja: str) -> dict:
     )
 
     # Extras (excluimos claves reconocidas)
-    recognized = {
-        "razón social", "razon social", "razon_social", "razón social (nombre de cuenta)",
-        "cuit", "aseguradora",
-        "nro. contrato", "nro contrato", "nro de contrato", "nro. de contrato",
-        "número de contrato", "numero de contrato", "nº de contrato", "n° de contrato",
-        "nº contrato", "n° contrato", "contrato",
-        "estado contrato", "estado", "estado_contrato", "productor",
-        "email del trato", "email_del_trato", "email",
-        "q periodos deudores", "q períodos deudores", "q_periodos_deudores",
-        "deuda_total", "deuda total", "deuda",
-        "costo_mensual", "costo mensual",
-        "no contactar", "no_contactar", "no contactar (nombre de cuenta)",
-        "premier", "premier (nombre de cuenta)",
-        "cliente importante", "cliente_importante", "cliente importante (nombre de cuenta)",
-    }
-    kwargs["extra"] = {k: v for k, v in row.items() if (k or "").strip().lower() not in recognized}
+    kwargs["extra"] = {k: _valor_json(v) for k, v in row.items() if (k or "").strip().lower() not in _RECONOCIDAS}
     return kwargs
 
 
+def _mapear_unicos(valores: list, fn) -> list:
+    """fn(v) por valor distinto (los importes/flags se repiten mucho dentro de una hoja)."""
+    cache: Dict = {}
+    out = []
+    for v in valores:
+        clave = (type(v), v)   # 1, 1.0 y True son la misma clave de dict pero no el mismo JSON
+        try:
+            r = cache[clave]
+        except KeyError:
+            r = cache[clave] = fn(v)
+        except TypeError:  # no hasheable
+            r = fn(v)
+        out.append(r)
+    return out
+
+
+def _como_texto(s: pd.Series) -> pd.Series:
+    """str(v).strip() de cada celda (como hace _get_from_low sobre `to_dict` fila a fila)."""
+    if s.dtype == object or pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+        return s.astype(str).str.strip()
+    return s.astype(object).map(str).str.strip()
+
+
+def _texto_por_columnas(low: Dict[str, pd.Series], keys: List[str], n: int, default: str = "") -> np.ndarray:
+    """Versión columnar de `_get_from_low`: primer sinónimo con valor no vacío, por fila."""
+    out = np.full(n, default, dtype=object)
+    falta = np.ones(n, dtype=bool)
+    for k in keys:
+        s = low.get(k)
+        if s is None:
+            continue
+        txt = _como_texto(s)
+        ok = falta & s.notna().to_numpy() & (txt != "").to_numpy()
+        out[ok] = txt.to_numpy()[ok]
+        falta &= ~ok
+    return out
+
+
+def _items_por_columnas(df: pd.DataFrame, periodo: date, hoja: str) -> Dict[str, list]:
+    """
+    Mapeo columnar DataFrame → campos de ConsolidadoItem: {campo: lista de valores}, una
+    posición por fila. Mismas reglas que `_row_to_item_kwargs` pero resolviendo sinónimos
+    UNA vez por hoja y convirtiendo cada valor distinto una sola vez.
+    """
+    n = len(df)
+    low: Dict[str, pd.Series] = {}
+    extras: List[Tuple[str, pd.Series]] = []
+    for j, col in enumerate(df.columns):
+        serie = df.iloc[:, j]
+        clave = (col or "").strip().lower()
+        low[clave] = serie   # como el dict por fila: con encabezados repetidos gana el último
+        if clave not in _RECONOCIDAS:
+            extras.append((col, serie))
+
+    def presente(keys: List[str], default) -> list:
+        k = next((k for k in keys if k in low), None)
+        return [default] * n if k is None else low[k].tolist()
+
+    contrato = _texto_por_columnas(low, _K_CONTRATO, n)
+    productor = _texto_por_columnas(low, _K_PRODUCTOR, n, default="PROMECOR")
+    premier = _texto_por_columnas(low, _K_PREMIER, n)
+    deuda = _mapear_unicos(presente(_K_DEUDA, 0), _to_decimal)
+
+    cols: Dict[str, list] = {
+        "cuit": _texto_por_columnas(low, _K_CUIT, n).tolist(),
+        "periodo": [periodo] * n,
+        "razon_social": _texto_por_columnas(low, _K_RAZON, n).tolist(),
+        "aseguradora": _texto_por_columnas(low, _K_ASEGURADORA, n).tolist(),
+        "contrato": [str(c) if c else "" for c in contrato],
+        "deuda_total": deuda,
+        "costo_mensual": _mapear_unicos(
+            presente(_K_COSTO, None), lambda v: None if _es_vacio(v) else _to_decimal(v)),
+        "q_periodos_deudores": _mapear_unicos(presente(_K_Q, None), _q_decimal),
+        "estado_contrato": _texto_por_columnas(low, _K_ESTADO, n).tolist(),
+        "email_del_trato": _texto_por_columnas(low, _K_EMAIL, n).tolist(),
+        "no_contactar": _mapear_unicos(presente(_K_NO_CONTACTAR, False), _to_bool_flag_strict),
+        "productor": [p or "PROMECOR" for p in productor],
+        "premier": ["Premier" if p.lower() == "premier" else "No es Premier" for p in premier],
+        "cliente_importante": _mapear_unicos(presente(_K_CLIENTE_IMP, False), _to_bool_flag_strict),
+        "en_deuda": [d > 0 for d in deuda],
+        "hoja": [hoja] * n,
+    }
+    nombres = [col for col, _ in extras]
+    valores = [_mapear_unicos(s.tolist(), _valor_json) for _, s in extras]
+    cols["extra"] = [dict(zip(nombres, fila)) for fila in zip(*valores)] if extras else [{} for _ in range(n)]
+    return cols
+
+
+# --------------------------
+# Carga (COPY en PostgreSQL / bulk_create)
+# --------------------------
+_CAMPOS_ITEM = [
+    "cuit", "periodo", "razon_social", "aseguradora", "contrato", "deuda_total", "costo_mensual",
+    "q_periodos_deudores", "estado_contrato", "email_del_trato", "no_contactar", "productor",
+    "premier", "cliente_importante", "en_deuda", "hoja", "extra",
+]
+
+
+def _filas(lote: ConsolidadoLote, bloques: List[Dict[str, list]]) -> Iterable[tuple]:
+    """(lote_id, *campos) por fila, en el orden de _CAMPOS_ITEM."""
+    for b in bloques:
+        n = len(b["cuit"])
+        yield from zip([lote.id] * n, *(b[c] for c in _CAMPOS_ITEM))
+
+
+def _copy_items(lote: ConsolidadoLote, bloques: List[Dict[str, list]], tabla: Optional[str] = None) -> None:
+    """
+    COPY art_consolidado_item (o `tabla`) FROM STDIN (CSV) en bloques de COPY_FILAS_POR_BLOQUE filas.
+    Todo texto va entre comillas (un "" es texto vacío, no NULL); los nulos solo pueden
+    estar en columnas numéricas y se marcan con FORCE_NULL. Soporta psycopg2 (copy_expert) y psycopg 3 (copy).
+    """
+    meta = ConsolidadoItem._meta
+    qn = connection.ops.quote_name
+    columnas = [meta.get_field("lote").column] + [meta.get_field(c).column for c in _CAMPOS_ITEM]
+    nulos = [meta.get_field(c).column for c in ("costo_mensual", "q_periodos_deudores")]
+    sql = (f"COPY {qn(tabla or meta.db_table)} ({', '.join(qn(c) for c in columnas)}) FROM STDIN "
+           f"WITH (FORMAT csv, FORCE_NULL ({', '.join(qn(c) for c in nulos)}))")
+    i_extra = columnas.index(meta.get_field("extra").column)
+
+    def enviar(cur, buf: io.StringIO) -> None:
+        buf.seek(0)
+        if hasattr(cur, "copy_expert"):          # psycopg2
+            cur.copy_expert(sql, buf)
+        else:                                    # psycopg 3
+            with cur.copy(sql) as copy:
+                copy.write(buf.getvalue())
+
+    with connection.cursor() as wrapper:
+        cur = wrapper.cursor
+        buf = io.StringIO()
+        w = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        pendientes = 0
+        for fila in _filas(lote, bloques):
+            fila = list(fila)
+            fila[i_extra] = json.dumps(fila[i_extra], ensure_ascii=False)
+            w.writerow(fila)
+            pendientes += 1
+            if pendientes >= COPY_FILAS_POR_BLOQUE:
+                enviar(cur, buf)
+                buf = io.StringIO()
+                w = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+                pendientes = 0
+        if pendientes:
+            enviar(cur, buf)
+
+
+def cargar_items(lote: ConsolidadoLote, bloques: List[Dict[str, list]], tabla: Optional[str] = None) -> None:
+    """
+    Inserta los items de `bloques` (salida de _items_por_columnas) en el lote.
+    `tabla`: otra tabla con la misma forma (la del período nuevo de particiones.ReemplazoPeriodo);
+    siempre por COPY.
+    """
+    modo = CARGA_ITEMS
+    if modo == "auto":
+        modo = "copy" if connection.vendor == "postgresql" else "bulk_create"
+    if modo == "copy" or tabla:
+        _copy_items(lote, bloques, tabla)
+        return
+    ConsolidadoItem.objects.bulk_create(
+        (ConsolidadoItem(lote_id=f[0], **dict(zip(_CAMPOS_ITEM, f[1:]))) for f in _filas(lote, bloques)),
+        batch_size=2000,
+    )
+
+
+# Versión del formato de hash_entrada: cambiarla si cambia lo que entra en la huella
+HASH_VERSION = "v2"
+
+
+def _huella_hoja(df: pd.DataFrame) -> bytes:
+    """
+    SHA-256 del contenido completo de una hoja: nombres y dtypes de columnas, cantidad de
+    filas y el hash por fila de `pd.util.hash_pandas_object` (sin índice), como uint64
+    little-endian. Ese hash usa una clave fija (SipHash para texto, bits del valor para
+    números) y pandas no lo cambia entre versiones, así que la huella es estable para
+    entradas idénticas. Celdas que pandas no sabe hashear (listas, dicts) van como texto.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()], ensure_ascii=False).encode("utf-8"))
+    h.update(str(len(df)).encode("ascii"))
+    try:
+        filas = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        filas = pd.util.hash_pandas_object(df.astype(str), index=False)
+    h.update(filas.to_numpy().astype("<u8", copy=False).tobytes())
+    return h.digest()
+
+
 def _calc_hash(periodo_str: str,
                dfC: Optional[pd.DataFrame],
                dfN: Optional[pd.DataFrame],
                dfP: Optional[pd.DataFrame],
                archivos_fuente: Optional[Dict[str, str]]) -> str:
     """
-    Hash razonable de la entrada para detectar duplicados exactos (opcional).
+    Hash de la entrada para detectar duplicados exactos: período, archivos fuente y la
+    huella de cada hoja completa (`_huella_hoja`), combinados en un orden fijo.
+    Vectorizado: unos milisegundos por cada 100k filas, por eso se calcula siempre.
     """
     h = hashlib.sha256()
+    h.update(HASH_VERSION.encode("ascii"))
     h.update(periodo_str.encode("utf-8"))
     h.update(json.dumps(archivos_fuente or {}, sort_keys=True, ensure_ascii=False).encode("utf-8"))
     for tag, df in (("C", dfC), ("N", dfN), ("P", dfP)):
@@ -200,17 +415,77 @@ def _calc_hash(periodo_str: str,
             h.update(f"{tag}-empty".encode())
             continue
         h.update(tag.encode())
-        cols = [str(c) for c in df.columns]
-        h.update(",".join(cols).lower().encode("utf-8"))
-        h.update(str(len(df)).encode("utf-8"))
-        try:
-            sample = df.head(200).to_csv(index=False)
-        except Exception:
-            sample = json.dumps(df.head(200).to_dict(orient="records"), ensure_ascii=False)
-        h.update(sample.encode("utf-8", errors="ignore"))
+        h.update(_huella_hoja(df))
     return h.hexdigest()
 
 
+# --------------------------
+# Reconsolidación incremental
+# --------------------------
+def _aseguradoras_conservadas(previas: Dict, nuevas: Dict) -> Set[str]:
+    """
+    Aseguradoras de las carpetas que esta corrida no pudo leer (nuevas["errores"]) según el
+    lote previo: sus filas se conservan tal cual en vez de tomarse como archivo quitado.
+    """
+    arch_prev = previas.get("archivos") or {}
+    return {a for carpeta in (nuevas.get("errores") or {})
+            for a in (arch_prev.get(carpeta) or {}).get("aseguradoras") or []}
+
+
+def _aseguradoras_a_recalcular(previas: Dict, nuevas: Dict) -> Optional[Set[str]]:
+    """
+    Compara las huellas de dos corridas (ConsolidadoLote.huellas_fuente).
+    Devuelve las aseguradoras (valor de la columna 'Aseguradora') cuyos archivos cambiaron,
+    aparecieron o dejaron de estar; o None si hay que recalcular todo (cambió el maestro
+    o el mapeo, o faltan huellas). Las aseguradoras conservadas (`_aseguradoras_conservadas`)
+    nunca se recalculan: si cambió el maestro/mapeo se recalculan todas las demás.
+    """
+    if not previas or not nuevas:
+        return None
+    arch_prev, arch_new = previas.get("archivos") or {}, nuevas.get("archivos") or {}
+    conservadas = _aseguradoras_conservadas(previas, nuevas)
+
+    if any(not previas.get(clave) or previas.get(clave) != nuevas.get(clave) for clave in ("maestro", "mapeo")):
+        if not conservadas:
+            return None
+        todas = {a for info in (*arch_prev.values(), *arch_new.values()) for a in info.get("aseguradoras") or []}
+        return todas - conservadas
+
+    ilegibles = set(nuevas.get("errores") or {})
+    cambiadas: Set[str] = set()
+    for carpeta in (set(arch_prev) | set(arch_new)) - ilegibles:
+        a, b = arch_prev.get(carpeta), arch_new.get(carpeta)
+        if a and b and a.get("huella") == b.get("huella"):
+            continue
+        for info in (a, b):
+            if info:
+                cambiadas.update(info.get("aseguradoras") or [])
+    return cambiadas - conservadas
+
+
+def _arrastrar_huellas(previas: Dict, nuevas: Dict) -> Dict:
+    """
+    Huellas a guardar en el lote nuevo: las carpetas no leídas conservan la huella del lote
+    previo (sus filas también se conservan), así la próxima corrida compara contra lo último leído.
+    """
+    arch_prev = previas.get("archivos") or {}
+    arrastradas = {c: arch_prev[c] for c in (nuevas.get("errores") or {}) if c in arch_prev}
+    if not arrastradas:
+        return nuevas
+    return {**nuevas, "archivos": {**(nuevas.get("archivos") or {}), **arrastradas}}
+
+
+def _col_aseguradora(df: pd.DataFrame) -> Optional[str]:
+    return next((c for c in df.columns if str(c).strip().lower() == "aseguradora"), None)
+
+
+def _filtrar_aseguradoras(df: pd.DataFrame, aseguradoras: Set[str]) -> pd.DataFrame:
+    col = _col_aseguradora(df)
+    if df.empty or col is None:
+        return df
+    return df[df[col].astype(str).str.strip().isin(aseguradoras)]
+
+
 # --------------------------
 # API principal
 # --------------------------
@@ -219,6 +494,12 @@ class GuardadoResultado:
     lote: ConsolidadoLote
     items_creados: int
     duplicado: bool = False
+    # Incremental: filas movidas del lote anterior sin recalcular, y aseguradoras
+    # recalculadas (None = se recalculó el período completo).
+    items_reutilizados: int = 0
+    aseguradoras_recalculadas: Optional[List[str]] = None
+    # Aseguradoras cuyo archivo no se pudo leer y conservan las filas del lote previo
+    aseguradoras_conservadas: List[str] = field(default_factory=list)
 
 
 def guardar_lote_y_items(
@@ -235,15 +516,28 @@ def guardar_lote_y_items(
     calcular_hash: bool = True,
     evitar_duplicado_por_hash: bool = False,
     reemplazar_periodo: bool = False,
+    huellas_fuente: Optional[Dict] = None,
+    incremental: bool = False,
 ) -> GuardadoResultado:
     """
     Crea un ConsolidadoLote + ConsolidadoItem en bulk a partir de los DataFrames.
 
     - calcular_hash: si True, guarda hash_entrada en el lote.
-    - evitar_duplicado_por_hash: si True y existe un lote con igual hash_entrada, no inserta nada y devuelve duplicado=True.
+    - evitar_duplicado_por_hash: si True y el último lote del periodo tiene igual hash_entrada, no inserta nada
+      y devuelve ese lote con duplicado=True (y aseguradoras_recalculadas=[]: no hay nada que volcar).
     - reemplazar_periodo: si True, borra items de ese periodo antes de insertar (todas las hojas/lotes previos del mismo periodo).
+      Con art_consolidado_item particionada (PostgreSQL) no borra: intercambia la partición del mes
+      (art/services/particiones.py).
+    - huellas_fuente: huellas de los insumos (ConsolidacionContext.huellas()); se guardan en el lote.
+    - incremental: con reemplazar_periodo, compara las huellas con el último lote del período y
+      solo re-inserta las filas de las aseguradoras que cambiaron; el resto de las filas se
+      mueven al lote nuevo tal cual. Si cambió el maestro/mapeo (o no hay lote previo con
+      huellas) se reemplaza el período completo. Las carpetas en huellas_fuente["errores"]
+      (no se pudieron leer) no cuentan como quitadas: sus aseguradoras conservan las filas
+      y la huella del lote previo.
     """
     archivos_fuente = archivos_fuente or {}
+    huellas_fuente = huellas_fuente or {}
     periodo = _parse_periodo(periodo_str)
 
     def norm_df(df: Optional[pd.DataFrame]) -> pd.DataFrame:
@@ -255,40 +549,93 @@ def guardar_lote_y_items(
 
     entrada_hash = ""
     if calcular_hash:
-        entrada_hash = _calc_hash(periodo_str, dfC, dfN, dfP, archivos_fuente)
+        with etapa("persistir.hash"):
+            entrada_hash = _calc_hash(periodo_str, dfC, dfN, dfP, archivos_fuente)
         if evitar_duplicado_por_hash:
-            if ConsolidadoLote.objects.filter(hash_entrada=entrada_hash).exists():
-                lote_existente = ConsolidadoLote.objects.filter(hash_entrada=entrada_hash).order_by("-id").first()
-                return GuardadoResultado(lote=lote_existente, items_creados=0, duplicado=True)
-
-    if reemplazar_periodo:
-        ConsolidadoItem.objects.filter(periodo=periodo).delete()
-
-    lote = ConsolidadoLote.objects.create(
-        usuario=usuario,
-        nombre_archivo_maestro=nombre_archivo_maestro or "",
-        archivos_fuente=archivos_fuente,
-        ruta_excel_salida=ruta_excel_salida or "",
-        filas_consolidado=len(dfC),
-        filas_no_cruzan=len(dfN),
-        observaciones=observaciones or "",
-        hash_entrada=entrada_hash,
+            # Solo si es el último lote del período: uno anterior ya no tiene los items vigentes
+            ultimo = ConsolidadoLote.objects.filter(periodo=periodo).order_by("-id").first()
+            if ultimo is not None and ultimo.hash_entrada == entrada_hash:
+                log.info("Lote #%s (%s): entrada idéntica, no se guarda un lote nuevo", ultimo.id, periodo_str)
+                return GuardadoResultado(lote=ultimo, items_creados=0, duplicado=True,
+                                         aseguradoras_recalculadas=[])
+
+    particionado = particiones.particionado()
+    with transaction.atomic():
+        previo = None
+        cambiadas: Optional[Set[str]] = None
+        conservadas: Set[str] = set()
+        if incremental and reemplazar_periodo and huellas_fuente:
+            previo = (ConsolidadoLote.objects
+                      .filter(periodo=periodo).exclude(huellas_fuente={})
+                      .order_by("-id").first())
+            if previo is not None:
+                cambiadas = _aseguradoras_a_recalcular(previo.huellas_fuente, huellas_fuente)
+                if cambiadas is not None:
+                    conservadas = _aseguradoras_conservadas(previo.huellas_fuente, huellas_fuente)
+                    huellas_fuente = _arrastrar_huellas(previo.huellas_fuente, huellas_fuente)
+                    if conservadas:
+                        log.warning("Lote %s: archivos ilegibles %s, se conservan las filas de %s",
+                                    periodo_str, sorted(huellas_fuente.get("errores") or {}), sorted(conservadas))
+
+        lote = ConsolidadoLote.objects.create(
+            usuario=usuario,
+            periodo=periodo,
+            nombre_archivo_maestro=nombre_archivo_maestro or "",
+            archivos_fuente=archivos_fuente,
+            huellas_fuente=huellas_fuente,
+            ruta_excel_salida=ruta_excel_salida or "",
+            filas_consolidado=len(dfC),
+            filas_no_cruzan=len(dfN),
+            observaciones=observaciones or "",
+            hash_entrada=entrada_hash,
+        )
+
+        reutilizados = 0
+        # PostgreSQL particionado: el período se arma en una tabla aparte y se intercambia al final
+        reemplazo = particiones.ReemplazoPeriodo(periodo, lote) if reemplazar_periodo and particionado else None
+        with etapa("persistir.borrado") as e:
+            if cambiadas is not None:
+                # Delta: fuera lo que no es del lote previo y lo de aseguradoras cambiadas;
+                # el resto pasa al lote nuevo sin recalcularse.
+                if reemplazo is not None:
+                    reutilizados = reemplazo.copiar_vigentes(previo, cambiadas)
+                else:
+                    del_periodo = ConsolidadoItem.objects.filter(periodo=periodo)
+                    borrados, _ = del_periodo.exclude(lote=previo).delete()
+                    e.filas = borrados + del_periodo.filter(lote=previo, aseguradora__in=cambiadas).delete()[0]
+                    reutilizados = ConsolidadoItem.objects.filter(lote=previo, periodo=periodo).update(lote=lote)
+
+                dfC = _filtrar_aseguradoras(dfC, cambiadas)
+                dfN = _filtrar_aseguradoras(dfN, cambiadas)
+                dfP = _filtrar_aseguradoras(dfP, cambiadas)
+                log.info("Lote #%s (%s): incremental, %d filas reutilizadas, recalculadas: %s",
+                         lote.id, periodo_str, reutilizados, sorted(cambiadas) or "ninguna")
+            elif reemplazar_periodo and reemplazo is None:
+                e.filas, _ = ConsolidadoItem.objects.filter(periodo=periodo).delete()
+            elif particionado and reemplazo is None:
+                particiones.asegurar_particion(periodo)
+
+        with etapa("persistir.mapeo") as e:
+            bloques = [_items_por_columnas(df, periodo, hoja)
+                       for df, hoja in ((dfC, "consolidado"), (dfN, "no_cruzan"), (dfP, "productor"))
+                       if not df.empty]
+            creados = sum(len(b["cuit"]) for b in bloques)
+            e.filas = creados
+
+        if creados:
+            with etapa("persistir.insert") as e:
+                cargar_items(lote, bloques, tabla=reemplazo.tabla if reemplazo is not None else None)
+                e.filas = creados
+
+        if reemplazo is not None:
+            with etapa("persistir.swap"):
+                reemplazo.intercambiar()
+
+    return GuardadoResultado(
+        lote=lote,
+        items_creados=creados,
+        duplicado=False,
+        items_reutilizados=reutilizados,
+        aseguradoras_recalculadas=None if cambiadas is None else sorted(cambiadas),
+        aseguradoras_conservadas=sorted(conservadas),
     )
-
-    items: List[ConsolidadoItem] = []
-
-    def extend_items(df: pd.DataFrame, hoja: str):
-        if df.empty:
-            return
-        for row in df.to_dict(orient="records"):
-            kwargs = _row_to_item_kwargs(row, periodo=periodo, hoja=hoja)
-            items.append(ConsolidadoItem(lote=lote, **kwargs))
-
-    extend_items(dfC, "consolidado")
-    extend_items(dfN, "no_cruzan")
-    extend_items(dfP, "productor")
-
-    if items:
-        ConsolidadoItem.objects.bulk_create(items, batch_size=2000)
-
-    return GuardadoResultado(lote=lote, items_creados=len(items), duplicado=False)
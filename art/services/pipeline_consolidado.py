@@ -0,0 +1,161 @@
+# art/services/pipeline_consolidado.py
+"""
+Corrida completa del Consolidado ART, por etapas:
+
+    cargando → cruzando → exportando → persistiendo → tablero
+
+La usan la vista sincrónica (art/views/consolidado.py, corridas chicas) y la tarea Celery
+`task_consolidar` (art/tasks.py), que va registrando cada etapa en un ConsolidacionJob.
+Persistencia y volcado al tablero no cortan la corrida: si fallan, el XLSX igual se entrega
+y el problema queda en `advertencias`; lo mismo los archivos de aseguradoras que no se pudieron leer. Toda la corrida se perfila (art/services/perfilado.py)
+y el perfil por etapa queda en ConsolidadoLote.perfil. Al exportar, las hojas se guardan
+también en el histórico Parquet (art/services/historico.py).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import logging
+
+from django.core.management import call_command
+
+from art.models import ConsolidadoLote
+from art.services import historico
+from art.services.consolidar import (
+    MAESTRO_PATH, ConsolidacionContext, ConsolidadoGenerado, generar_consolidado,
+)
+from art.services.perfilado import etapa, perfilar
+from art.services.persistencia_consolidado import GuardadoResultado, guardar_lote_y_items
+
+log = logging.getLogger(__name__)
+
+ETAPAS = ("cargando", "cruzando", "exportando", "persistiendo", "tablero")
+
+
+@dataclass
+class ResultadoPipeline:
+    periodo: str                                   # "MM-AAAA"
+    generado: ConsolidadoGenerado
+    guardado: Optional[GuardadoResultado] = None
+    avisos: List[str] = field(default_factory=list)
+    advertencias: List[str] = field(default_factory=list)
+    perfil: Dict = field(default_factory=dict)    # Perfil.como_dict() de la corrida
+
+    @property
+    def nombre_archivo(self) -> str:
+        return f"Consolidado_ART_{self.periodo}.xlsx"
+
+
+def periodo_desde_mes(yyyy_mm: str) -> str:
+    """'2025-06' (input type=month) → '06-2025'. ValueError si no tiene ese formato."""
+    yyyy, mm = yyyy_mm.split("-")
+    if len(yyyy) != 4 or not (yyyy.isdigit() and mm.isdigit()):
+        raise ValueError(f"Periodo inválido: {yyyy_mm!r}")
+    return f"{mm.zfill(2)}-{yyyy}"
+
+
+def ejecutar_consolidacion(
+    periodo: str,
+    usuario,
+    on_etapa: Optional[Callable[[str], None]] = None,
+    observaciones: str = "",
+) -> ResultadoPipeline:
+    """
+    periodo: "MM-AAAA". Genera el XLSX, guarda lote + items (incremental) y vuelca el
+    período al tablero. `on_etapa(etapa)` se llama al empezar cada etapa de ETAPAS.
+    """
+    with perfilar() as perfil:
+        resultado = _ejecutar(periodo, usuario, on_etapa, observaciones)
+    resultado.perfil = perfil.como_dict()
+    if resultado.guardado is not None and not resultado.guardado.duplicado:
+        _guardar_perfil(resultado.guardado.lote, resultado.perfil)
+    return resultado
+
+
+def _guardar_perfil(lote: ConsolidadoLote, datos: Dict) -> None:
+    log.info("Lote #%s: %.1fs, pico %s MB, etapas %s", lote.id, datos["total_s"], datos["pico_rss_mb"],
+             {k: v["segundos"] for k, v in datos["etapas"].items()})
+    try:
+        ConsolidadoLote.objects.filter(pk=lote.pk).update(perfil=datos)
+        lote.perfil = datos
+    except Exception:  # el perfil es informativo: nunca corta la corrida
+        log.exception("Lote #%s: no pude guardar el perfil", lote.id)
+
+
+def _ejecutar(
+    periodo: str,
+    usuario,
+    on_etapa: Optional[Callable[[str], None]],
+    observaciones: str,
+) -> ResultadoPipeline:
+    avisar = on_etapa or (lambda _etapa: None)
+    mm, yyyy = periodo.split("-")
+    periodo_for_cmd = f"{yyyy}-{mm}"
+
+    # 1) Insumos + cruce; 2) hojas y XLSX en memoria
+    ctx = ConsolidacionContext.cargar(periodo, on_etapa=avisar)
+    avisar("exportando")
+    resultado = ResultadoPipeline(periodo=periodo, generado=generar_consolidado(periodo, ctx=ctx))
+    for carpeta, err in ctx.errores_archivos.items():
+        resultado.advertencias.append(
+            f"No pude leer el archivo de '{carpeta}' ({err}): sus deudas no están en este XLSX."
+        )
+
+    # Histórico columnar (Parquet por período/hoja): lo leen tasks y services/excel.py
+    try:
+        with etapa("historico"):
+            historico.guardar_periodo(periodo, resultado.generado.hojas)
+    except Exception:
+        log.exception("Consolidado %s: no pude guardar el histórico Parquet", periodo)
+
+    # 3) Lote + items: solo se recalculan las aseguradoras cuyos archivos cambiaron
+    #    desde el último lote del período
+    avisar("persistiendo")
+    hojas = resultado.generado.hojas
+    try:
+        resultado.guardado = guardar_lote_y_items(
+            usuario=usuario,
+            periodo_str=periodo,                  # "MM-AAAA"
+            df_consolidado=hojas.get("Consolidado"),
+            df_no_cruzan=hojas.get("No cruzan"),
+            df_productor=hojas.get("Productor"),
+            nombre_archivo_maestro=MAESTRO_PATH.name,
+            archivos_fuente=ctx.archivos_fuente(),
+            ruta_excel_salida=resultado.nombre_archivo,
+            observaciones=observaciones,
+            reemplazar_periodo=True,              # ⬅️ reemplaza ese período (o su delta)
+            evitar_duplicado_por_hash=True,       # misma entrada que el último lote → no se toca nada
+            huellas_fuente=ctx.huellas(),
+            incremental=True,
+        )
+    except Exception as e:
+        log.exception("Consolidado %s: error guardando lote/items", periodo)
+        resultado.advertencias.append(f"El consolidado se descargará, pero no pude guardar el lote/items: {e}")
+        return resultado
+
+    if resultado.guardado.duplicado:
+        resultado.avisos.append(f"Sin cambios desde el lote #{resultado.guardado.lote.id}: no se guardó un lote nuevo.")
+    if resultado.guardado.aseguradoras_conservadas:
+        resultado.advertencias.append(
+            "El lote y el panel conservan los datos anteriores de "
+            f"{', '.join(resultado.guardado.aseguradoras_conservadas)} (archivo ilegible en esta corrida)."
+        )
+
+    # 4) Volcar al tablero (ArtDashboardContratoPeriodo) — idempotente.
+    #    Incremental: solo las aseguradoras recalculadas.
+    avisar("tablero")
+    try:
+        cambiadas = resultado.guardado.aseguradoras_recalculadas
+        if cambiadas is None:
+            call_command("volcar_dashboard_art", periodo=periodo_for_cmd, reset_periodo=True)
+        else:
+            for aseg in cambiadas:
+                call_command("volcar_dashboard_art", periodo=periodo_for_cmd, aseguradora=aseg)
+        if cambiadas is None or cambiadas:
+            resultado.avisos.append(f"Panel actualizado para {periodo_for_cmd}.")
+    except Exception as e:
+        # No bloquea la descarga si falla el volcado
+        log.exception("Consolidado %s: error volcando al tablero", periodo)
+        resultado.advertencias.append(f"Consolidado OK pero no pude actualizar el panel: {e}")
+
+    return resultado
@@ -0,0 +1,65 @@
+# art/services/ranking.py
+"""
+Top N + "Otros" + Pareto en una sola sentencia SQL.
+---------------------------------------------------
+Para los gráficos de Análisis que muestran los N grupos con más deuda y el resto junto
+("Top 10 + Otros", Pareto, torta). En vez de un GROUP BY ordenado, un `count()` y otro
+aggregate sobre el slice del resto, se arma a partir del queryset
+
+    WITH g AS (SELECT campo AS clave, SUM(valor) AS monto FROM ... GROUP BY campo),
+         r AS (SELECT clave, monto, ROW_NUMBER() OVER (ORDER BY monto DESC, clave) AS rn FROM g),
+         t AS (SELECT CASE WHEN rn <= N THEN rn ELSE N + 1 END AS orden, ... GROUP BY 1)
+    SELECT orden, clave, monto,
+           100 * SUM(monto) OVER (ORDER BY orden) / SUM(monto) OVER () AS pareto
+    FROM t ORDER BY orden
+
+La fila N + 1 es "Otros" y solo aparece si hay más de N grupos. Los empates de monto se
+desempatan por clave, así el orden no cambia entre consultas.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+from django.db import connections
+from django.db.models import F, QuerySet, Sum
+
+
+@dataclass
+class FilaTop:
+    clave: str        # valor del campo ("" si vino vacío); sin sentido si otros=True
+    monto: float
+    pareto: float     # % acumulado de `monto` hasta esta fila inclusive (0 si el total es 0)
+    otros: bool = False
+
+
+def top_n_con_otros(qs: QuerySet, campo: str, valor: str, n: int) -> List[FilaTop]:
+    """
+    Los `n` valores de `campo` con mayor Sum(`valor`) dentro de `qs` (desc), más una fila
+    "Otros" con la suma del resto si hay más de `n`. Una sola consulta.
+    """
+    agrupado = qs.values(clave=F(campo)).annotate(monto=Sum(valor)).order_by()
+    sql_g, params = agrupado.query.sql_with_params()
+    sql = f"""
+        WITH g AS ({sql_g}),
+        r AS (
+            SELECT clave, monto, ROW_NUMBER() OVER (ORDER BY monto DESC, clave) AS rn
+            FROM g
+        ),
+        t AS (
+            SELECT CASE WHEN rn <= %s THEN rn ELSE %s END AS orden, MIN(clave) AS clave, SUM(monto) AS monto
+            FROM r
+            GROUP BY CASE WHEN rn <= %s THEN rn ELSE %s END
+        )
+        SELECT orden, clave, monto,
+               COALESCE(100.0 * SUM(monto) OVER (ORDER BY orden) / NULLIF(SUM(monto) OVER (), 0), 0) AS pareto
+        FROM t
+        ORDER BY orden
+    """
+    with connections[qs.db].cursor() as cur:
+        cur.execute(sql, [*params, n, n + 1, n, n + 1])
+        filas = cur.fetchall()
+    return [
+        FilaTop(clave=clave or "", monto=float(monto or 0), pareto=float(pareto or 0), otros=orden > n)
+        for orden, clave, monto, pareto in filas
+    ]
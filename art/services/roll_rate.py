@@ -0,0 +1,156 @@
+# art/services/roll_rate.py
+"""
+Roll rate (matriz de migración entre bandas de Q) del tablero ART.
+-----------------------------------------------------------------
+Cómo se mueven los contratos (cuit, contrato, aseguradora) entre las bandas de Q del cubo
+('0' sin deuda, '1', '2', '3', '4-5', '6+'; ver art/services/cubo.py) de un período a otro.
+
+• `matriz(desde, hasta)`: contratos y ARS por (banda en `desde`, banda en `hasta`). Es UNA
+  sentencia: self-join de ArtDashboardContratoPeriodo consigo misma por la clave del contrato
+  (LEFT JOIN: si no figura en `hasta` el destino es "baja") + UNION ALL de los que aparecen
+  recién en `hasta` (origen "alta").
+• `serie(hasta, meses)`: a dónde fue la deuda (origen con Q ≥ 1) en los últimos `meses` pares
+  de períodos consecutivos (cada período contra el anterior disponible) hasta `hasta`, también
+  en una sentencia: los pares salen de LAG() sobre los períodos y cada par hace el mismo join.
+
+Ambos lados del join se leen del índice compuesto (periodo, cuit, contrato, aseguradora,
+q_periodos_deudores, deuda_total) de ArtDashboardContratoPeriodo: el origen es un rango por
+período y cada contrato del destino, una búsqueda por período + clave, sin ir a la tabla ni
+traer los períodos a Python.
+
+Los montos ARS de una celda son la deuda en el período de origen (para "alta", la del destino).
+En SQL las bandas viajan como enteros (posición en CODIGOS): agrupar por enteros es bastante
+más barato que por textos, y acá se agrupan todos los contratos de cada par.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection
+
+from art.models import ArtDashboardContratoPeriodo, ArtDashboardCubo
+from art.services.cubo import LIMITES_BANDA
+
+ALTA = "alta"   # origen: no figuraba en el período anterior
+BAJA = "baja"   # destino: no figura en el período siguiente
+
+BANDAS = [ArtDashboardCubo.BANDA_SIN_DEUDA, *ArtDashboardCubo.BANDAS_DEUDA]   # de menor a mayor Q
+ORIGENES = [*BANDAS, ALTA]
+DESTINOS = [*BANDAS, BAJA]
+CODIGOS = [*BANDAS, BAJA, ALTA]
+
+ETIQUETAS = {
+    "0": "Sin deuda",
+    "1": "Q = 1",
+    "2": "Q = 2",
+    "3": "Q = 3",
+    "4-5": "Q = 4–5",
+    "6+": "Q ≥ 6",
+    ALTA: "Alta",
+    BAJA: "Baja",
+}
+
+_CLAVE = ("cuit", "contrato", "aseguradora")
+
+
+def _qn(nombre: str) -> str:
+    return connection.ops.quote_name(nombre)
+
+
+def _col(campo: str) -> str:
+    return _qn(ArtDashboardContratoPeriodo._meta.get_field(campo).column)
+
+
+def _codigo(banda: str) -> int:
+    return CODIGOS.index(banda)
+
+
+def _banda(alias: str) -> str:
+    """CASE del código de la banda de Q (mismos cortes que cubo.banda_q) para la tabla `alias`."""
+    q = f"{alias}.{_col('q_periodos_deudores')}"
+    ramas = " ".join(f"WHEN {q} >= {desde} THEN {_codigo(banda)}" for desde, banda in LIMITES_BANDA)
+    return f"CASE {ramas} ELSE {_codigo(ArtDashboardCubo.BANDA_SIN_DEUDA)} END"
+
+
+def _mismo_contrato(a: str, b: str) -> str:
+    return " AND ".join(f"{b}.{_col(c)} = {a}.{_col(c)}" for c in _CLAVE)
+
+
+def _fecha(valor) -> date:
+    return valor if isinstance(valor, date) else date.fromisoformat(str(valor)[:10])
+
+
+def _param(d: date):
+    return connection.ops.adapt_datefield_value(d)
+
+
+def _destino(b: str) -> str:
+    return f"CASE WHEN {b}.{_col('id')} IS NULL THEN {_codigo(BAJA)} ELSE {_banda(b)} END"
+
+
+def matriz(desde: date, hasta: date) -> Dict[Tuple[str, str], Tuple[int, float]]:
+    """{(origen, destino): (contratos, ARS)} entre `desde` y `hasta` (solo celdas no vacías)."""
+    tabla = _qn(ArtDashboardContratoPeriodo._meta.db_table)
+    periodo, deuda = _col("periodo"), _col("deuda_total")
+    sql = f"""
+        SELECT {_banda('a')} AS origen, {_destino('b')} AS destino, COUNT(*), SUM(a.{deuda})
+        FROM {tabla} a
+        LEFT JOIN {tabla} b ON b.{periodo} = %s AND {_mismo_contrato('a', 'b')}
+        WHERE a.{periodo} = %s
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT {_codigo(ALTA)}, {_banda('b')}, COUNT(*), SUM(b.{deuda})
+        FROM {tabla} b
+        WHERE b.{periodo} = %s
+          AND NOT EXISTS (SELECT 1 FROM {tabla} a WHERE a.{periodo} = %s AND {_mismo_contrato('b', 'a')})
+        GROUP BY 2
+    """
+    with connection.cursor() as cur:
+        cur.execute(sql, [_param(hasta), _param(desde), _param(hasta), _param(desde)])
+        filas = cur.fetchall()
+    return {(CODIGOS[o], CODIGOS[d]): (n, float(m or 0)) for o, d, n, m in filas}
+
+
+def serie(hasta: Optional[date], meses: int = 12) -> List[Tuple[date, Dict[Tuple[str, str], Tuple[int, float]]]]:
+    """
+    [(período, matriz contra el período anterior disponible)] de los últimos `meses` pares
+    que terminan en `hasta` (el último período si es None), en orden ascendente. Solo filas
+    con origen en BANDAS_DEUDA y sin altas (solo importa a dónde va la deuda).
+    """
+    tabla = _qn(ArtDashboardContratoPeriodo._meta.db_table)
+    periodo, deuda = _col("periodo"), _col("deuda_total")
+    tope, params = "", []
+    if hasta:
+        tope, params = f"WHERE {periodo} <= %s", [_param(hasta)]
+    sql = f"""
+        WITH per AS (
+            SELECT DISTINCT {periodo} AS p FROM {tabla} {tope}
+        ),
+        pares AS (
+            SELECT LAG(p) OVER (ORDER BY p) AS p0, p AS p1 FROM per
+        ),
+        ult AS (
+            SELECT p0, p1 FROM pares WHERE p0 IS NOT NULL ORDER BY p1 DESC LIMIT %s
+        )
+        SELECT ult.p1, {_banda('a')} AS origen, {_destino('b')} AS destino, COUNT(*), SUM(a.{deuda})
+        FROM ult
+        JOIN {tabla} a ON a.{periodo} = ult.p0 AND a.{_col('q_periodos_deudores')} >= %s
+        LEFT JOIN {tabla} b ON b.{periodo} = ult.p1 AND {_mismo_contrato('a', 'b')}
+        GROUP BY 1, 2, 3
+    """
+    with connection.cursor() as cur:
+        cur.execute(sql, [*params, meses, LIMITES_BANDA[-1][0]])
+        filas = cur.fetchall()
+
+    por_periodo: Dict[date, Dict[Tuple[str, str], Tuple[int, float]]] = {}
+    for p1, o, d, n, m in filas:
+        por_periodo.setdefault(_fecha(p1), {})[(CODIGOS[o], CODIGOS[d])] = (n, float(m or 0))
+    return sorted(por_periodo.items())
+
+
+def empeora(origen: str, destino: str) -> Optional[bool]:
+    """True si el destino es una banda peor que el origen; None si alguno no es banda (alta/baja)."""
+    if origen not in BANDAS or destino not in BANDAS:
+        return None
+    return BANDAS.index(destino) > BANDAS.index(origen)
@@ -0,0 +1,241 @@
+# art/services/volcado_sql.py
+"""
+Volcado ConsolidadoItem → ArtDashboardContratoPeriodo en una sola sentencia SQL.
+--------------------------------------------------------------------------------
+Motor "sql" de `manage.py volcar_dashboard_art`: en vez de traer cada item a Python y hacer
+`update_or_create` por fila, arma todo el alcance con
+
+    WITH base AS (SELECT ... FROM art_consolidado_item JOIN art_consolidado_lote ...),
+         ult  AS (... ROW_NUMBER() OVER (PARTITION BY periodo, cuit, contrato, aseguradora ORDER BY id DESC))
+    INSERT INTO art_artdashboardcontratoperiodo (...) SELECT ... FROM ult WHERE rn = 1
+    ON CONFLICT (periodo, cuit, contrato, aseguradora) DO UPDATE SET ...
+
+calculando en SQL lo mismo que `build_dashboard_row_from_item`: CUIT solo dígitos,
+textos con TRIM, premier con las palabras de `to_bool_generic`, riesgo_flag (Q >= 2),
+bucket_q y deuda_vs_costo. Si varios items caen en la misma clave gana el de id mayor,
+como el último `update_or_create` del motor Python.
+
+Creados vs. actualizados sin recorrer el tablero entero: en PostgreSQL con RETURNING (xmax = 0)
+del propio upsert; en SQLite contando las claves del alcance que todavía no existen.
+
+Motor por defecto (ART_VOLCADO_MOTOR = "auto"): "sql" en PostgreSQL, "python" en el resto.
+La equivalencia con el motor Python (tablero y contadores, cada alcance) está en art/tests.py.
+En SQLite el motor "sql" también anda (para comparar ambos, ver benchmark "volcado"): los
+dígitos del CUIT salen de una función registrada en la conexión y los importes son REAL,
+así que deuda_vs_costo puede diferir en el último decimal; por eso no es el default ahí.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import re
+
+from django.conf import settings
+from django.db import connection
+
+from art.models import ArtDashboardContratoPeriodo, ConsolidadoItem, ConsolidadoLote
+
+MOTOR: str = getattr(settings, "ART_VOLCADO_MOTOR", "auto")   # "auto" | "sql" | "python"
+
+# Mismas listas que to_bool_generic (volcar_dashboard_art)
+_PALABRAS_TRUE = ("si", "sí", "true", "verdadero", "1", "x", "yes", "y", "premier")
+_PALABRAS_FALSE = ("no", "false", "falso", "0", "")
+
+
+def motor() -> str:
+    if MOTOR == "auto":
+        return "sql" if connection.vendor == "postgresql" else "python"
+    return MOTOR
+
+
+@dataclass
+class Alcance:
+    lote_id: Optional[int] = None
+    periodo: Optional[date] = None
+    aseguradora: Optional[str] = None
+    productor: Optional[str] = None
+
+
+@dataclass
+class ResultadoVolcado:
+    items: int = 0           # items del alcance (como len(items) del motor Python)
+    validos: int = 0         # con cuit, contrato y aseguradora
+    creados: int = 0
+    actualizados: int = 0
+
+
+def _qn(nombre: str) -> str:
+    return connection.ops.quote_name(nombre)
+
+
+def _solo_digitos_sqlite(valor) -> str:
+    return re.sub(r"\D+", "", "" if valor is None else str(valor))
+
+
+def _dialecto() -> Dict[str, str]:
+    """Plantillas que cambian según la base ({x} = argumento)."""
+    if connection.vendor == "postgresql":
+        return {
+            "digitos": "regexp_replace({x}, '[^0-9]+', '', 'g')",
+            "mes": "CAST(date_trunc('month', {x}) AS date)",
+            # En la lista del SELECT los parámetros necesitan tipo (psycopg 3 los manda sin tipo)
+            "param_fecha": "CAST(%s AS date)",
+            "param_texto": "CAST(%s AS varchar)",
+        }
+    if connection.vendor == "sqlite":
+        connection.ensure_connection()
+        connection.connection.create_function("art_solo_digitos", 1, _solo_digitos_sqlite, deterministic=True)
+        return {
+            "digitos": "art_solo_digitos({x})",
+            "mes": "date({x}, 'start of month')",
+            "param_fecha": "%s",
+            "param_texto": "%s",
+        }
+    raise NotImplementedError(f"Motor SQL del volcado no disponible para {connection.vendor}")
+
+
+def _mes_siguiente(p: date) -> date:
+    return date(p.year + p.month // 12, p.month % 12 + 1, 1)
+
+
+def _base(alcance: Alcance) -> Tuple[str, list]:
+    """SELECT de los items del alcance con las columnas ya calculadas (sin deduplicar)."""
+    d = _dialecto()
+    i = {f.name: f"i.{_qn(f.column)}" for f in ConsolidadoItem._meta.concrete_fields}
+    periodo_item = f"COALESCE({i['periodo']}, l.{_qn(ConsolidadoLote._meta.get_field('periodo').column)})"
+    params: list = []
+
+    if alcance.periodo is not None:
+        periodo_sql = d["param_fecha"]
+        params.append(alcance.periodo)
+    else:
+        periodo_sql = d["mes"].format(x=periodo_item)
+
+    def texto(col: str) -> str:
+        return f"COALESCE(TRIM({i[col]}), '')"
+
+    premier = f"LOWER({texto('premier')})"
+    verdaderas = ", ".join(["%s"] * len(_PALABRAS_TRUE))
+    falsas = ", ".join(["%s"] * len(_PALABRAS_FALSE))
+    q = i["q_periodos_deudores"]
+    deuda = f"COALESCE({i['deuda_total']}, 0)"
+    costo = i["costo_mensual"]
+
+    select = f"""
+        SELECT
+            {i['id']} AS id,
+            {periodo_sql} AS periodo,
+            {texto('razon_social')} AS razon_social,
+            SUBSTR({d['digitos'].format(x=texto('cuit'))}, 1, 20) AS cuit,
+            {texto('contrato')} AS contrato,
+            {texto('aseguradora')} AS aseguradora,
+            {deuda} AS deuda_total,
+            {costo} AS costo_mensual,
+            {q} AS q_periodos_deudores,
+            {texto('estado_contrato')} AS estado_contrato,
+            {texto('email_del_trato')} AS email_trato,
+            COALESCE({i['no_contactar']}, FALSE) AS no_contactar,
+            {texto('productor')} AS productor,
+            CASE
+                WHEN {premier} LIKE '%%no es premier%%' THEN FALSE
+                WHEN {premier} IN ({verdaderas}) THEN TRUE
+                WHEN {premier} IN ({falsas}) THEN FALSE
+                ELSE TRUE
+            END AS premier,
+            COALESCE({i['cliente_importante']}, FALSE) AS cliente_importante,
+            CASE WHEN {q} >= 2 THEN TRUE ELSE FALSE END AS riesgo_flag,
+            CASE
+                WHEN {q} IS NULL THEN ''
+                WHEN {q} < 1.5 THEN '1'
+                WHEN {q} < 2.5 THEN '2'
+                WHEN {q} < 3.5 THEN '3'
+                WHEN {q} < 6 THEN '4-5'
+                ELSE '6+'
+            END AS bucket_q,
+            CASE WHEN {costo} > 0 THEN ROUND({deuda} * 1.0 / {costo}, 4) END AS deuda_vs_costo,
+            {d['param_texto']} AS lote_ref
+        FROM {_qn(ConsolidadoItem._meta.db_table)} i
+        LEFT JOIN {_qn(ConsolidadoLote._meta.db_table)} l ON l.id = {i['lote']}
+        WHERE 1 = 1
+    """
+    params += list(_PALABRAS_TRUE) + list(_PALABRAS_FALSE)
+    params.append("" if alcance.lote_id is None else str(alcance.lote_id))
+
+    if alcance.lote_id is not None:
+        select += f" AND {i['lote']} = %s"
+        params.append(alcance.lote_id)
+    if alcance.periodo is not None:
+        select += f" AND {periodo_item} >= %s AND {periodo_item} < %s"
+        params += [alcance.periodo, _mes_siguiente(alcance.periodo)]
+    if alcance.aseguradora:
+        select += f" AND LOWER({texto('aseguradora')}) = LOWER(%s)"
+        params.append(alcance.aseguradora)
+    if alcance.productor:
+        select += f" AND LOWER({texto('productor')}) = LOWER(%s)"
+        params.append(alcance.productor)
+    return select, params
+
+
+def periodos_del_alcance(alcance: Alcance) -> Tuple[int, List[date]]:
+    """(cantidad de items, períodos que tocan) — para el reset previo del comando."""
+    select, params = _base(alcance)
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT periodo, COUNT(*) FROM ({select}) base GROUP BY periodo", params)
+        filas = cur.fetchall()
+    periodos = []
+    for valor, _n in filas:
+        if valor is not None:
+            p = valor if isinstance(valor, date) else date.fromisoformat(str(valor)[:10])
+            periodos.append(date(p.year, p.month, 1))
+    return sum(n for _v, n in filas), sorted(set(periodos))
+
+
+def volcar(alcance: Alcance) -> ResultadoVolcado:
+    """Upsert de todo el alcance en una sentencia. Llamar dentro de una transacción."""
+    dash = ArtDashboardContratoPeriodo._meta
+    columnas = [f.column for f in dash.concrete_fields if f.column != "id"]
+    clave = ["periodo", "cuit", "contrato", "aseguradora"]
+    lista = ", ".join(_qn(c) for c in columnas)
+    actualizar = ", ".join(f"{_qn(c)} = EXCLUDED.{_qn(c)}" for c in columnas if c not in clave)
+    tabla = _qn(dash.db_table)
+
+    select, params = _base(alcance)
+    cte = f"""
+        WITH base AS ({select}),
+        ult AS (
+            SELECT base.*, ROW_NUMBER() OVER (
+                PARTITION BY periodo, cuit, contrato, aseguradora ORDER BY id DESC
+            ) AS rn
+            FROM base
+            WHERE cuit <> '' AND contrato <> '' AND aseguradora <> '' AND periodo IS NOT NULL
+        )
+    """
+    insert = f"""
+        INSERT INTO {tabla} ({lista})
+        SELECT {lista} FROM ult WHERE rn = 1
+        ON CONFLICT ({', '.join(_qn(c) for c in clave)}) DO UPDATE SET {actualizar}
+    """
+    res = ResultadoVolcado()
+    with connection.cursor() as cur:
+        cur.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(CASE WHEN cuit <> '' AND contrato <> '' AND aseguradora <> '' "
+            f"AND periodo IS NOT NULL THEN 1 ELSE 0 END), 0) FROM ({select}) base",
+            params,
+        )
+        res.items, res.validos = cur.fetchone()
+        if connection.vendor == "postgresql":
+            # xmax = 0 ⇔ la fila la insertó esta sentencia (si la actualizó ON CONFLICT, xmax tiene el xid)
+            cur.execute(f"{cte}, up AS ({insert} RETURNING (xmax = 0) AS creado) "
+                        f"SELECT COUNT(*) FROM up WHERE creado", params)
+            res.creados = cur.fetchone()[0]
+        else:
+            # Sin xmax: claves del alcance que todavía no están en el tablero (por el índice único)
+            existe = " AND ".join(f"d.{_qn(c)} = ult.{c}" for c in clave)
+            cur.execute(f"{cte} SELECT COUNT(*) FROM ult WHERE rn = 1 "
+                        f"AND NOT EXISTS (SELECT 1 FROM {tabla} d WHERE {existe})", params)
+            res.creados = cur.fetchone()[0]
+            cur.execute(cte + insert, params)
+    # Como en el motor Python: cada item válido que no creó una fila, la actualizó
+    res.actualizados = res.validos - res.creados
+    return res
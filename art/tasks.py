@@ -20,6 +20,8 @@ from django.utils.html import strip_tags  # <-- agregado
 
 from gestion_cobranzas.models import EnvioDeudaART, ContratoEnviado
 from art.services.email_log import log_envio_email  # <-- agregado
+from art.services import historico
+from core.lectura_excel import read_excel_fast
 
 # Gmail API
 from google.oauth2.credentials import Credentials
@@ -84,30 +86,52 @@ def _find_col(df: pd.DataFrame, candidates: list[str]) -> Optional[str]:
             return cols_map[key]
     return None
 
-def _productor_from_excel(envio: EnvioDeudaART, contrato_hint: Optional[str] = None) -> Optional[str]:
+_COLS_EMAIL = ["Email del trato", "Email", "Mail", "Correo", "email del trato", "email_del_trato"]
+_COLS_PRODUCTOR = ["Productor"]
+_COLS_CONTRATO = ["Contrato", "N° de contrato", "Contrato N°", "Nro Contrato"]
+
+def _hoja_productor(periodo_str: str) -> tuple[Optional[pd.DataFrame], str]:
     """
-    Lee el Excel del período (hoja 'Productor') y devuelve el nombre de 'Productor'.
-    Intento 1: buscar por CONTRATO (más preciso cuando hay mismo email con varios productores).
-    Intento 2: si falla, buscar por EMAIL del envío.
+    Hoja 'Productor' del período como texto (dtype=str) y de dónde salió.
+    Primero el histórico Parquet (solo las columnas que se usan); si no está, el XLSX.
     """
-    periodo_str = _periodo_asunto(envio)
     xls_path = _find_consolidado_path(periodo_str)
+    info = historico.info_hoja(periodo_str, "Productor", xlsx=xls_path)
+    if info is not None:
+        vacio = pd.DataFrame(columns=info["columnas"])
+        columnas = [c for c in (_find_col(vacio, cands) for cands in (_COLS_EMAIL, _COLS_PRODUCTOR, _COLS_CONTRATO)) if c]
+        try:
+            return historico.leer_hoja(periodo_str, "Productor", columnas=columnas, como_texto=True), f"histórico {periodo_str}"
+        except Exception as e:  # noqa: BLE001
+            log.info("PROD_DEBUG error leyendo histórico Parquet %s: %s (sigo con el XLSX)", periodo_str, e)
+
     if not xls_path:
         log.info("PROD_DEBUG no se encontró archivo Consolidado para %s en %s", periodo_str, _consolidados_dir())
-        return None
+        return None, ""
 
     try:
-        df = pd.read_excel(xls_path, sheet_name="Productor", dtype=str)
+        return read_excel_fast(xls_path, sheet_name="Productor", dtype=str), xls_path.name
     except Exception as e:  # noqa: BLE001
         log.info("PROD_DEBUG error abriendo hoja 'Productor' en %s: %s", xls_path, e)
+        return None, ""
+
+def _productor_from_excel(envio: EnvioDeudaART, contrato_hint: Optional[str] = None) -> Optional[str]:
+    """
+    Lee la hoja 'Productor' del período (histórico Parquet o Excel) y devuelve el nombre de 'Productor'.
+    Intento 1: buscar por CONTRATO (más preciso cuando hay mismo email con varios productores).
+    Intento 2: si falla, buscar por EMAIL del envío.
+    """
+    periodo_str = _periodo_asunto(envio)
+    df, origen = _hoja_productor(periodo_str)
+    if df is None:
         return None
 
-    col_email = _find_col(df, ["Email del trato", "Email", "Mail", "Correo", "email del trato", "email_del_trato"])
-    col_prod  = _find_col(df, ["Productor"])
-    col_cont  = _find_col(df, ["Contrato", "N° de contrato", "Contrato N°", "Nro Contrato"])
+    col_email = _find_col(df, _COLS_EMAIL)
+    col_prod  = _find_col(df, _COLS_PRODUCTOR)
+    col_cont  = _find_col(df, _COLS_CONTRATO)
 
     if col_prod is None:
-        log.info("PROD_DEBUG no se encontró columna 'Productor' en %s", xls_path.name)
+        log.info("PROD_DEBUG no se encontró columna 'Productor' en %s", origen)
         return None
 
     # Normalizar
@@ -124,7 +148,7 @@ def _productor_from_excel(envio: EnvioDeudaART, contrato_hint: Optional[str] = N
         if not sub.empty:
             prod = sub.iloc[0].strip()
             if prod:
-                log.info("PROD_DEBUG origen=excel_by_contract archivo=%s contrato=%s productor=%r", xls_path.name, hint, prod)
+                log.info("PROD_DEBUG origen=excel_by_contract archivo=%s contrato=%s productor=%r", origen, hint, prod)
                 return prod
 
     # --- Intento 2: por email ---
@@ -134,10 +158,10 @@ def _productor_from_excel(envio: EnvioDeudaART, contrato_hint: Optional[str] = N
         if not sub.empty:
             prod = sub.iloc[0].strip()
             if prod:
-                log.info("PROD_DEBUG origen=excel_by_email archivo=%s productor=%r", xls_path.name, prod)
+                log.info("PROD_DEBUG origen=excel_by_email archivo=%s productor=%r", origen, prod)
                 return prod
 
-    log.info("PROD_DEBUG sin coincidencia (contrato=%r email=%r) en %s", contrato_hint, getattr(envio, "email", None), xls_path.name)
+    log.info("PROD_DEBUG sin coincidencia (contrato=%r email=%r) en %s", contrato_hint, getattr(envio, "email", None), origen)
     return None
 
 # ============================== Templates ==============================
@@ -459,3 +483,58 @@ def task_enviar_mails(envios_ids: list[int] | int) -> dict:
 
     return resumen
 
+
+
+# ============================== Consolidación en segundo plano ==============================
+
+def _jobs_dir() -> Path:
+    """Directorio de los XLSX generados por los ConsolidacionJob (settings.ART_JOBS_DIR)."""
+    return Path(getattr(settings, "ART_JOBS_DIR", Path(settings.BASE_DIR) / ".cache" / "art_jobs"))
+
+
+@shared_task
+def task_consolidar(job_id: int) -> dict:
+    """
+    Corre el pipeline del consolidado (art/services/pipeline_consolidado.py) para un
+    ConsolidacionJob, guardando cada etapa a medida que avanza y el XLSX al terminar.
+    """
+    from art.models import ConsolidacionJob
+    from art.services.pipeline_consolidado import ejecutar_consolidacion
+
+    job = ConsolidacionJob.objects.select_related("usuario").get(pk=job_id)
+
+    def _marcar_etapa(etapa: str) -> None:
+        ahora = timezone.now().isoformat()
+        if job.etapa and job.etapa in job.etapas:
+            job.etapas[job.etapa]["fin"] = ahora
+        job.etapas[etapa] = {"inicio": ahora}
+        job.etapa = etapa
+        job.estado = "en_curso"
+        job.save(update_fields=["etapa", "etapas", "estado", "actualizado_en"])
+
+    try:
+        resultado = ejecutar_consolidacion(
+            job.periodo,
+            job.usuario,
+            on_etapa=_marcar_etapa,
+            observaciones=f"Guardado automático desde consolidación en segundo plano (job #{job.id}).",
+        )
+        destino = _jobs_dir() / str(job.id) / resultado.nombre_archivo
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_bytes(resultado.generado.xlsx.getbuffer())
+
+        if job.etapa in job.etapas:
+            job.etapas[job.etapa]["fin"] = timezone.now().isoformat()
+        job.archivo = str(destino)
+        job.lote = resultado.guardado.lote if resultado.guardado else None
+        job.avisos = resultado.avisos
+        job.advertencias = resultado.advertencias
+        job.estado = "ok"
+    except Exception as exc:  # noqa: BLE001
+        log.exception("ConsolidacionJob #%s (%s) falló en la etapa %s", job.id, job.periodo, job.etapa)
+        job.estado = "error"
+        job.error = str(exc)[:2000]
+
+    job.terminado_en = timezone.now()
+    job.save()
+    return {"job": job.id, "estado": job.estado, "etapa": job.etapa}
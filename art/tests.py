@@ -0,0 +1,560 @@
+# art/tests.py
+"""
+Tests de la app ART (pytest-django o `python manage.py test art`).
+Los benchmarks de art/benchmarks solo miden tiempos; la equivalencia con el código previo se fija acá.
+"""
+from __future__ import annotations
+
+import io
+import re
+import tempfile
+from datetime import date
+from pathlib import Path
+from unittest import mock, skipUnless
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from art.benchmarks.analisis import _tablero_sintetico
+from art.benchmarks.columnas import _estado_por_filas, _premier_por_filas, _q_por_filas, generar_frame
+from art.benchmarks.importar import _importar_por_filas
+from art.benchmarks.pipeline import _insumos_de
+from art.benchmarks.sintetico import generar_insumos
+from art.management.commands import importar_dashboard_art as imp
+from art.models import ArtDashboardContratoPeriodo, ConsolidadoItem, ConsolidadoLote
+from art.services import cache_analisis, cubo, historico, particiones, persistencia_consolidado
+from art.services.consolidar import _estado_contrato, _premier, _q_periodos
+from art.services.persistencia_consolidado import (
+    _arrastrar_huellas, _aseguradoras_a_recalcular, _aseguradoras_conservadas, _items_por_columnas, cargar_items,
+    guardar_lote_y_items,
+)
+from art.services.pipeline_consolidado import ejecutar_consolidacion
+from art.views.analisis import CLAVES_POR_GRUPO, contexto_analisis
+
+
+def _como_objeto(s: pd.Series) -> pd.Series:
+    """NaN/None cuentan como iguales al comparar contra la versión por filas."""
+    return s.astype(object).where(s.notna(), None)
+
+
+class ColumnasConsolidadoGoldenTests(SimpleTestCase):
+    """Q períodos / Estado contrato / Premier columnares == versión por filas (`.apply`) original."""
+
+    def _frames(self):
+        for seed in (1, 42, 2025):
+            yield generar_frame(20_000, seed)
+
+    def test_q_periodos(self):
+        for df in self._frames():
+            pd.testing.assert_series_equal(
+                _como_objeto(_q_por_filas(df)),
+                _como_objeto(_q_periodos(df["Deuda total"], df["Costo mensual"])),
+                check_names=False,
+            )
+
+    def test_q_periodos_empates_y_costo_vacio(self):
+        # Frame mixto como el consolidado real: `.apply(axis=1)` entrega floats de Python a round()
+        df = pd.DataFrame({
+            "Deuda total": [2.675 * 1000, 10.0, 10.0, -7.0, 1.005],
+            "Costo mensual": [1000.0, 0.0, float("nan"), 3.0, 1.0],
+            "Razón social": ["A", "B", "C", "D", "E"],
+        })
+        pd.testing.assert_series_equal(
+            _como_objeto(_q_por_filas(df)),
+            _como_objeto(_q_periodos(df["Deuda total"], df["Costo mensual"])),
+            check_names=False,
+        )
+
+    def test_estado_contrato(self):
+        for df in self._frames():
+            pd.testing.assert_series_equal(
+                _como_objeto(_estado_por_filas(df)),
+                _como_objeto(_estado_contrato(df["Cuenta Perdida"])),
+                check_names=False,
+            )
+
+    def test_premier(self):
+        for df in self._frames():
+            pd.testing.assert_series_equal(
+                _como_objeto(_premier_por_filas(df)),
+                _como_objeto(_premier(df["Referido por"])),
+                check_names=False,
+            )
+
+
+class AseguradorasARecalcularTests(SimpleTestCase):
+    """Reconsolidación incremental: qué aseguradoras se recalculan según las huellas de dos corridas."""
+
+    PREVIAS = {
+        "maestro": "m1", "mapeo": "p1",
+        "archivos": {
+            "Galeno": {"archivo": "06-2025.xlsx", "huella": "g1", "aseguradoras": ["Galeno"]},
+            "OMINT": {"archivo": "06-2025.xlsx", "huella": "o1", "aseguradoras": ["Serena"]},
+        },
+    }
+
+    def _nuevas(self, **cambios):
+        nuevas = {"maestro": "m1", "mapeo": "p1", "archivos": dict(self.PREVIAS["archivos"])}
+        nuevas.update(cambios)
+        return nuevas
+
+    def test_archivo_cambiado(self):
+        archivos = dict(self.PREVIAS["archivos"])
+        archivos["OMINT"] = {**archivos["OMINT"], "huella": "o2"}
+        self.assertEqual(_aseguradoras_a_recalcular(self.PREVIAS, self._nuevas(archivos=archivos)), {"Serena"})
+
+    def test_maestro_cambiado_recalcula_todo(self):
+        self.assertIsNone(_aseguradoras_a_recalcular(self.PREVIAS, self._nuevas(maestro="m2")))
+
+    def test_archivo_ilegible_no_cuenta_como_quitado(self):
+        nuevas = self._nuevas(
+            archivos={"OMINT": self.PREVIAS["archivos"]["OMINT"]},
+            errores={"Galeno": "BadZipFile: File is not a zip file"},
+        )
+        self.assertEqual(_aseguradoras_a_recalcular(self.PREVIAS, nuevas), set())
+        self.assertEqual(_aseguradoras_conservadas(self.PREVIAS, nuevas), {"Galeno"})
+        self.assertEqual(_arrastrar_huellas(self.PREVIAS, nuevas)["archivos"]["Galeno"]["huella"], "g1")
+
+    def test_archivo_ilegible_con_maestro_cambiado(self):
+        nuevas = self._nuevas(
+            maestro="m2",
+            archivos={"OMINT": self.PREVIAS["archivos"]["OMINT"]},
+            errores={"Galeno": "PermissionError: archivo abierto en Excel"},
+        )
+        self.assertEqual(_aseguradoras_a_recalcular(self.PREVIAS, nuevas), {"Serena"})
+
+
+class PipelineArchivoIlegibleTests(TestCase):
+    """Un archivo de aseguradora que no se puede leer no borra sus filas del lote ni del tablero."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix="test_art_")
+        self.addCleanup(tmp.cleanup)
+        self.insumos = generar_insumos(Path(tmp.name), 600, aseguradoras=3, periodo="01-2000")
+        for entorno in (_insumos_de(self.insumos),
+                        mock.patch.object(historico, "HISTORICO_DIR", Path(tmp.name) / "historico")):
+            entorno.__enter__()
+            self.addCleanup(entorno.__exit__, None, None, None)
+        self.usuario = get_user_model().objects.create(username="test_art")
+
+    def test_archivo_ilegible_conserva_lote_y_tablero(self):
+        primero = ejecutar_consolidacion("01-2000", self.usuario)
+        self.assertEqual(primero.advertencias, [])
+        items_galeno = ConsolidadoItem.objects.filter(aseguradora="Galeno").count()
+        tablero_galeno = ArtDashboardContratoPeriodo.objects.filter(aseguradora="Galeno").count()
+        self.assertGreater(items_galeno, 0)
+        self.assertGreater(tablero_galeno, 0)
+
+        (self.insumos.aseguradoras_dir / "Galeno" / "01-2000.xlsx").write_bytes(b"bloqueado por Excel")
+        segundo = ejecutar_consolidacion("01-2000", self.usuario)
+
+        self.assertTrue(any("Galeno" in a and "no están en este XLSX" in a for a in segundo.advertencias))
+        self.assertEqual(segundo.guardado.aseguradoras_conservadas, ["Galeno"])
+        self.assertEqual(segundo.guardado.aseguradoras_recalculadas, [])
+        lote = segundo.guardado.lote
+        self.assertEqual(ConsolidadoItem.objects.filter(lote=lote, aseguradora="Galeno").count(), items_galeno)
+        self.assertEqual(ArtDashboardContratoPeriodo.objects.filter(aseguradora="Galeno").count(), tablero_galeno)
+        self.assertEqual(lote.huellas_fuente["archivos"]["Galeno"],
+                         primero.guardado.lote.huellas_fuente["archivos"]["Galeno"])
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY FROM STDIN solo existe en PostgreSQL")
+class CopyItemsPostgresTests(TestCase):
+    """`_copy_items` (COPY FROM STDIN) guarda exactamente lo mismo que bulk_create (psycopg2 y psycopg 3)."""
+
+    def _hoja(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "Periodo": ["01-2000"] * 6,
+            "Razón social": ['ACME "La Única", S.A.', "Coma, punto; y\nsalto", "Barra \\ invertida", "", None, "Ñandú ☃"],
+            "CUIT": ["20123456789", "27000000001", "30712345678", "20111111112", "20222222223", "20333333334"],
+            "Contrato": [123456.0, None, 7.0, 8.0, 9.0, 10.0],
+            "Aseguradora": ["Galeno", "Serena", "Experta", "Galeno", "Galeno", "Provincia"],
+            "Deuda total": [1234.56, -10.0, 1.005, 0.0, "$ 1.234,56", 99999999.99],
+            "Costo mensual": [100.0, None, 0.5, float("nan"), "", 3.0],
+            "Q periodos deudores": [12.35, None, 2.01, float("nan"), 1.005, 0.0],
+            "Estado contrato": ["Vigente", "Anulada", "", None, "Vigente", "Baja"],
+            "Email del trato": ["a@b.com", "", None, "x@y.com.ar", "", ""],
+            "No contactar": [True, False, "true", None, "0", 1],
+            "Productor": ["", "Juan", None, "PROMECOR", "Pepe", "Ana"],
+            "Premier": ["Premier", "No es Premier", "premier", None, "", "Premier"],
+            "Cliente importante": [False, True, None, "sí", "no", 0],
+            "Capitas": [10, None, 2.5, "texto \"citado\"", "", 0],
+        })
+
+    def _cargar(self, modo: str, usuario) -> list:
+        lote = ConsolidadoLote.objects.create(usuario=usuario, periodo=date(2000, 1, 1))
+        bloques = [_items_por_columnas(self._hoja(), date(2000, 1, 1), "consolidado")]
+        with mock.patch.object(persistencia_consolidado, "CARGA_ITEMS", modo), \
+                mock.patch.object(persistencia_consolidado, "COPY_FILAS_POR_BLOQUE", 4):
+            cargar_items(lote, bloques)
+        return list(ConsolidadoItem.objects.filter(lote=lote).order_by("cuit")
+                    .values(*[c for c in persistencia_consolidado._CAMPOS_ITEM]))
+
+    def test_copy_igual_que_bulk_create(self):
+        usuario = get_user_model().objects.create(username="test_copy")
+        esperado = self._cargar("bulk_create", usuario)
+        obtenido = self._cargar("copy", usuario)
+        self.assertEqual(len(obtenido), 6)
+        for a, b in zip(esperado, obtenido):
+            self.assertEqual(a, b)
+
+
+@skipUnless(connection.vendor == "postgresql", "El particionado solo existe en PostgreSQL")
+class ParticionesPostgresTests(TestCase):
+    """
+    particiones.convertir sobre una tabla con datos (id IDENTITY, como la crea Django 5, o serial
+    como en bases más viejas) y reemplazo/alta/borrado de períodos después de convertir.
+    """
+
+    def setUp(self):
+        self.usuario = get_user_model().objects.create(username="test_particiones")
+        self.lotes = {}
+        for mes in (5, 6):
+            periodo = date(2000, mes, 1)
+            lote = self.lotes[mes] = ConsolidadoLote.objects.create(usuario=self.usuario, periodo=periodo)
+            cargar_items(lote, [_items_por_columnas(self._hoja(mes, 3), periodo, "consolidado")])
+        # Items viejos sin período: toman el de su lote al convertir
+        ConsolidadoItem.objects.filter(lote=self.lotes[5], cuit__endswith="0").update(periodo=None)
+
+    def _hoja(self, mes: int, n: int, aseguradora: str = "Galeno") -> pd.DataFrame:
+        return pd.DataFrame({
+            "CUIT": [f"20{mes:02d}{i:07d}" for i in range(n)],
+            "Aseguradora": [aseguradora] * n,
+            "Contrato": list(range(n)),
+            "Deuda total": [1000.0 + i for i in range(n)],
+        })
+
+    def _filas(self) -> list:
+        return list(ConsolidadoItem.objects.order_by("id").values_list("id", "lote_id", "cuit", "periodo"))
+
+    def _a_serial(self):
+        """Deja `id` como las tablas creadas antes de Django 4.1: serial (DEFAULT nextval) en vez de IDENTITY."""
+        tabla = particiones.TABLA
+        connection.check_constraints()
+        with connection.cursor() as cur:
+            cur.execute(f"ALTER TABLE {tabla} ALTER COLUMN id DROP IDENTITY")
+            cur.execute(f"CREATE SEQUENCE {tabla}_id_seq OWNED BY {tabla}.id")
+            cur.execute(f"SELECT setval('{tabla}_id_seq', (SELECT max(id) FROM {tabla}))")
+            cur.execute(f"ALTER TABLE {tabla} ALTER COLUMN id SET DEFAULT nextval('{tabla}_id_seq')")
+
+    def _nombres(self, sql: str) -> set:
+        with connection.cursor() as cur:
+            cur.execute(sql, [particiones.TABLA])
+            return {fila[0] for fila in cur.fetchall()}
+
+    def _indices_y_constraints(self) -> tuple:
+        return (
+            self._nombres("SELECT i.relname FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+                          "WHERE x.indrelid = to_regclass(%s)"),
+            self._nombres("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s)"),
+        )
+
+    def _convertir_y_verificar(self):
+        antes = self._filas()
+        indices, constraints = self._indices_y_constraints()
+        max_id = max(f[0] for f in antes)
+
+        creadas = particiones.convertir()
+
+        self.assertTrue(particiones.particionado())
+        self.assertEqual(creadas, [particiones.nombre_particion(date(2000, 5, 1)),
+                                   particiones.nombre_particion(date(2000, 6, 1))])
+        despues = self._filas()
+        self.assertEqual([f[:3] for f in despues], [f[:3] for f in antes])
+        self.assertFalse(any(f[3] is None for f in despues))
+        self.assertEqual(self._indices_y_constraints(), (indices, constraints))
+        self.assertFalse(self._nombres("SELECT relname FROM pg_class WHERE relname LIKE '%%sinpart%%' "
+                                       "OR relname = %s || '_sin_particionar'"))
+        # La secuencia sigue después del último id migrado
+        nuevo = ConsolidadoItem.objects.create(lote=self.lotes[6], cuit="20999999999", periodo=date(2000, 6, 1),
+                                               aseguradora="Galeno")
+        self.assertGreater(nuevo.id, max_id)
+        return nuevo.id
+
+    def _reemplazar(self, mes: int, n: int, **kwargs):
+        hoja = self._hoja(mes, n)
+        return guardar_lote_y_items(usuario=self.usuario, periodo_str=f"{mes:02d}-2000", df_consolidado=hoja,
+                                    df_no_cruzan=None, df_productor=None, reemplazar_periodo=True, **kwargs)
+
+    def test_convertir_identity_y_reemplazar_periodo(self):
+        ultimo_id = self._convertir_y_verificar()
+        junio = list(ConsolidadoItem.objects.filter(periodo=date(2000, 6, 1)).values_list("id", flat=True))
+
+        guardado = self._reemplazar(5, 4)
+
+        mayo = ConsolidadoItem.objects.filter(periodo=date(2000, 5, 1))
+        ids_mayo = list(mayo.values_list("id", flat=True))
+        self.assertEqual(set(mayo.values_list("lote_id", flat=True)), {guardado.lote.id})
+        self.assertEqual(len(ids_mayo), 4)
+        self.assertTrue(all(i > ultimo_id for i in ids_mayo))
+        self.assertEqual(list(ConsolidadoItem.objects.filter(periodo=date(2000, 6, 1))
+                              .values_list("id", flat=True)), junio)
+        self.assertIn(particiones.nombre_particion(date(2000, 5, 1)), {p[0] for p in particiones.particiones()})
+        # Los INSERT por la tabla madre siguen tomando ids nuevos después del swap
+        otro = ConsolidadoItem.objects.create(lote=guardado.lote, cuit="20888888888", periodo=date(2000, 5, 1),
+                                              aseguradora="Galeno")
+        self.assertGreater(otro.id, max(ids_mayo))
+
+    def test_convertir_serial(self):
+        self._a_serial()
+        ultimo_id = self._convertir_y_verificar()
+        guardado = self._reemplazar(6, 2)
+        ids = list(ConsolidadoItem.objects.filter(lote=guardado.lote).values_list("id", flat=True))
+        self.assertEqual(len(ids), 2)
+        self.assertTrue(all(i > ultimo_id for i in ids))
+
+    def test_reemplazo_incremental_conserva_ids(self):
+        self._convertir_y_verificar()
+        previo = self.lotes[5]
+        cargar_items(previo, [_items_por_columnas(self._hoja(5, 2, "Serena").assign(CUIT=["27000000001", "27000000002"]),
+                                                  date(2000, 5, 1), "consolidado")])
+        serena = sorted(ConsolidadoItem.objects.filter(lote=previo, aseguradora="Serena").values_list("id", flat=True))
+        lote = ConsolidadoLote.objects.create(usuario=self.usuario, periodo=date(2000, 5, 1))
+
+        reemplazo = particiones.ReemplazoPeriodo(date(2000, 5, 1), lote)
+        self.assertEqual(reemplazo.copiar_vigentes(previo, ["Galeno"]), 2)
+        cargar_items(lote, [_items_por_columnas(self._hoja(5, 1), date(2000, 5, 1), "consolidado")],
+                     tabla=reemplazo.tabla)
+        reemplazo.intercambiar()
+
+        mayo = ConsolidadoItem.objects.filter(periodo=date(2000, 5, 1))
+        self.assertEqual(sorted(mayo.filter(aseguradora="Serena").values_list("id", flat=True)), serena)
+        self.assertEqual(set(mayo.values_list("lote_id", flat=True)), {lote.id})
+        self.assertEqual(mayo.filter(aseguradora="Galeno").count(), 1)
+
+    def test_mes_nuevo_y_eliminar_periodo(self):
+        self._convertir_y_verificar()
+        julio = date(2000, 7, 1)
+        # Un INSERT sin partición del mes cae en la DEFAULT; asegurar_particion lo mueve
+        ConsolidadoItem.objects.create(lote=self.lotes[6], cuit="20777777777", periodo=julio, aseguradora="Galeno")
+        particiones.asegurar_particion(julio)
+        self.assertIn(particiones.nombre_particion(julio), {p[0] for p in particiones.particiones()})
+        with connection.cursor() as cur:
+            cur.execute(f"SELECT count(*) FROM {particiones.DEFAULT}")
+            self.assertEqual(cur.fetchone()[0], 0)
+        self.assertEqual(ConsolidadoItem.objects.filter(periodo=julio).count(), 1)
+
+        self.assertTrue(particiones.eliminar_periodo(julio))
+        self.assertFalse(ConsolidadoItem.objects.filter(periodo=julio).exists())
+        self.assertFalse(particiones.eliminar_periodo(julio))
+
+
+@skipUnless(connection.vendor == "postgresql", "El particionado solo existe en PostgreSQL")
+class PipelineArchivoIlegibleParticionadoTests(PipelineArchivoIlegibleTests):
+    """Lo mismo con art_consolidado_item particionada: el período se arma aparte y se intercambia."""
+
+    def setUp(self):
+        super().setUp()
+        particiones.convertir()
+
+    def test_archivo_ilegible_conserva_lote_y_tablero(self):
+        super().test_archivo_ilegible_conserva_lote_y_tablero()
+        self.assertIn(particiones.nombre_particion(date(2000, 1, 1)), {p[0] for p in particiones.particiones()})
+
+
+class VolcadoMotoresTests(TestCase):
+    """
+    volcar_dashboard_art: el motor "sql" deja el tablero y los contadores igual que el motor
+    "python" (update_or_create por item), para cada alcance del comando.
+    """
+
+    CAMPOS = [f.name for f in ArtDashboardContratoPeriodo._meta.concrete_fields if f.name != "id"]
+    if connection.vendor != "postgresql":
+        # En SQLite los importes son REAL: deuda_vs_costo puede diferir en el último decimal
+        CAMPOS = [c for c in CAMPOS if c != "deuda_vs_costo"]
+
+    def setUp(self):
+        usuario = get_user_model().objects.create(username="test_volcado")
+        self.lote = ConsolidadoLote.objects.create(usuario=usuario, periodo=date(2000, 3, 1))
+        hoja = pd.DataFrame({
+            "CUIT": ["20-12345678-9", "20123456789", "27000000001", " 30712345678 ", "", "20111111112"],
+            "Razón social": [" ACME ", "ACME bis", "Serena SA", "Experta SRL", "Sin CUIT", "Otra"],
+            "Contrato": ["100", "100", "200", "300", "400", "500"],
+            "Aseguradora": ["Galeno", "Galeno", "Serena", "Experta", "Galeno", "Galeno"],
+            "Deuda total": [1000.0, 2500.5, 0.0, -50.0, 10.0, 333.33],
+            "Costo mensual": [500.0, 1000.0, None, 0.0, 1.0, 3.0],
+            "Q periodos deudores": [2.0, 2.5, None, 1.49, 6.0, 111.11],
+            "Estado contrato": ["Vigente", "Vigente", "Anulada", "", "Vigente", "Baja"],
+            "Productor": ["Juan", "Juan", "", "Pepe", "Juan", "Juan"],
+            "Premier": ["Premier", "No es Premier", "premier", "", "No es Premier", "Premier"],
+            "No contactar": [False, True, False, False, False, True],
+        })
+        cargar_items(self.lote, [_items_por_columnas(hoja, date(2000, 3, 1), "consolidado")])
+        # Fila previa con la misma clave y otro productor: el volcado por productor la actualiza
+        ArtDashboardContratoPeriodo.objects.create(
+            periodo=date(2000, 3, 1), cuit="20111111112", contrato="500", aseguradora="Galeno",
+            productor="Otro", deuda_total=1,
+        )
+
+    def _volcar(self, motor: str, **opciones) -> tuple:
+        salida = io.StringIO()
+        call_command("volcar_dashboard_art", motor=motor, stdout=salida, **opciones)
+        contadores = re.search(r"Creados: (\d+) \| Actualizados: (\d+)", salida.getvalue()).groups()
+        return contadores, sorted(ArtDashboardContratoPeriodo.objects.values_list(*self.CAMPOS))
+
+    def _comparar(self, **opciones):
+        sid = transaction.savepoint()
+        esperado = self._volcar("python", **opciones)
+        transaction.savepoint_rollback(sid)
+        self.assertEqual(self._volcar("sql", **opciones), esperado)
+        return esperado
+
+    def test_periodo(self):
+        (creados, actualizados), _ = self._comparar(periodo="2000-03", reset_periodo=True)
+        self.assertEqual((creados, actualizados), ("4", "1"))   # el CUIT repetido actualiza su fila
+
+    def test_aseguradora(self):
+        self._comparar(periodo="2000-03", aseguradora="galeno")
+
+    def test_productor_actualiza_fila_existente(self):
+        (creados, actualizados), tablero = self._comparar(periodo="2000-03", productor="Juan")
+        # CUIT repetido + fila previa de la misma clave (ON CONFLICT): 1 creada, 2 actualizaciones
+        self.assertEqual((creados, actualizados), ("1", "2"))
+        self.assertEqual(len(tablero), 2)
+
+    def test_desde_lote(self):
+        self._comparar(desde_lote=self.lote.id)
+
+
+class ImportarDashboardTandasTests(TestCase):
+    """
+    importar_dashboard_art parsea y upsertea por tandas (--chunk-size): mismo tablero que el
+    update_or_create fila a fila, con claves repetidas entre tandas (gana la última fila).
+    """
+
+    CAMPOS = [f.name for f in ArtDashboardContratoPeriodo._meta.concrete_fields if f.name != "id"]
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory(prefix="test_importar_")
+        self.addCleanup(tmp.cleanup)
+        self.xlsx = Path(tmp.name) / "consolidado.xlsx"
+        self.hoja = pd.DataFrame({
+            "Periodo": ["03-2000", "03-2000", "2000-04", "03-2000", "03-2000", "03-2000", "2000/04"],
+            "Razón social": ["ACME", "Serena SA", "Experta SRL", "ACME bis", "Otra", "ACME ter", "Experta 2"],
+            "CUIT": ["20-12345678-9", "27000000001", "30712345678", "20123456789", "20111111112",
+                     "20123456789", "30-71234567-8"],
+            "Contrato": ["100", "200", "300", "100", "500", "100", "300"],
+            "Aseguradora": ["Galeno", "Serena", "Experta", "Galeno", "Galeno", "Galeno", "Experta"],
+            "Deuda total": ["$ 1.000,00", "0", "-50", "2.500,50", "333,33", "$ 7,00", "12,5"],
+            "Costo mensual": ["500", "", "0", "1.000", "3", "7", "5"],
+            "Q periodos deudores": ["2", "", "1.49", "2,5", "111.11", "1", "2,5"],
+            "Premier": ["Premier", "No es Premier", "", "premier", "x", "", "no"],
+        })
+        # Fila previa con la clave de la fila "Otra": la importación la actualiza
+        ArtDashboardContratoPeriodo.objects.create(
+            periodo=date(2000, 3, 1), cuit="20111111112", contrato="500", aseguradora="Galeno", deuda_total=1,
+        )
+
+    def _exportar(self, hoja: pd.DataFrame) -> str:
+        with pd.ExcelWriter(self.xlsx) as writer:
+            pd.DataFrame({"Nota": ["otra hoja"]}).to_excel(writer, sheet_name="Resumen", index=False)
+            hoja.to_excel(writer, sheet_name="Consolidado", index=False)
+        return str(self.xlsx)
+
+    def _tablero(self) -> list:
+        return sorted(ArtDashboardContratoPeriodo.objects.values_list(*self.CAMPOS))
+
+    def test_tandas_igual_que_por_filas(self):
+        archivo = self._exportar(self.hoja)
+        sid = transaction.savepoint()
+        df, _ = imp.read_consolidado_sheet(archivo, "Consolidado")
+        _importar_por_filas(df, "test")
+        esperado = self._tablero()
+        transaction.savepoint_rollback(sid)
+
+        for chunk in (1, 2, 3, 100):
+            with self.subTest(chunk_size=chunk):
+                sid = transaction.savepoint()
+                salida = io.StringIO()
+                call_command("importar_dashboard_art", archivo=archivo, hoja="auto", lote="test",
+                             chunk_size=chunk, stdout=salida)
+                self.assertEqual(self._tablero(), esperado)
+                # 3 claves nuevas; las otras 4 filas actualizan (3 repetidas + la fila previa)
+                self.assertIn("Creados: 3 | Actualizados: 4", salida.getvalue())
+                transaction.savepoint_rollback(sid)
+
+    def test_periodo_invalido_cita_la_primera_fila(self):
+        hoja = self.hoja.copy()
+        hoja.loc[[2, 5], "Periodo"] = ["marzo", "13/2000"]
+        archivo = self._exportar(hoja)
+        with self.assertRaisesMessage(CommandError, "Error en fila 4 (contando encabezado)"):
+            call_command("importar_dashboard_art", archivo=archivo, hoja="Consolidado", chunk_size=2,
+                         stdout=io.StringIO())
+        self.assertEqual(ArtDashboardContratoPeriodo.objects.count(), 1)
+
+
+class AnalisisConsultasTests(TestCase):
+    """
+    Presupuesto de consultas de la pantalla de Análisis: cada grupo de CLAVES_POR_GRUPO (y la
+    página, que trae GRUPOS_INICIALES) hace una cantidad fija de consultas, sin importar cuántos
+    meses ni contratos tenga el tablero. Incluye la consulta de períodos disponibles.
+    """
+
+    PRESUPUESTO = {
+        "kpis": 3,
+        "periodo": 6,
+        "historico_productor": 4,
+        "historico_aseguradora": 3,
+    }
+    PRESUPUESTO_PAGINA = 8
+
+    @classmethod
+    def setUpTestData(cls):
+        ArtDashboardContratoPeriodo.objects.bulk_create(_tablero_sintetico(400, 14, seed=7))
+        cubo.refrescar()
+
+    def setUp(self):
+        # Sin caché: cada pedido calcula el contexto (los aciertos se prueban aparte)
+        entorno = mock.patch.object(cache_analisis, "ALIAS", "")
+        entorno.start()
+        self.addCleanup(entorno.stop)
+
+    def _agregar_meses(self):
+        """Más meses en el tablero: el presupuesto no cambia."""
+        ArtDashboardContratoPeriodo.objects.bulk_create([
+            ArtDashboardContratoPeriodo(periodo=date(1999, mes, 1), cuit=f"2000000000{mes}", contrato=str(mes),
+                                        aseguradora="Galeno", productor="Ana", deuda_total=100 * mes,
+                                        q_periodos_deudores=mes)
+            for mes in range(1, 13)
+        ])
+        cubo.refrescar()
+
+    def test_presupuesto_por_grupo(self):
+        self.assertEqual(set(self.PRESUPUESTO), set(CLAVES_POR_GRUPO))
+        for meses in ("14 meses", "26 meses"):
+            if meses == "26 meses":
+                self._agregar_meses()
+            for grupo, consultas in self.PRESUPUESTO.items():
+                for periodo in (None, "03-2000"):
+                    with self.subTest(grupo=grupo, periodo=periodo, tablero=meses):
+                        with self.assertNumQueries(consultas):
+                            contexto = contexto_analisis(periodo, (grupo,))
+                        self.assertTrue(set(CLAVES_POR_GRUPO[grupo]) <= set(contexto))
+
+    def test_presupuesto_endpoints_json(self):
+        for grupo, consultas in self.PRESUPUESTO.items():
+            with self.subTest(grupo=grupo):
+                with self.assertNumQueries(consultas):
+                    respuesta = self.client.get(reverse("art:art_analisis_datos", args=[grupo]))
+                self.assertEqual(respuesta.status_code, 200)
+
+    def test_presupuesto_pagina(self):
+        for periodo in ({}, {"periodo": "03-2000"}):
+            with self.subTest(**periodo):
+                with self.assertNumQueries(self.PRESUPUESTO_PAGINA):
+                    respuesta = self.client.get(reverse("art:art_analisis"), periodo)
+                self.assertEqual(respuesta.status_code, 200)
+
+    def test_pagina_cacheada_sin_consultas(self):
+        en_memoria = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "test_art_analisis"}
+        with override_settings(CACHES={"default": en_memoria, "art_analisis": en_memoria}), \
+                mock.patch.object(cache_analisis, "ALIAS", "art_analisis"):
+            with self.assertNumQueries(self.PRESUPUESTO_PAGINA):
+                self.client.get(reverse("art:art_analisis"))
+            with self.assertNumQueries(0):
+                respuesta = self.client.get(reverse("art:art_analisis"))
+        self.assertEqual(respuesta.status_code, 200)
@@ -2,16 +2,23 @@
 from django.urls import path
 import art.views as art_views
 from art.views.consulta import consulta_busqueda_view, consulta_detalle_view  
-from .views.analisis import art_analisis      
+from .views.analisis import art_analisis, art_analisis_datos
+from .views.roll_rate import art_analisis_roll_rate, art_analisis_roll_rate_serie
+from .views.consolidado import consolidacion_descargar, consolidacion_estado
 
 app_name = "art"
 
 urlpatterns = [
     path("",               art_views.art_home,           name="art_home"),
     path("generar-archivo/", art_views.art_generar_archivo, name="art_generar_archivo"),
+    path("consolidacion/<int:job_id>/estado/",    consolidacion_estado,    name="consolidacion_estado"),
+    path("consolidacion/<int:job_id>/descargar/", consolidacion_descargar, name="consolidacion_descargar"),
     path("enviar-mails/", art_views.enviar_mails_art, name="art_enviar_mails"),
     path("envio-estado/",    art_views.envio_estado,        name="envio_estado"),
     path("consulta/", consulta_busqueda_view, name="consulta_busqueda"),
     path("consulta/<str:cuit>/", consulta_detalle_view, name="consulta_detalle"),
     path("analisis/", art_analisis, name="art_analisis"),
+    path("analisis/datos/<str:grupo>/", art_analisis_datos, name="art_analisis_datos"),
+    path("analisis/roll-rate/", art_analisis_roll_rate, name="art_analisis_roll_rate"),
+    path("analisis/roll-rate/serie/", art_analisis_roll_rate_serie, name="art_analisis_roll_rate_serie"),
 ]
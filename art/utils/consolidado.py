@@ -25,6 +25,8 @@ from typing import Dict, Iterable, List, Mapping, Optional
 
 import pandas as pd
 
+from core.lectura_excel import read_excel_fast
+
 
 # =========================
 # Esquema y normalización
@@ -367,10 +369,10 @@ def leer_maestro(path):
     Compatibilidad: varios módulos importan esto desde art.utils.consolidado.
     Acá solo leemos el Excel tal cual (dtype=str). El mapeo lo hace quien lo use.
     """
-    return pd.read_excel(path, sheet_name=0, dtype=str)
+    return read_excel_fast(path, sheet_name=0, dtype=str)
 
 def leer_aseguradora(path, aseguradora=None):
     """
     Compatibilidad: lectura simple del Excel de aseguradora.
     """
-    return pd.read_excel(path, sheet_name=0)
+    return read_excel_fast(path, sheet_name=0)
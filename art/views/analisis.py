@@ -4,10 +4,13 @@ from __future__ import annotations
 from datetime import date, datetime
 from decimal import Decimal
 
-from django.db.models import Sum, Avg
+from django.db.models import Q, Sum
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
 
-from ..models import ArtDashboardContratoPeriodo
+from ..models import ArtDashboardCubo
+from ..services import cache_analisis
+from ..services.ranking import top_n_con_otros
 
 
 # =========================
@@ -51,28 +54,6 @@ def _fmt_periodo_yymm(d: date) -> str:
     return f"{d.month:02d}-{d.year}"
 
 
-def _bucketize_q(q: Decimal | float | int | None) -> str:
-    """
-    Devuelve bucket (texto) para Q períodos deudores:
-      '1', '2', '3', '4-5', '6+'
-    """
-    if q is None:
-        return "1"
-    try:
-        v = float(q)
-    except Exception:
-        v = 0.0
-    if v < 2:
-        return "1"
-    if v < 3:
-        return "2"
-    if v < 4:
-        return "3"
-    if v < 6:
-        return "4-5"
-    return "6+"
-
-
 def _linreg_slope(values: list[float]) -> float:
     """
     Pendiente m de mínimos cuadrados para x = 0..n-1.
@@ -92,13 +73,103 @@ def _linreg_slope(values: list[float]) -> float:
     return num / den if den else 0.0
 
 
+# =========================
+# Consultas
+# =========================
+# Todo sale del cubo (art/services/cubo.py): período × aseguradora × productor × banda de Q
+DEUDA = ~Q(banda_q=ArtDashboardCubo.BANDA_SIN_DEUDA)          # Deuda = Q >= 1
+RIESGO = Q(banda_q__in=ArtDashboardCubo.BANDAS_RIESGO)         # Riesgo/Intimados = Q >= 3
+
+
+def _top_historico(campo: str, n: int, excluir_promecor: bool = False) -> list[str]:
+    """Valores de `campo` con más deuda sumando todos los períodos (desc)."""
+    qs = ArtDashboardCubo.objects.filter(DEUDA)
+    if excluir_promecor:
+        qs = qs.exclude(productor__iexact="PROMECOR")
+    filas = qs.values(campo).annotate(monto=Sum("deuda")).order_by("-monto")[:n]
+    return [r[campo] for r in filas]
+
+
+def _series_historicas(periodos: list[date], grupos: dict[str, tuple[str, list[str]]]) -> list[dict]:
+    """
+    Una fila por período con deuda, riesgo y, por cada grupo {nombre: (campo, claves)},
+    la deuda de cada clave (floats en el orden de `claves`).
+
+    Es un único SELECT ... GROUP BY periodo con Sum(..., filter=...) por serie, en lugar
+    de dos aggregate() y tres GROUP BY por período.
+    """
+    sumas = {
+        "monto": Sum("deuda", filter=DEUDA),
+        "riesgo": Sum("deuda", filter=RIESGO),
+    }
+    for nombre, (campo, claves) in grupos.items():
+        for i, clave in enumerate(claves):
+            sumas[f"{nombre}_{i}"] = Sum("deuda", filter=DEUDA & Q(**{campo: clave}))
+
+    por_periodo = {
+        r["periodo"]: r
+        for r in ArtDashboardCubo.objects.values("periodo").annotate(**sumas).order_by("periodo")
+    }
+    series = []
+    for per in periodos:
+        r = por_periodo.get(per, {})
+        fila = {"periodo": per, "deuda": r.get("monto") or 0, "riesgo": r.get("riesgo") or 0}
+        for nombre, (_campo, claves) in grupos.items():
+            fila[nombre] = [float(r.get(f"{nombre}_{i}") or 0) for i in range(len(claves))]
+        series.append(fila)
+    return series
+
+
 # =========================
 # View
 # =========================
+# Grupos de datos de la pantalla: cada uno se calcula por separado (y tiene su endpoint JSON,
+# ver art_analisis_datos). La página trae en el HTML "kpis" y "periodo"; la solapa Histórico
+# pide los suyos al abrirse.
+CLAVES_POR_GRUPO = {
+    "kpis": ["kpi", "chart_hist"],
+    "periodo": ["chart_buckets", "chart_aseg", "chart_prod_stack", "chart_aseg_stack", "chart_aseg_pie"],
+    "historico_productor": ["chart_hist_prod_share", "chart_hist_prod_lines"],
+    "historico_aseguradora": ["chart_hist_aseg_lines"],
+}
+GRUPOS = tuple(CLAVES_POR_GRUPO)
+GRUPOS_INICIALES = ("kpis", "periodo")
+
+
 def art_analisis(request):
+    periodo_param = request.GET.get("periodo")
+    # Cacheado por período y versión de los datos (se invalida al refrescar el cubo)
+    context = cache_analisis.obtener(
+        "pagina", _parse_periodo_query(periodo_param),
+        lambda: contexto_analisis(periodo_param, GRUPOS_INICIALES),
+    )
+    return render(request, "art_app/art/analisis.html", context)
+
+
+def art_analisis_datos(request, grupo: str):
+    """JSON de un grupo de gráficos (ver CLAVES_POR_GRUPO) para el período pedido."""
+    if grupo not in CLAVES_POR_GRUPO:
+        raise Http404(f"Grupo desconocido: {grupo}")
+    periodo_param = request.GET.get("periodo")
+    datos = cache_analisis.obtener(
+        grupo, _parse_periodo_query(periodo_param),
+        lambda: contexto_analisis(periodo_param, (grupo,)),
+    )
+    return JsonResponse(datos)
+
+
+def contexto_analisis(periodo_param: str | None, grupos: tuple[str, ...] = GRUPOS) -> dict:
+    """
+    Contexto de la pantalla de Análisis para el período pedido (o el último), con las claves
+    de `grupos` más "available_periods" y "selected_period_str".
+
+    Lee solo ArtDashboardCubo, así que no depende de cuántos contratos haya; la cantidad de
+    consultas tampoco depende de cuántos períodos: las series del Histórico salen de un solo
+    GROUP BY periodo con sumas condicionales (ver _series_historicas).
+    """
     # 1) Periodos disponibles (orden ascendente)
     periodos_qs = (
-        ArtDashboardContratoPeriodo.objects
+        ArtDashboardCubo.objects
         .order_by("periodo")
         .values_list("periodo", flat=True)
         .distinct()
@@ -120,35 +191,50 @@ def art_analisis(request):
             "chart_hist_prod_lines": {"labels": [], "datasets": []},
             "chart_hist_aseg_lines": {"labels": [], "datasets": []},
         }
-        return render(request, "art_app/art/analisis.html", context)
+        claves = [c for g in grupos for c in CLAVES_POR_GRUPO[g]]
+        return {k: v for k, v in context.items() if k in claves or k in ("available_periods", "selected_period_str")}
 
     # 2) Período seleccionado
-    periodo_sel = _parse_periodo_query(request.GET.get("periodo"))
+    periodo_sel = _parse_periodo_query(periodo_param)
     if not periodo_sel:
         periodo_sel = periodos[-1]  # último disponible
 
-    qs = ArtDashboardContratoPeriodo.objects.filter(periodo=periodo_sel)
-
-    # 3) Definiciones de conjunto
-    deuda_qs = qs.filter(q_periodos_deudores__gte=1)   # Deuda = Q >= 1
-    riesgo_qs = qs.filter(q_periodos_deudores__gte=3)  # Riesgo/Intimados = Q >= 3
-
-    # 4) KPI principales base
-    deuda_total = deuda_qs.aggregate(v=Sum("deuda_total"))["v"] or Decimal("0")
-    monto_riesgo = riesgo_qs.aggregate(v=Sum("deuda_total"))["v"] or Decimal("0")
-    meses_prom = deuda_qs.aggregate(v=Avg("q_periodos_deudores"))["v"] or Decimal("0")
+    context = {
+        "available_periods": [_fmt_periodo_yymm(p) for p in periodos],
+        "selected_period_str": _fmt_periodo_yymm(periodo_sel),
+    }
+    for grupo in grupos:
+        context.update(_CALCULAR_GRUPO[grupo](periodos, periodo_sel))
+    return context
+
+
+def _grupo_kpis(periodos: list[date], periodo_sel: date) -> dict:
+    """KPIs del período + serie de deuda/riesgo (solapa Histórico; de ahí salen MoM, 6M y YoY)."""
+    # 4) KPI principales base (una sola consulta)
+    base_kpi = ArtDashboardCubo.objects.filter(periodo=periodo_sel).aggregate(
+        monto=Sum("deuda", filter=DEUDA),
+        riesgo=Sum("deuda", filter=RIESGO),
+        q_total=Sum("suma_q", filter=DEUDA),
+        n=Sum("contratos", filter=DEUDA),
+    )
+    deuda_total = base_kpi["monto"] or Decimal("0")
+    monto_riesgo = base_kpi["riesgo"] or Decimal("0")
+    # Promedio de Q de los contratos con deuda
+    meses_prom = Decimal(base_kpi["q_total"]) / base_kpi["n"] if base_kpi["n"] else Decimal("0")
     pct_riesgo = float(monto_riesgo) / float(deuda_total) * 100 if deuda_total else 0.0
 
-    # 6) Datos para gráficos (solapa Histórico) — los uso para KPIs también
+    # Serie mensual de deuda y riesgo (una consulta)
+    series = _series_historicas(periodos, {})
+
     hist_labels = []
     hist_deuda = []
     hist_monto_riesgo = []
     hist_pct_riesgo = []
 
-    for per in periodos:
-        base_qs = ArtDashboardContratoPeriodo.objects.filter(periodo=per)
-        deuda = base_qs.filter(q_periodos_deudores__gte=1).aggregate(v=Sum("deuda_total"))["v"] or 0
-        riesgo = base_qs.filter(q_periodos_deudores__gte=3).aggregate(v=Sum("deuda_total"))["v"] or 0
+    for fila in series:
+        per = fila["periodo"]
+        deuda = fila["deuda"]
+        riesgo = fila["riesgo"]
         pct = float(riesgo) / float(deuda) * 100 if deuda else 0.0
 
         hist_labels.append(_fmt_periodo_yymm(per))
@@ -206,16 +292,22 @@ def art_analisis(request):
         "yoy_pct": yoy_pct,            # variación interanual
     }
 
-    # 5) Datos para gráficos (solapa Período)
+    return {"kpi": kpi, "chart_hist": chart_hist}
+
+
+def _grupo_periodo(periodos: list[date], periodo_sel: date) -> dict:
+    """Gráficos de la solapa Período."""
+    deuda_qs = ArtDashboardCubo.objects.filter(periodo=periodo_sel).filter(DEUDA)   # Deuda = Q >= 1
+
     # 5.a) Distribución por buckets de Q
     bucket_labels = ["1", "2", "3", "4-5", "6+"]
     bucket_deuda = {b: 0.0 for b in bucket_labels}
     bucket_contratos = {b: 0 for b in bucket_labels}
 
-    for row in deuda_qs.values("q_periodos_deudores", "deuda_total"):
-        b = _bucketize_q(row["q_periodos_deudores"])
-        bucket_deuda[b] += float(row["deuda_total"] or 0)
-        bucket_contratos[b] += 1
+    for row in deuda_qs.values("banda_q").annotate(monto=Sum("deuda"), n=Sum("contratos")):
+        b = row["banda_q"]
+        bucket_deuda[b] += float(row["monto"] or 0)
+        bucket_contratos[b] += row["n"]
 
     chart_buckets = {
         "labels": bucket_labels,
@@ -223,33 +315,17 @@ def art_analisis(request):
         "contratos": [bucket_contratos[b] for b in bucket_labels],
     }
 
-    # 5.b) Pareto por Aseguradora (Top 10 + Otros)
+    # 5.b) Pareto por Aseguradora (Top 10 + Otros). El mismo ranking (una consulta con
+    # funciones de ventana, ver art/services/ranking.py) sirve a la torta y a las barras apiladas.
     top_n_aseg = 10
-    aseg_rows = (
-        deuda_qs.values("aseguradora")
-        .annotate(monto=Sum("deuda_total"))
-        .order_by("-monto")
-    )
-    aseg_top = list(aseg_rows[:top_n_aseg])
-    labels_aseg = [r["aseguradora"] or "Sin aseguradora" for r in aseg_top]
-    deuda_aseg = [float(r["monto"] or 0) for r in aseg_top]
-
-    if aseg_rows.count() > top_n_aseg:
-        otros_total = float(aseg_rows[top_n_aseg:].aggregate(v=Sum("monto"))["v"] or 0)
-        labels_aseg.append("Otros")
-        deuda_aseg.append(otros_total)
-
-    total_aseg = sum(deuda_aseg) or 1.0
-    acumulado = 0.0
-    pareto = []
-    for v in deuda_aseg:
-        acumulado += v
-        pareto.append(round(acumulado / total_aseg * 100, 1))
+    ranking_aseg = top_n_con_otros(deuda_qs, "aseguradora", "deuda", top_n_aseg)
+    labels_aseg = ["Otros" if r.otros else (r.clave or "Sin aseguradora") for r in ranking_aseg]
+    deuda_aseg = [r.monto for r in ranking_aseg]
 
     chart_aseg = {
         "labels": labels_aseg,
         "deuda": deuda_aseg,
-        "pareto": pareto,
+        "pareto": [round(r.pareto, 1) for r in ranking_aseg],
     }
 
     # 5.c) Barras apiladas por Productor (severidad Q) — Top 10 (EXCLUYE PROMECOR)
@@ -263,23 +339,20 @@ def art_analisis(request):
         "6+": "Q ≥ 6",
     }
 
-    top_prod_rows = (
-        deuda_qs.exclude(productor__iexact="PROMECOR")
-        .values("productor")
-        .annotate(monto=Sum("deuda_total"))
-        .order_by("-monto")[:TOP_N_PROD]
+    top_prod_rows = top_n_con_otros(
+        deuda_qs.exclude(productor__iexact="PROMECOR"), "productor", "deuda", TOP_N_PROD,
     )
-    prod_labels = [(r["productor"] if r["productor"] else "Sin productor") for r in top_prod_rows]
+    prod_labels = [(r.clave if r.clave else "Sin productor") for r in top_prod_rows if not r.otros]
 
     base = {b: {p: 0.0 for p in prod_labels} for b in bucket_order}
     for r in (
         deuda_qs.exclude(productor__iexact="PROMECOR")
         .filter(productor__in=prod_labels)
-        .values("productor", "q_periodos_deudores")
-        .annotate(monto=Sum("deuda_total"))
+        .values("productor", "banda_q")
+        .annotate(monto=Sum("deuda"))
     ):
         p = r["productor"] if r["productor"] else "Sin productor"
-        b = _bucketize_q(r["q_periodos_deudores"])
+        b = r["banda_q"]
         if b in base and p in base[b]:
             base[b][p] += float(r["monto"] or 0)
 
@@ -298,21 +371,18 @@ def art_analisis(request):
 
     # 5.d) Barras apiladas por Aseguradora (severidad Q) — Top 10
     TOP_N_ASEG_STACK = 10
-    top_aseg_stack_rows = (
-        deuda_qs.values("aseguradora")
-        .annotate(monto=Sum("deuda_total"))
-        .order_by("-monto")[:TOP_N_ASEG_STACK]
-    )
-    aseg_stack_labels = [(r["aseguradora"] if r["aseguradora"] else "Sin aseguradora") for r in top_aseg_stack_rows]
+    aseg_stack_labels = [
+        (r.clave if r.clave else "Sin aseguradora") for r in ranking_aseg[:TOP_N_ASEG_STACK] if not r.otros
+    ]
 
     base_aseg = {b: {a: 0.0 for a in aseg_stack_labels} for b in bucket_order}
     for r in (
         deuda_qs.filter(aseguradora__in=aseg_stack_labels)
-        .values("aseguradora", "q_periodos_deudores")
-        .annotate(monto=Sum("deuda_total"))
+        .values("aseguradora", "banda_q")
+        .annotate(monto=Sum("deuda"))
     ):
         a = r["aseguradora"] if r["aseguradora"] else "Sin aseguradora"
-        b = _bucketize_q(r["q_periodos_deudores"])
+        b = r["banda_q"]
         if b in base_aseg and a in base_aseg[b]:
             base_aseg[b][a] += float(r["monto"] or 0)
 
@@ -329,32 +399,31 @@ def art_analisis(request):
         "datasets": datasets_aseg_stack,
     }
 
-    # 5.e) Pie por Aseguradora (Top 10 + Otros) en ARS
-    TOP_N_ASEG_PIE = 10
-    aseg_pie_rows = (
-        deuda_qs.values("aseguradora")
-        .annotate(monto=Sum("deuda_total"))
-        .order_by("-monto")
-    )
-    aseg_pie_top = list(aseg_pie_rows[:TOP_N_ASEG_PIE])
-    labels_aseg_pie = [r["aseguradora"] or "Sin aseguradora" for r in aseg_pie_top]
-    values_aseg_pie = [float(r["monto"] or 0) for r in aseg_pie_top]
-    if aseg_pie_rows.count() > TOP_N_ASEG_PIE:
-        otros_total_pie = float(aseg_pie_rows[TOP_N_ASEG_PIE:].aggregate(v=Sum("monto"))["v"] or 0)
-        labels_aseg_pie.append("Otros")
-        values_aseg_pie.append(otros_total_pie)
-    chart_aseg_pie = {"labels": labels_aseg_pie, "deuda": values_aseg_pie}
+    # 5.e) Pie por Aseguradora (Top 10 + Otros) en ARS — mismo ranking que el Pareto
+    chart_aseg_pie = {"labels": list(labels_aseg), "deuda": list(deuda_aseg)}
 
-    # 6.b) Histórico: Área apilada % por Productor (compatibilidad)
+    return {
+        "chart_buckets": chart_buckets,
+        "chart_aseg": chart_aseg,
+        "chart_prod_stack": chart_prod_stack,
+        "chart_aseg_stack": chart_aseg_stack,
+        "chart_aseg_pie": chart_aseg_pie,
+    }
+
+
+def _grupo_historico_productor(periodos: list[date], periodo_sel: date) -> dict:
+    """Histórico por Productor: participación (Top 5 + Otros) y líneas Top 5 sin PROMECOR."""
+    # Top N de todo el histórico (una consulta cada uno) y después todas las series juntas
     TOP_N_HIST = 5
-    top_hist_rows = (
-        ArtDashboardContratoPeriodo.objects
-        .filter(q_periodos_deudores__gte=1)
-        .values("productor")
-        .annotate(monto=Sum("deuda_total"))
-        .order_by("-monto")[:TOP_N_HIST]
-    )
-    top_keys = [r["productor"] for r in top_hist_rows]
+    top_keys = _top_historico("productor", TOP_N_HIST)
+    TOP_N_LINES = 5
+    line_keys = _top_historico("productor", TOP_N_LINES, excluir_promecor=True)
+    series = _series_historicas(periodos, {
+        "share": ("productor", top_keys),
+        "lines": ("productor", line_keys),
+    })
+
+    # 6.b) Histórico: Área apilada % por Productor (compatibilidad)
     top_labels = [(k if k else "Sin productor") for k in top_keys]
 
     datasets_hist_share = [
@@ -365,16 +434,9 @@ def art_analisis(request):
         {"label": "Otros", "data": [], "type": "line", "fill": True, "stack": "share", "tension": 0.2}
     )
 
-    for per in periodos:
-        per_qs = (
-            ArtDashboardContratoPeriodo.objects
-            .filter(periodo=per, q_periodos_deudores__gte=1)
-            .values("productor")
-            .annotate(monto=Sum("deuda_total"))
-        )
-        per_map = {r["productor"]: float(r["monto"] or 0) for r in per_qs}
-        total = sum(per_map.values())
-        top_vals = [per_map.get(k, 0.0) for k in top_keys]
+    for fila in series:
+        total = float(fila["deuda"])
+        top_vals = fila["share"]
         otros_val = max(0.0, total - sum(top_vals))
         if total > 0:
             shares = [v * 100.0 / total for v in top_vals]
@@ -392,16 +454,6 @@ def art_analisis(request):
     }
 
     # 6.c) Histórico: Líneas Top 5 por Productor (ARS) — EXCLUYE PROMECOR
-    TOP_N_LINES = 5
-    top_lines_rows = (
-        ArtDashboardContratoPeriodo.objects
-        .filter(q_periodos_deudores__gte=1)
-        .exclude(productor__iexact="PROMECOR")
-        .values("productor")
-        .annotate(monto=Sum("deuda_total"))
-        .order_by("-monto")[:TOP_N_LINES]
-    )
-    line_keys = [r["productor"] for r in top_lines_rows]
     line_labels = [(k if k else "Sin productor") for k in line_keys]
 
     datasets_hist_lines = [
@@ -409,32 +461,25 @@ def art_analisis(request):
         for lbl in line_labels
     ]
 
-    for per in periodos:
-        per_qs = (
-            ArtDashboardContratoPeriodo.objects
-            .filter(periodo=per, q_periodos_deudores__gte=1, productor__in=line_keys)
-            .values("productor")
-            .annotate(monto=Sum("deuda_total"))
-        )
-        per_map = {r["productor"]: float(r["monto"] or 0) for r in per_qs}
-        for i, key in enumerate(line_keys):
-            datasets_hist_lines[i]["data"].append(per_map.get(key, 0.0))
+    for fila in series:
+        for i, v in enumerate(fila["lines"]):
+            datasets_hist_lines[i]["data"].append(v)
 
     chart_hist_prod_lines = {
         "labels": [_fmt_periodo_yymm(p) for p in periodos],
         "datasets": datasets_hist_lines,
     }
 
-    # 6.d) Histórico: Líneas Top 5 por Aseguradora (ARS)
+    return {"chart_hist_prod_share": chart_hist_prod_share, "chart_hist_prod_lines": chart_hist_prod_lines}
+
+
+def _grupo_historico_aseguradora(periodos: list[date], periodo_sel: date) -> dict:
+    """Histórico por Aseguradora: líneas Top 5."""
     TOP_N_ASEG_LINES = 5
-    top_aseg_lines_rows = (
-        ArtDashboardContratoPeriodo.objects
-        .filter(q_periodos_deudores__gte=1)
-        .values("aseguradora")
-        .annotate(monto=Sum("deuda_total"))
-        .order_by("-monto")[:TOP_N_ASEG_LINES]
-    )
-    aseg_line_keys = [r["aseguradora"] for r in top_aseg_lines_rows]
+    aseg_line_keys = _top_historico("aseguradora", TOP_N_ASEG_LINES)
+    series = _series_historicas(periodos, {"aseg": ("aseguradora", aseg_line_keys)})
+
+    # 6.d) Histórico: Líneas Top 5 por Aseguradora (ARS)
     aseg_line_labels = [(k if k else "Sin aseguradora") for k in aseg_line_keys]
 
     datasets_hist_aseg_lines = [
@@ -442,35 +487,21 @@ def art_analisis(request):
         for lbl in aseg_line_labels
     ]
 
-    for per in periodos:
-        per_qs = (
-            ArtDashboardContratoPeriodo.objects
-            .filter(periodo=per, q_periodos_deudores__gte=1, aseguradora__in=aseg_line_keys)
-            .values("aseguradora")
-            .annotate(monto=Sum("deuda_total"))
-        )
-        per_map = {r["aseguradora"]: float(r["monto"] or 0) for r in per_qs}
-        for i, key in enumerate(aseg_line_keys):
-            datasets_hist_aseg_lines[i]["data"].append(per_map.get(key, 0.0))
+    for fila in series:
+        for i, v in enumerate(fila["aseg"]):
+            datasets_hist_aseg_lines[i]["data"].append(v)
 
     chart_hist_aseg_lines = {
         "labels": [_fmt_periodo_yymm(p) for p in periodos],
         "datasets": datasets_hist_aseg_lines,
     }
 
-    # 7) Contexto
-    context = {
-        "available_periods": [_fmt_periodo_yymm(p) for p in periodos],
-        "selected_period_str": _fmt_periodo_yymm(periodo_sel),
-        "kpi": kpi,
-        "chart_buckets": chart_buckets,
-        "chart_aseg": chart_aseg,
-        "chart_prod_stack": chart_prod_stack,
-        "chart_aseg_stack": chart_aseg_stack,
-        "chart_aseg_pie": chart_aseg_pie,
-        "chart_hist": chart_hist,
-        "chart_hist_prod_share": chart_hist_prod_share,
-        "chart_hist_prod_lines": chart_hist_prod_lines,
-        "chart_hist_aseg_lines": chart_hist_aseg_lines,
-    }
-    return render(request, "art_app/art/analisis.html", context)
\ No newline at end of file
+    return {"chart_hist_aseg_lines": chart_hist_aseg_lines}
+
+
+_CALCULAR_GRUPO = {
+    "kpis": _grupo_kpis,
+    "periodo": _grupo_periodo,
+    "historico_productor": _grupo_historico_productor,
+    "historico_aseguradora": _grupo_historico_aseguradora,
+}
@@ -4,21 +4,27 @@
 Vista que genera y permite descargar el Consolidado de Deudas ART
 (en un único XLSX con 10 hojas: Consolidado, No cruzan, Sin mail, etc.).
 Luego de guardar el lote+items en BD, actualiza el panel (ArtDashboardContratoPeriodo).
+
+Dos modos (art/services/pipeline_consolidado.py hace el trabajo en ambos):
+- sincrónico: la respuesta del POST es el XLSX (corridas chicas);
+- segundo plano (POST con `segundo_plano=1`): se crea un ConsolidacionJob que corre en Celery;
+  el navegador consulta `consolidacion_estado` y, al terminar, descarga por `consolidacion_descargar`.
 """
 
+from pathlib import Path
+
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.management import call_command
-from django.http import FileResponse, HttpRequest
-from django.shortcuts import render, redirect
+from django.http import FileResponse, Http404, HttpRequest, JsonResponse
+from django.shortcuts import get_object_or_404, render, redirect
+from django.urls import reverse
 from django.utils.encoding import iri_to_uri
 
-import pandas as pd
+from art.models import ConsolidacionJob
+from art.services.pipeline_consolidado import ejecutar_consolidacion, periodo_desde_mes
+from art.tasks import task_consolidar
 
-# ⬇️  API que genera el XLSX en memoria
-from art.services.consolidar import generar_xlsx
-# ⬇️  Servicio que persiste el lote + items en BD
-from art.services.persistencia_consolidado import guardar_lote_y_items
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 @login_required
@@ -27,79 +33,98 @@ def consolidado_view(request: HttpRequest):
     GET  → muestra un formulario con <input type="month" name="periodo"> (ej. 2025-06).
     POST → genera el XLSX completo y lo descarga. Además guarda la corrida en BD
            y vuelca el período al tablero de análisis.
+           Con `segundo_plano=1` encola el job y responde JSON (202) con las URLs de estado/descarga.
     """
     if request.method == "POST":
         yyyy_mm = request.POST.get("periodo")  # p. ej. "2025-06"
         if not yyyy_mm:
             return redirect(request.path)
 
-        # 1) Normalizar para ambas cosas:
-        #    - periodo (MM-YYYY) → nombre de archivo, generación de XLSX y persistencia
-        #    - periodo_for_cmd (YYYY-MM) → comando de volcado del panel
+        # Periodo (MM-YYYY) → nombre de archivo, generación de XLSX y persistencia
         try:
-            yyyy, mm = yyyy_mm.split("-")
-            periodo = f"{mm}-{yyyy}"          # "06-2025"
-            periodo_for_cmd = f"{yyyy}-{mm}"  # "2025-06"
+            periodo = periodo_desde_mes(yyyy_mm)  # "06-2025"
         except ValueError:
             return redirect(request.path)
 
-        # 2) Generar el XLSX (BytesIO) con todas las hojas
-        buffer = generar_xlsx(periodo)  # ← función existente
+        if request.POST.get("segundo_plano"):
+            return _encolar_job(request, periodo)
 
-        # 3) Leer hojas clave directamente desde el buffer (sin escribir a disco) y guardar en BD
-        try:
-            buffer.seek(0)
-            xls = pd.ExcelFile(buffer)
-
-            def _read_if_exists(nombre_hoja: str):
-                return (
-                    pd.read_excel(xls, sheet_name=nombre_hoja)
-                    if nombre_hoja in xls.sheet_names
-                    else None
-                )
-
-            df_consolidado = _read_if_exists("Consolidado")
-            df_no_cruzan = _read_if_exists("No cruzan")
-            df_productor = _read_if_exists("Productor")
-
-            # Guardar en base de datos (lote + items) reemplazando el período
-            guardar_lote_y_items(
-                usuario=request.user,
-                periodo_str=periodo,                  # "MM-YYYY"
-                df_consolidado=df_consolidado,
-                df_no_cruzan=df_no_cruzan,
-                df_productor=df_productor,
-                nombre_archivo_maestro="",            # opcional: completá si lo tenés
-                archivos_fuente={},                   # opcional
-                ruta_excel_salida=f"Consolidado_ART_{periodo}.xlsx",
-                observaciones="Guardado automático desde consolidado_view.",
-                reemplazar_periodo=True,              # ⬅️ borra e inserta ese período
-            )
-
-            # 4) Volcar al tablero (ArtDashboardContratoPeriodo) — idempotente
-            try:
-                call_command("volcar_dashboard_art", periodo=periodo_for_cmd, reset_periodo=True)
-                messages.success(request, f"Panel actualizado para {periodo_for_cmd}.")
-            except Exception as e:
-                # No bloquea la descarga si falla el volcado
-                messages.warning(request, f"Consolidado OK pero no pude actualizar el panel: {e}")
-
-        except Exception as e:
-            # Si algo falla en la persistencia NO bloqueamos la descarga.
-            # Podés loguear el error si querés:
-            # import logging; logging.getLogger(__name__).exception("Error guardando consolidado")
-            messages.warning(request, f"El consolidado se descargará, pero no pude guardar el lote/items: {e}")
-
-        # 5) Preparar respuesta de descarga
+        # Sincrónico: cargar → cruzar → exportar → guardar lote/items → volcar al tablero
+        resultado = ejecutar_consolidacion(
+            periodo, request.user, observaciones="Guardado automático desde consolidado_view."
+        )
+        for texto in resultado.avisos:
+            messages.success(request, texto)
+        for texto in resultado.advertencias:
+            messages.warning(request, texto)
+
+        buffer = resultado.generado.xlsx
         buffer.seek(0)
-        filename = iri_to_uri(f"Consolidado_ART_{periodo}.xlsx")
         return FileResponse(
             buffer,
             as_attachment=True,
-            filename=filename,
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename=iri_to_uri(resultado.nombre_archivo),
+            content_type=XLSX_CONTENT_TYPE,
         )
 
     # GET → renderiza formulario
     return render(request, "art_app/art/generar_archivo.html")
 
+
+def _encolar_job(request: HttpRequest, periodo: str) -> JsonResponse:
+    job = ConsolidacionJob.objects.create(usuario=request.user, periodo=periodo)
+    try:
+        async_result = task_consolidar.delay(job.id)
+    except Exception as e:  # broker caído: el job queda en error y se avisa
+        job.estado = "error"
+        job.error = f"No se pudo encolar la consolidación: {e}"
+        job.save(update_fields=["estado", "error", "actualizado_en"])
+        return JsonResponse({"job": job.id, "error": job.error}, status=503)
+
+    # update() y no save(): la tarea ya puede estar escribiendo el job
+    ConsolidacionJob.objects.filter(pk=job.pk).update(task_id=async_result.id or "")
+    return JsonResponse(
+        {
+            "job": job.id,
+            "estado_url": reverse("art:consolidacion_estado", args=[job.id]),
+            "descargar_url": reverse("art:consolidacion_descargar", args=[job.id]),
+        },
+        status=202,
+    )
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Endpoints AJAX del job en segundo plano
+# ────────────────────────────────────────────────────────────────────────────────
+
+@login_required
+def consolidacion_estado(request: HttpRequest, job_id: int) -> JsonResponse:
+    job = get_object_or_404(ConsolidacionJob, pk=job_id)
+    return JsonResponse({
+        "job": job.id,
+        "periodo": job.periodo,
+        "estado": job.estado,
+        "etapa": job.etapa,
+        "etapa_label": job.get_etapa_display() if job.etapa else "",
+        "progreso": job.progreso,
+        "etapas": job.etapas,
+        "avisos": job.avisos,
+        "advertencias": job.advertencias,
+        "error": job.error,
+        "lote": job.lote_id,
+        "descargar_url": reverse("art:consolidacion_descargar", args=[job.id]) if job.estado == "ok" else "",
+    })
+
+
+@login_required
+def consolidacion_descargar(request: HttpRequest, job_id: int) -> FileResponse:
+    job = get_object_or_404(ConsolidacionJob, pk=job_id)
+    ruta = Path(job.archivo) if job.archivo else None
+    if job.estado != "ok" or ruta is None or not ruta.exists():
+        raise Http404("El consolidado de este job no está disponible.")
+    return FileResponse(
+        ruta.open("rb"),
+        as_attachment=True,
+        filename=iri_to_uri(ruta.name),
+        content_type=XLSX_CONTENT_TYPE,
+    )
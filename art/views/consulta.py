@@ -12,6 +12,7 @@ from django.shortcuts import render, redirect
 from django.urls import reverse
 
 from art.models import ConsolidadoItem, EnvioEmailLog, ConsolidadoArt
+from core.numeros_ar import parse_ar
 
 
 @login_required
@@ -82,17 +83,8 @@ def _is_true_strict(v: object) -> bool:
 
 # ---------- parseo robusto de Q períodos ----------
 def _to_float_q(v):
-    if v is None:
-        return None
-    s = str(v).strip()
-    if not s:
-        return None
-    # AR: quitar miles y pasar coma a punto
-    s = s.replace(".", "").replace(",", ".")
-    try:
-        return float(s)
-    except ValueError:
-        return None
+    # "1,50" / "1.50" / Decimal("1.50") → 1.5 (core/numeros_ar.py)
+    return parse_ar(v)
 
 
 @login_required
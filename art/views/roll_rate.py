@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from datetime import date
+
+from django.http import JsonResponse
+from django.shortcuts import render
+
+from ..models import ArtDashboardCubo
+from ..services import cache_analisis, roll_rate
+from .analisis import _first_day_of_month, _fmt_periodo_yymm, _parse_periodo_query
+
+MESES_SERIE = 12
+
+
+def art_analisis_roll_rate(request):
+    """Matriz de migración entre bandas de Q (desde → hasta); la serie la pide el gráfico aparte."""
+    desde_param = request.GET.get("desde")
+    hasta_param = request.GET.get("hasta")
+    desde = _parse_periodo_query(desde_param)
+    context = cache_analisis.obtener(
+        f"roll_rate:{desde.isoformat() if desde else 'anterior'}", _parse_periodo_query(hasta_param),
+        lambda: contexto_roll_rate(desde_param, hasta_param),
+    )
+    return render(request, "art_app/art/analisis_roll_rate.html", context)
+
+
+def art_analisis_roll_rate_serie(request):
+    """JSON del gráfico de roll rates de los 12 meses que terminan en `hasta` (o el último)."""
+    hasta = _parse_periodo_query(request.GET.get("hasta"))
+    datos = cache_analisis.obtener("roll_rate_serie", hasta, lambda: serie_roll_rate(hasta))
+    return JsonResponse(datos)
+
+
+def contexto_roll_rate(desde_param: str | None, hasta_param: str | None) -> dict:
+    """
+    Contexto de la pantalla de roll rate. Por defecto `hasta` es el último período y `desde`
+    el anterior disponible. Dos consultas: períodos y matriz (art/services/roll_rate.py).
+    """
+    periodos = [
+        _first_day_of_month(p)
+        for p in ArtDashboardCubo.objects.order_by("periodo").values_list("periodo", flat=True).distinct()
+    ]
+    context = {
+        "available_periods": [_fmt_periodo_yymm(p) for p in periodos],
+        "desde_str": "",
+        "hasta_str": "",
+        "kpi": {"deuda_origen": 0, "pct_empeora": 0, "pct_mejora": 0, "pct_cura": 0, "pct_baja": 0},
+        "matriz": {"destinos": [], "filas": []},
+    }
+    if len(periodos) < 2:
+        return context
+
+    hasta = _parse_periodo_query(hasta_param) or periodos[-1]
+    desde = _parse_periodo_query(desde_param)
+    if not desde:
+        anteriores = [p for p in periodos if p < hasta]
+        desde = anteriores[-1] if anteriores else periodos[0]
+    context["desde_str"] = _fmt_periodo_yymm(desde)
+    context["hasta_str"] = _fmt_periodo_yymm(hasta)
+
+    celdas = roll_rate.matriz(desde, hasta)
+    context["kpi"] = _kpis(celdas)
+    context["matriz"] = _tabla(celdas)
+    return context
+
+
+def _kpis(celdas: dict) -> dict:
+    """Sobre la deuda en `desde` (bandas con Q ≥ 1): cuánto empeoró, mejoró, se curó o salió."""
+    total = empeora = mejora = cura = baja = 0.0
+    for (origen, destino), (_n, monto) in celdas.items():
+        if origen not in ArtDashboardCubo.BANDAS_DEUDA:
+            continue
+        total += monto
+        if destino == roll_rate.BAJA:
+            baja += monto
+        elif roll_rate.empeora(origen, destino):
+            empeora += monto
+        elif destino != origen:
+            mejora += monto
+            if destino == ArtDashboardCubo.BANDA_SIN_DEUDA:
+                cura += monto
+
+    def pct(v: float) -> float:
+        return round(v / total * 100, 1) if total else 0.0
+
+    return {
+        "deuda_origen": total,
+        "pct_empeora": pct(empeora),
+        "pct_mejora": pct(mejora),
+        "pct_cura": pct(cura),
+        "pct_baja": pct(baja),
+    }
+
+
+def _tabla(celdas: dict) -> dict:
+    """Filas de la matriz para el template: por origen, contratos/ARS/% de ARS de la fila por destino."""
+    filas = []
+    for origen in roll_rate.ORIGENES:
+        fila = [celdas.get((origen, d), (0, 0.0)) for d in roll_rate.DESTINOS]
+        contratos = sum(n for n, _m in fila)
+        if not contratos:
+            continue
+        deuda = sum(m for _n, m in fila)
+        filas.append({
+            "origen": roll_rate.ETIQUETAS[origen],
+            "contratos": contratos,
+            "deuda": deuda,
+            "celdas": [
+                {
+                    "contratos": n,
+                    "deuda": m,
+                    "pct": round(m / deuda * 100, 1) if deuda else 0.0,
+                    "pct_contratos": round(n / contratos * 100, 1),
+                    "diagonal": origen == d,
+                    "empeora": bool(roll_rate.empeora(origen, d)),
+                }
+                for d, (n, m) in zip(roll_rate.DESTINOS, fila)
+            ],
+        })
+    return {"destinos": [roll_rate.ETIQUETAS[d] for d in roll_rate.DESTINOS], "filas": filas}
+
+
+def serie_roll_rate(hasta: date | None) -> dict:
+    """% de la deuda de cada banda que pasa a una banda peor en el mes siguiente (ARS). Una consulta."""
+    pares = roll_rate.serie(hasta, MESES_SERIE)
+    bandas = [b for b in ArtDashboardCubo.BANDAS_DEUDA if b != ArtDashboardCubo.BANDAS_DEUDA[-1]]   # '6+' no empeora
+    datasets = {b: [] for b in bandas}
+    for _per, celdas in pares:
+        for b in bandas:
+            total = peor = 0.0
+            for (origen, destino), (_n, monto) in celdas.items():
+                if origen != b:
+                    continue
+                total += monto
+                if roll_rate.empeora(origen, destino):
+                    peor += monto
+            datasets[b].append(round(peor / total * 100, 2) if total else None)
+    chart_roll = {
+        "labels": [_fmt_periodo_yymm(p) for p, _c in pares],
+        "datasets": [
+            {"label": f"{roll_rate.ETIQUETAS[b]} → peor", "data": datasets[b], "type": "line", "tension": 0.25}
+            for b in bandas
+        ],
+    }
+    return {"chart_roll": chart_roll}
@@ -165,6 +165,30 @@ ART_ASEG_DIR = Path(r"C:/Users/Promecor/Documents/ART/Aseguradoras")
 ART_MAESTRO_PATH = Path(
     r"C:/Users/Promecor/Documents/Aplicativo cobranzas/ART/TOTAL PARA SUBIR DEUDAS ART.xlsx"
 )
+# Procesos para leer en paralelo los archivos de deuda de cada aseguradora (1 = serial, el default seguro)
+ART_DEUDAS_WORKERS = int(os.getenv("ART_DEUDAS_WORKERS", "1"))
+# Caché de insumos parseados (Parquet). Administración: manage.py cache_insumos_art
+ART_CACHE_DIR = BASE_DIR / ".cache" / "art_insumos"
+ART_CACHE_CLAVE = os.getenv("ART_CACHE_CLAVE", "mtime")   # "mtime" | "sha256"
+ART_CACHE_MAX_MB = 512
+ART_CACHE_MAX_DIAS = 60
+# Exportación del Consolidado: desde cuántas filas por hoja se escribe en modo constant_memory
+ART_EXPORT_CONSTANT_MEMORY_FILAS = 50_000
+# Motor de lectura de Excel (core/lectura_excel.py): "auto" (calamine si está instalado) | "calamine" | "openpyxl"
+ART_EXCEL_ENGINE = os.getenv("ART_EXCEL_ENGINE", "auto")
+# Consolidación en segundo plano (Celery): dónde quedan los XLSX generados por cada job
+ART_JOBS_DIR = BASE_DIR / ".cache" / "art_jobs"
+# Histórico columnar de consolidados (Parquet por período/hoja). Administración: manage.py historico_art
+ART_HISTORICO_PARQUET_DIR = BASE_DIR / "data" / "art_historico"
+# Perfil por etapa de cada corrida (ConsolidadoLote.perfil): cada cuántos segundos se muestrea el RSS
+ART_PERFIL_INTERVALO_RSS = 0.05
+# Carga de ConsolidadoItem: "auto" (COPY FROM STDIN en PostgreSQL, bulk_create en SQLite) | "copy" | "bulk_create"
+ART_ITEMS_CARGA = os.getenv("ART_ITEMS_CARGA", "auto")
+ART_ITEMS_COPY_BLOQUE = 50_000
+# Motor de volcar_dashboard_art: "auto" (sql en PostgreSQL, python en SQLite) | "sql" | "python"
+ART_VOLCADO_MOTOR = os.getenv("ART_VOLCADO_MOTOR", "auto")
+# Caché del contexto de Análisis (art/services/cache_analisis.py): alias de CACHES ("" la desactiva)
+ART_ANALISIS_CACHE = os.getenv("ART_ANALISIS_CACHE", "art_analisis")
 
 # ---------------------------------------------------------------------
 # Celery / Redis
@@ -177,6 +201,19 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+# Cachés: "art_analisis" usa el mismo Redis que Celery (claves con prefijo propio).
+# Si Redis no responde, la pantalla de Análisis calcula sin caché.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "art_analisis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("ART_ANALISIS_CACHE_URL", CELERY_BROKER_URL),
+        "KEY_PREFIX": "art_analisis",
+        "TIMEOUT": 24 * 3600,
+        "OPTIONS": {"socket_connect_timeout": 0.5, "socket_timeout": 0.5},
+    },
+}
+
 # ---------------------------------------------------------------------
 # Email (SMTP Gmail via App Password)
 # ---------------------------------------------------------------------
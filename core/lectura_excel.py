@@ -0,0 +1,104 @@
+# core/lectura_excel.py
+"""
+Lectura ÚNICA de planillas Excel
+--------------------------------
+Todos los caminos de ingesta (consolidar, parsers de aseguradoras, importar/volcar dashboard,
+histórico de consolidados) leen con `read_excel_fast()` en lugar de `pd.read_excel` directo.
+`encabezados_por_hoja()` lee solo los encabezados (para elegir hoja sin cargar todo el libro).
+
+Motor (settings.ART_EXCEL_ENGINE):
+• "auto"      → calamine (python-calamine, lector en Rust) si está instalado; si no, el de pandas.
+• "calamine"  → calamine; si no está instalado se avisa en el log y se usa el de pandas.
+• "openpyxl"  → siempre openpyxl (comportamiento previo).
+
+Si calamine falla con un archivo puntual, se reintenta con el motor por defecto de pandas
+(openpyxl para .xlsx, xlrd para .xls). Los DataFrames resultantes son iguales con ambos motores
+(pandas convierte enteros guardados como float a int en los dos); se verifica con
+`manage.py benchmark_art lectura`.
+"""
+from __future__ import annotations
+
+import importlib.util
+import logging
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Lector en Rust; opcional (requirements.txt lo instala, pero no es obligatorio)
+HAY_CALAMINE = importlib.util.find_spec("python_calamine") is not None
+
+log = logging.getLogger(__name__)
+
+MOTORES = ("auto", "calamine", "openpyxl")
+
+
+def motor_configurado() -> str:
+    """Motor pedido en settings (fuera de Django, o sin configurar → "auto")."""
+    try:
+        from django.conf import settings
+        motor = str(getattr(settings, "ART_EXCEL_ENGINE", "auto")).strip().lower()
+    except Exception:  # settings no configurados (scripts sueltos)
+        motor = "auto"
+    if motor not in MOTORES:
+        log.warning("ART_EXCEL_ENGINE=%r desconocido; se usa 'auto'.", motor)
+        motor = "auto"
+    return motor
+
+
+def resolver_motor(engine: Optional[str] = None) -> Optional[str]:
+    """
+    Motor efectivo para pd.read_excel: "calamine" u "openpyxl"; None deja elegir a pandas.
+    `engine` explícito gana sobre settings.
+    """
+    motor = (engine or motor_configurado()).lower()
+    if motor in ("auto", "calamine"):
+        if HAY_CALAMINE:
+            return "calamine"
+        if motor == "calamine":
+            log.warning("ART_EXCEL_ENGINE='calamine' pero python-calamine no está instalado; se usa openpyxl.")
+        return None
+    return motor
+
+
+def read_excel_fast(io, sheet_name=0, *, engine: Optional[str] = None, **kwargs):
+    """
+    Igual que `pd.read_excel(io, sheet_name=..., **kwargs)` pero con el motor configurado.
+    `io` puede ser ruta o buffer (se rebobina antes del reintento con openpyxl).
+    """
+    motor = resolver_motor(engine)
+    if motor != "calamine":
+        return pd.read_excel(io, sheet_name=sheet_name, engine=motor, **kwargs)
+
+    inicio = io.tell() if hasattr(io, "seek") else None
+    try:
+        return pd.read_excel(io, sheet_name=sheet_name, engine="calamine", **kwargs)
+    except (ValueError, KeyError):
+        # hoja inexistente / columnas pedidas que no están: mismo error con cualquier motor
+        raise
+    except Exception as e:
+        log.warning("calamine no pudo leer %s (%s); reintento con el motor por defecto.", getattr(io, "name", io), e)
+        if inicio is not None:
+            io.seek(inicio)
+        return pd.read_excel(io, sheet_name=sheet_name, **kwargs)
+
+
+def encabezados_por_hoja(io, *, engine: Optional[str] = None) -> Dict[str, list]:
+    """
+    {hoja: columnas} leyendo solo la fila de encabezados de cada hoja (nrows=0), en el orden
+    del libro. Para elegir una hoja sin cargar los datos de todas.
+    """
+    def leer(motor: Optional[str]) -> Dict[str, list]:
+        with pd.ExcelFile(io, engine=motor) as xls:
+            return {hoja: list(xls.parse(hoja, nrows=0).columns) for hoja in xls.sheet_names}
+
+    motor = resolver_motor(engine)
+    if motor != "calamine":
+        return leer(motor)
+    inicio = io.tell() if hasattr(io, "seek") else None
+    try:
+        return leer("calamine")
+    except Exception as e:
+        log.warning("calamine no pudo leer %s (%s); reintento con el motor por defecto.", getattr(io, "name", io), e)
+        if inicio is not None:
+            io.seek(inicio)
+        return leer(None)
@@ -0,0 +1,206 @@
+# core/numeros_ar.py
+"""
+Motor ÚNICO de parseo de importes (formato argentino y anglosajón)
+-------------------------------------------------------------------
+Lo usan todos los caminos de ingesta: consolidar, parsers de aseguradoras, extractor de PDFs,
+importar/volcar dashboard y la vista Consulta. No depende de Django.
+
+Reglas (escalar y vectorizado dan EXACTAMENTE lo mismo):
+• int/float/Decimal → se usan tal cual (NaN → vacío).
+• Vacío, "nan", "None", "<NA>" → vacío (None / NaN).
+• Se descartan espacios y moneda ("$", "ARS", "U$S", "US$", "USD"). Si quedan letras → vacío
+  ("abc12", "12 pesos"); notación exponencial ("1e-07", str() de un float chico) → ese float.
+• Negativo si empieza con "-" o viene entre paréntesis: "$ (1.234,56)" → -1234.56. Un "-" en
+  cualquier otro lugar ("12-34", "1.234,56-") no es signo: vacío.
+• Otros símbolos sueltos ("*", "'", "+") se descartan.
+• Separador decimal = el ÚLTIMO de "," o "." cuando hay ambos: "1.234,56" y "1,234.56" → 1234.56.
+• Sólo comas: una coma es decimal ("2345,50"); varias son miles ("1,234,567").
+• Sólo puntos: un punto es decimal ("1234.56"); varios son miles ("1.234.567").
+
+API:
+    normalizar_ar(v)          → str canónico "-1234.56" | None
+    parse_ar(v)               → float | None                 (camino rápido escalar)
+    parse_ar_decimal(v, q)    → Decimal | None               (exacto, cuantizado HALF_UP)
+    parse_ar_series(s, dec)   → Series float64 con NaN       (vectorizado con pyarrow.compute)
+"""
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow acelera el camino vectorizado; sin él se parsea por valor único
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover
+    pa = pc = None
+
+_VACIOS = {"", "nan", "none", "<na>", "nat"}
+
+# Patrones válidos tanto para `re` como para RE2 (pyarrow.compute), así escalar y vectorizado coinciden
+_RE_MONEDA = re.compile(r"(?i)u\$s|us\$|usd|ars|\$|[\s\xa0]+")
+_RE_EXPONENTE = re.compile(r"^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)[eE][-+]?[0-9]+$")
+_RE_LETRAS = re.compile(r"[A-Za-zÀ-ÿ]")
+_RE_BASURA = re.compile(r"[^0-9,.\-()]+")
+_RE_CANONICO = re.compile(r"^([0-9]+\.?[0-9]*|\.[0-9]+)$")
+
+
+# --------------------------
+# Escalar
+# --------------------------
+def normalizar_ar(value) -> str | None:
+    """Texto canónico parseable por float()/Decimal() ("-1234.56"), o None si no hay número."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, Decimal)):
+        return str(value)
+    if isinstance(value, float):
+        return None if math.isnan(value) else repr(value)
+
+    txt = str(value).strip()
+    if txt.lower() in _VACIOS:
+        return None
+
+    txt = _RE_MONEDA.sub("", txt)
+    if _RE_EXPONENTE.match(txt):
+        return txt.lstrip("+")
+    if _RE_LETRAS.search(txt):
+        return None
+    txt = _RE_BASURA.sub("", txt)
+
+    # Signo: sólo un "-" inicial o paréntesis envolventes; cualquier otro "-" ( ) invalida
+    neg = txt.startswith("-")
+    if neg:
+        txt = txt[1:]
+    if txt.startswith("(") and txt.endswith(")"):
+        neg, txt = True, txt[1:-1]
+
+    coma, punto = txt.rfind(","), txt.rfind(".")
+    if coma > punto:
+        if punto >= 0 or txt.count(",") == 1:
+            txt = txt.replace(".", "").replace(",", ".")
+        else:
+            txt = txt.replace(",", "")
+    elif punto > coma:
+        if coma >= 0 or txt.count(".") == 1:
+            txt = txt.replace(",", "")
+        else:
+            txt = txt.replace(".", "")
+
+    if not _RE_CANONICO.match(txt):
+        return None
+    return f"-{txt}" if neg else txt
+
+
+def parse_ar(value) -> float | None:
+    """Importe → float, o None si no hay número."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None if value != value else float(value)
+    txt = normalizar_ar(value)
+    if txt is None:
+        return None
+    try:
+        return float(txt)
+    except ValueError:
+        return None
+
+
+def parse_ar_decimal(value, quant: Decimal | None = None) -> Decimal | None:
+    """Importe → Decimal exacto (sin pasar por float), cuantizado HALF_UP si se indica `quant`."""
+    txt = normalizar_ar(value)
+    if txt is None:
+        return None
+    try:
+        d = Decimal(txt)
+    except InvalidOperation:
+        return None
+    if not d.is_finite():
+        return None
+    return d.quantize(quant, rounding=ROUND_HALF_UP) if quant is not None else d
+
+
+# --------------------------
+# Vectorizado
+# --------------------------
+def parse_ar_series(s: pd.Series | np.ndarray | list, decimals: int | None = None) -> pd.Series:
+    """
+    Versión columnar de `parse_ar`: con pyarrow, kernels de texto en C++ sobre toda la
+    columna (sin callbacks Python). Los valores que ya son numéricos (columnas leídas sin
+    dtype=str) no pasan por el camino de texto.
+    """
+    if not isinstance(s, pd.Series):
+        s = pd.Series(s)
+
+    if pd.api.types.is_bool_dtype(s):
+        out = pd.Series(np.nan, index=s.index, dtype="float64")
+    elif pd.api.types.is_numeric_dtype(s):
+        out = pd.to_numeric(s, errors="coerce").astype("float64")
+    else:
+        es_num = s.map(type).isin((int, float, np.int64, np.float64, Decimal)).to_numpy()
+        out = pd.Series(np.nan, index=s.index, dtype="float64")
+        if es_num.any():
+            out[es_num] = pd.to_numeric(s[es_num], errors="coerce").astype("float64")
+        texto = ~es_num & s.notna().to_numpy()
+        if texto.any():
+            out[texto] = _parse_texto_series(s[texto].astype(str))
+
+    if decimals is not None:
+        out = out.round(decimals)
+    return out
+
+
+def _parse_texto_series(s: pd.Series) -> pd.Series:
+    if pa is None:
+        # Sin pyarrow: escalar, pero una sola vez por valor distinto
+        codigos, unicos = pd.factorize(s, sort=False)
+        valores = np.array([parse_ar(v) for v in unicos], dtype="float64")
+        return pd.Series(valores[codigos], index=s.index, dtype="float64")
+
+    t = pc.utf8_trim_whitespace(pa.array(s.to_numpy(dtype=object), type=pa.string()))
+    vacio = pc.is_in(pc.utf8_lower(t), value_set=pa.array(sorted(_VACIOS)))
+
+    t = pc.replace_substring_regex(t, _RE_MONEDA.pattern, "")
+    exponente = pc.match_substring_regex(t, _RE_EXPONENTE.pattern)
+    con_letras = pc.match_substring_regex(t, _RE_LETRAS.pattern)
+    t_exponente = pc.utf8_ltrim(t, "+")
+    t = pc.replace_substring_regex(t, _RE_BASURA.pattern, "")
+
+    inicial = pc.starts_with(t, "-")
+    t = pc.if_else(inicial, pc.utf8_slice_codeunits(t, 1), t)
+    parentesis = pc.and_(pc.starts_with(t, "("), pc.ends_with(t, ")"))
+    t = pc.if_else(parentesis, pc.utf8_slice_codeunits(t, 1, -1), t)
+    neg = pc.and_(pc.or_(inicial, parentesis), pc.invert(exponente))
+
+    # Sólo quedan dígitos , . (ASCII) → el separador final decide (mismas reglas que normalizar_ar);
+    # un "-" o paréntesis sobrante deja el texto fuera de _RE_CANONICO.
+    # Posición desde el final = find sobre el texto invertido (-1 si no está).
+    invertido = pc.binary_reverse(t.cast(pa.binary()))
+    coma_fin, punto_fin = pc.find_substring(invertido, b","), pc.find_substring(invertido, b".")
+    hay_coma, hay_punto = pc.greater_equal(coma_fin, 0), pc.greater_equal(punto_fin, 0)
+    coma_decimal = pc.and_(
+        pc.and_(hay_coma, pc.or_(pc.invert(hay_punto), pc.less(coma_fin, punto_fin))),
+        pc.or_(hay_punto, pc.equal(pc.count_substring(t, ","), 1)),
+    )
+    punto_decimal = pc.and_(
+        pc.and_(hay_punto, pc.or_(pc.invert(hay_coma), pc.less(punto_fin, coma_fin))),
+        pc.or_(hay_coma, pc.equal(pc.count_substring(t, "."), 1)),
+    )
+    sin_comas = pc.replace_substring(t, ",", "")
+    canon = pc.if_else(
+        coma_decimal,
+        pc.replace_substring(pc.replace_substring(t, ".", ""), ",", "."),
+        pc.if_else(punto_decimal, sin_comas, pc.replace_substring(sin_comas, ".", "")),
+    )
+
+    canon = pc.if_else(exponente, t_exponente, canon)
+    valido = pc.or_(
+        exponente,
+        pc.and_(pc.match_substring_regex(canon, _RE_CANONICO.pattern), pc.invert(con_letras)),
+    )
+    valido = pc.and_(valido, pc.invert(vacio))
+    num = pc.cast(pc.if_else(valido, canon, pa.scalar(None, pa.string())), pa.float64())
+    num = pc.if_else(neg, pc.negate(num), num)
+    return pd.Series(num.to_numpy(zero_copy_only=False), index=s.index, dtype="float64")
@@ -1,3 +1,104 @@
-from django.test import TestCase
+# core/tests.py
+"""
+Motor de importes (core/numeros_ar.py): casos puntuales y equivalencia exhaustiva contra las
+implementaciones que reemplazó (copiadas en art/benchmarks/numeros.py, que además mide throughput).
+"""
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from art.benchmarks import numeros as bench
+from core.numeros_ar import parse_ar, parse_ar_decimal, parse_ar_series
+
+CASOS = [
+    # (entrada, esperado)
+    ("1.234,56", 1234.56),
+    ("1,234.56", 1234.56),
+    ("$ 1.234.567,89", 1234567.89),
+    ("ARS 1.234,56", 1234.56),
+    ("U$S 1,234.56", 1234.56),
+    ("  1\xa0234,5 ", 1234.5),
+    ("-1.234,56", -1234.56),
+    ("$ (1.234,10)", -1234.1),
+    ("2345,50", 2345.5),
+    ("1,234,567", 1234567.0),
+    ("1.234.567", 1234567.0),
+    ("1234.56", 1234.56),
+    (1234.5, 1234.5),
+    (Decimal("12.30"), 12.3),
+    # Exponencial (str() de floats chicos/grandes leídos con dtype=str)
+    ("1e-07", 1e-07),
+    ("1.5E+16", 1.5e16),
+    ("-2.5e3", -2500.0),
+    # Sin número: el baseline daba NaN y así debe seguir
+    ("12-34", None),
+    ("1-2", None),
+    ("1.234,56-", None),
+    ("(-5)", None),
+    ("abc12", None),
+    ("12 pesos", None),
+    ("e5", None),
+    ("-", None),
+    ("$", None),
+    (".", None),
+    ("()", None),
+    ("1.2.3,4,5", None),
+    ("", None),
+    ("nan", None),
+    (None, None),
+    (float("nan"), None),
+]
+
+
+class ParseArTests(SimpleTestCase):
+    def test_casos_puntuales(self):
+        for entrada, esperado in CASOS:
+            with self.subTest(entrada=entrada):
+                self.assertEqual(parse_ar(entrada), esperado)
+
+    def test_vectorizado_y_decimal_coinciden_con_escalar(self):
+        entradas = [e for e, _ in CASOS]
+        vec = parse_ar_series(pd.Series(entradas, dtype=object)).to_numpy()
+        for entrada, x in zip(entradas, vec):
+            with self.subTest(entrada=entrada):
+                e = parse_ar(entrada)
+                self.assertTrue((e is None and np.isnan(x)) or e == x, f"{e!r} vs {x!r}")
+                d = parse_ar_decimal(entrada)
+                self.assertEqual(d is None, e is None)
+                if d is not None:
+                    self.assertEqual(float(d), e)
+
+    def test_corpus_escalar_vs_vectorizado(self):
+        datos, _, _ = bench.generar_corpus(20_000, seed=7)
+        vec = parse_ar_series(pd.Series(datos, dtype=object)).to_numpy()
+        for v, x in zip(datos, vec):
+            e = parse_ar(v)
+            self.assertTrue((e is None and np.isnan(x)) or e == x, f"{v!r}: {e!r} vs {x!r}")
+
+    def test_equivalencia_con_implementaciones_previas(self):
+        """Dentro del dominio que cada función previa resolvía bien, el motor da lo mismo."""
+        datos, formatos, _ = bench.generar_corpus(20_000, seed=7)
+        previo = bench._prev_consolidar(pd.Series(datos, dtype=object), 2)
+        nuevo = parse_ar_series(pd.Series(datos, dtype=object), 2)
+        bench._comparar(
+            "consolidar._to_number_ar_series",
+            ((v, float(a), float(b)) for v, a, b in zip(datos, previo, nuevo)),
+            formatos,
+        )
+        for nombre, (prev, actual) in bench._implementaciones().items():
+            with self.subTest(implementacion=nombre):
+                bench._comparar(
+                    nombre, ((v, bench._llamar(prev, v), bench._llamar(actual, v)) for v in datos), formatos
+                )
+
+    def test_basura_sin_numero_igual_que_baseline(self):
+        """Lo que `_to_number_ar_series` del baseline dejaba en NaN (salvo exponenciales) sigue vacío."""
+        basura = [b for b in bench.BASURA if b != "1e-07"]   # el exponencial ahora se parsea
+        previo = bench._prev_consolidar(pd.Series(basura, dtype=object))
+        nuevo = parse_ar_series(pd.Series(basura, dtype=object))
+        for v, a, b in zip(basura, previo, nuevo):
+            with self.subTest(entrada=v):
+                if np.isnan(a):
+                    self.assertTrue(np.isnan(b), f"{v!r} → {b!r}")
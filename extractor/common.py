@@ -18,6 +18,8 @@ from datetime import datetime
 
 import pandas as pd
 
+from core.numeros_ar import parse_ar
+
 # ----------------------------------------------------------------------
 # Rutas y archivo de mapeo
 # ----------------------------------------------------------------------
@@ -28,9 +30,10 @@ MAPPING_XLSX = os.path.join(BASE_DIR, "Ramos-aseguradoras.xlsx")
 # ----------------------------------------------------------------------
 # Conversión y limpieza de números
 # ----------------------------------------------------------------------
-def clean_number(raw: str | float | int | None) -> float:
+def clean_number(raw: str | float | int | None, int_only: bool = False) -> float | int:
     """
-    Convierte un número escrito al estilo latino o anglosajón a float.
+    Convierte un número escrito al estilo latino o anglosajón a float
+    (motor común: core/numeros_ar.py).
 
     Ejemplos admitidos
     ------------------
@@ -39,25 +42,25 @@ def clean_number(raw: str | float | int | None) -> float:
     '318808,19'  → 318808.19
     '318808.19'  → 318808.19
     318808       → 318808.0
+
+    int_only=True: para números de póliza/endoso; cualquier separador se
+    toma como de miles ('123.456' → 123456).
     """
     if raw is None or (isinstance(raw, str) and raw.strip() == ""):
         raise ValueError("Número vacío")
 
-    # Ya es numérico
-    if isinstance(raw, (int, float)):
-        return float(raw)
-
-    txt = str(raw).strip()
-
-    if "," in txt and "." in txt:
-        # Formato AR habitual
-        txt = txt.replace(".", "").replace(",", ".")
-    elif "," in txt:
-        txt = txt.replace(".", "").replace(",", ".")
-    else:
-        txt = txt.replace(",", "")
-
-    return float(txt)
+    if int_only:
+        if isinstance(raw, (int, float)):
+            return int(raw)
+        digitos = re.sub(r"\D", "", str(raw))
+        if not digitos:
+            raise ValueError(f"Número inválido: {raw!r}")
+        return int(digitos)
+
+    num = parse_ar(raw)
+    if num is None:
+        raise ValueError(f"Número inválido: {raw!r}")
+    return num
 
 # ----------------------------------------------------------------------
 # Limpieza de texto genérica
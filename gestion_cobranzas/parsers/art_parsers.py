@@ -2,50 +2,25 @@ import pandas as pd
 from pathlib import Path
 from openpyxl import load_workbook
 
+from core.lectura_excel import read_excel_fast
+from core.numeros_ar import parse_ar, parse_ar_series
+
 # ──────────────────────────────────────────────────────────────────────────────
 # UTILIDADES COMUNES
 # ──────────────────────────────────────────────────────────────────────────────
 def _clean_number(value):
     """
     Convierte textos como '12.345,67', '  -2.345,50  ', '$ (1.234,10)' a un
-    `float` preservando el signo. Reglas:
-      • Elimina símbolo $ y espacios.
-      • Si el número viene entre paréntesis ⇒ negativo.
-      • Quita puntos de miles y convierte coma decimal a punto.
+    `float` preservando el signo (paréntesis ⇒ negativo). Vacío o ilegible ⇒ 0.0.
+    Usa el motor común core/numeros_ar.py.
     """
-    if pd.isna(value):
-        return 0.0
-
-    txt = str(value).strip()
-
-    # Detectar formato '(123,45)' => negativo
-    neg = False
-    if txt.startswith('(') and txt.endswith(')'):
-        neg = True
-        txt = txt[1:-1]
-
-    # Remover signo positivo/negativo explícito y capturarlo
-    if txt.startswith('-'):
-        neg = True
-        txt = txt[1:]
-    elif txt.startswith('+'):
-        txt = txt[1:]
-
-    # Quitar símbolo de moneda y espacios
-    txt = txt.replace('$', '').replace(' ', '')
-
-    # Si tiene coma decimal, quitar puntos de miles y cambiar coma por punto
-    if ',' in txt:
-        txt = txt.replace('.', '').replace(',', '.')
-    # Si sólo tiene puntos como decimal (caso 1234.56) ya está bien
+    num = parse_ar(value)
+    return 0.0 if num is None else num
 
-    try:
-        num = float(txt)
-    except ValueError:
-        # Si no se puede convertir, devuelve 0
-        return 0.0
 
-    return -num if neg else num
+def _clean_number_series(col: pd.Series) -> pd.Series:
+    """Versión columnar de `_clean_number` (sin `.apply` fila por fila)."""
+    return parse_ar_series(col).fillna(0.0)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -58,13 +33,13 @@ def parse_andina(file_path: Path, periodo: str) -> pd.DataFrame:
     La Deuda total se calcula NETEANDO (sumando signos + y -) la columna 'Saldo'
     agrupada por 'Numero Poliza'.
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
 
     # Normalizar encabezados
     df.columns = df.columns.str.strip()
 
     # Limpiar monto, preservar signo
-    df['Saldo'] = df['Saldo'].apply(_clean_number)
+    df['Saldo'] = _clean_number_series(df['Saldo'])
 
     # Agrupar: Numero Poliza = contrato, suma neta de saldo
     neto = (
@@ -118,7 +93,7 @@ def parse_asociart(file_path: Path, periodo: str) -> pd.DataFrame:
           .rename(columns={col_contrato: 'Contrato',
                            col_deuda:   'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'Asociart'
@@ -134,7 +109,7 @@ def parse_berkley(file_path: Path, periodo: str) -> pd.DataFrame:
       • Deuda     →  'SALDO TOTAL'
     Devuelve: Periodo | Contrato | Deuda total | Aseguradora
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     out = (
@@ -142,7 +117,7 @@ def parse_berkley(file_path: Path, periodo: str) -> pd.DataFrame:
           .rename(columns={'NRO. CONTRATO': 'Contrato',
                            'SALDO TOTAL':  'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'Berkley'
@@ -158,7 +133,7 @@ def parse_experta(file_path: Path, periodo: str) -> pd.DataFrame:
       • Deuda     →  'Saldo Total'   (NEGATIVO → pasar a positivo)
     Devuelve: Periodo | Contrato | Deuda total | Aseguradora
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     out = (
@@ -167,7 +142,7 @@ def parse_experta(file_path: Path, periodo: str) -> pd.DataFrame:
                            'Saldo Total': 'Deuda total'})
     )
     # limpia separador y convierte a número positivo
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number).abs()
+    out['Deuda total'] = _clean_number_series(out['Deuda total']).abs()
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'Experta'
@@ -184,12 +159,12 @@ def parse_fede_patr(file_path: Path, periodo: str) -> pd.DataFrame:
       • Interés adeudado         → 'Interés adeudado'
     Deuda total = Cuota adeudada + Interés adeudado
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     # Limpieza numérica y conversión a float
-    df['Cuota adeudada']   = df['Cuota adeudada'].apply(_clean_number)
-    df['Interés adeudado'] = df['Interés adeudado'].apply(_clean_number)
+    df['Cuota adeudada']   = _clean_number_series(df['Cuota adeudada'])
+    df['Interés adeudado'] = _clean_number_series(df['Interés adeudado'])
 
     df['Deuda total'] = df['Cuota adeudada'] + df['Interés adeudado']
 
@@ -208,14 +183,14 @@ def parse_galeno(file_path: Path, periodo: str) -> pd.DataFrame:
       • Deuda     →  'Saldo'
     Devuelve: Periodo | Contrato | Deuda total | Aseguradora
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     out = (
         df[['Poliza', 'Saldo']]
           .rename(columns={'Poliza': 'Contrato', 'Saldo': 'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'Galeno'
@@ -231,7 +206,7 @@ def parse_la_segunda(file_path: Path, periodo: str) -> pd.DataFrame:
       • Deuda     →  'Saldo'
     Devuelve: Periodo | Contrato | Deuda total | Aseguradora
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     out = (
@@ -239,7 +214,7 @@ def parse_la_segunda(file_path: Path, periodo: str) -> pd.DataFrame:
           .rename(columns={'Contrato': 'Contrato',   # se deja igual
                            'Saldo':    'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'La Segunda'
@@ -255,7 +230,7 @@ def parse_omint(file_path: Path, periodo: str) -> pd.DataFrame:
       • Deuda     →  'Saldo Cuenta Corriente'
     Devuelve: Periodo | Contrato | Deuda total | Aseguradora
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     out = (
@@ -263,7 +238,7 @@ def parse_omint(file_path: Path, periodo: str) -> pd.DataFrame:
           .rename(columns={'Nro. Contrato': 'Contrato',
                            'Saldo Cuenta Corriente': 'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'Omint'
@@ -279,7 +254,7 @@ def parse_prevencion(file_path: Path, periodo: str) -> pd.DataFrame:
       • Deuda total   →  'Deuda Capital al Último Período Cerrado'
     Devuelve: Periodo | Contrato | Deuda total | Aseguradora
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     # Algunos archivos vienen con el título abreviado; busquemos por palabras
@@ -294,7 +269,7 @@ def parse_prevencion(file_path: Path, periodo: str) -> pd.DataFrame:
           .rename(columns={col_contrato: 'Contrato',
                            col_deuda:    'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'Prevención'
@@ -309,7 +284,7 @@ def parse_provincia(file_path: Path, periodo: str) -> pd.DataFrame:
       • Contrato  →  'CONTRATO'
       • Deuda     →  'SALDO CON INTERESES'
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     out = (
@@ -317,7 +292,7 @@ def parse_provincia(file_path: Path, periodo: str) -> pd.DataFrame:
           .rename(columns={'CONTRATO': 'Contrato',
                            'SALDO CON INTERESES': 'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'Provincia'
@@ -332,7 +307,7 @@ def parse_smg(file_path: Path, periodo: str) -> pd.DataFrame:
       • Contrato  →  'Contrato'
       • Deuda     →  'Premio Saldo Acum.'
     """
-    df = pd.read_excel(file_path, dtype=str)
+    df = read_excel_fast(file_path, dtype=str)
     df.columns = df.columns.str.strip()
 
     out = (
@@ -340,7 +315,7 @@ def parse_smg(file_path: Path, periodo: str) -> pd.DataFrame:
           .rename(columns={'Contrato': 'Contrato',
                            'Premio Saldo Acum.': 'Deuda total'})
     )
-    out['Deuda total'] = out['Deuda total'].apply(_clean_number)
+    out['Deuda total'] = _clean_number_series(out['Deuda total'])
 
     out.insert(0, 'Periodo', periodo)
     out['Aseguradora'] = 'SMG'